@@ -1,11 +1,13 @@
 import json
+import os
 import time
-import random
-from pathlib import Path
+import numpy as np
 import pandas as pd
 import streamlit as st
+from voiceguard.analytics import GROUP_FIELDS, AnalyticsStore
+from voiceguard.live import LiveView, LiveWorker
 from voiceguard.pipeline import build_pipeline
-from voiceguard.model import load_model
+from voiceguard.registry import ModelRegistry
 
 
 st.set_page_config(page_title="VoiceGuard", layout="wide")
@@ -37,18 +39,65 @@ telemetry = {
 }
 customer = {"id": cust_id, "location": [lat, lon]}
 
-model_path = "models/lg.pkl"
-model_obj = None
-if Path(model_path).exists():
-    model_obj = load_model(model_path)
+model_path = "models/lg.vgm"
+
+
+@st.cache_resource
+def get_model_registry():
+    # one registry per server process: loaded once, hot-swapped when train.py rewrites the file
+    return ModelRegistry(model_path).start()
+
+
+analytics_path = "data/analytics.npz"
+
+
+@st.cache_resource
+def get_analytics():
+    # one store per server process, shared by all sessions; restored from the last snapshot
+    return AnalyticsStore.load(analytics_path) if os.path.exists(analytics_path) else AnalyticsStore()
+
+
+analytics = get_analytics()
+
+
+@st.cache_resource
+def get_pipeline():
+    # built once per server process; follows the registry when the model is retrained
+    registry = get_model_registry()
+    pipeline = build_pipeline(model_obj=registry.model, analytics=analytics)
+    registry.subscribe(pipeline.set_model)
+    return pipeline
+
+
+@st.cache_resource
+def get_live_pipeline():
+    # scoring pipeline for the simulated fleets, kept out of the analytics rollups; shared
+    # by the sessions' workers and subscribed to the registry once
+    registry = get_model_registry()
+    pipeline = build_pipeline(model_obj=registry.model)
+    registry.subscribe(pipeline.set_model)
+    return pipeline
+
+
+def get_live_worker(vehicles):
+    # One worker and LiveView per browser session: frames are deltas against what this
+    # worker already sent, so they must all reach the same view. A new fleet size starts
+    # a fresh pair, whose first frame carries every vehicle. Workers of closed sessions
+    # stop themselves once nobody polls them.
+    worker = st.session_state.get("live_worker")
+    if worker is None or worker.n != vehicles:
+        if worker is not None:
+            worker.stop()
+        worker = st.session_state["live_worker"] = LiveWorker(get_live_pipeline(), vehicles=vehicles, idle_s=30.0)
+        st.session_state["live_view"] = LiveView(vehicles)
+    return worker, st.session_state["live_view"]
+
 
 run_once = st.button("Run VoiceGuard")
 live_mode = st.checkbox("Live mode (auto-update risk)")
-start_live = st.button("Start live simulation")
 
 if run_once:
-    pipeline = build_pipeline(model_obj=model_obj)
-    result = pipeline.run(voice_text, telemetry, customer)
+    result = get_pipeline().run(voice_text, telemetry, customer)
     st.subheader("Diagnosis")
     d = result["diagnosis"]
     st.metric("Risk score", f'{d["risk_score"]:.3f}')
@@ -67,19 +116,52 @@ if run_once:
     st.json(result["analytics"])
     st.download_button("Download JSON", data=json.dumps(result, indent=2), file_name="voiceguard_result.json", mime="application/json")
 
-if live_mode and start_live:
-    pipeline = build_pipeline(model_obj=model_obj)
-    chart = st.line_chart(pd.DataFrame({"risk": []}))
-    out = st.empty()
-    base = telemetry.copy()
-    for i in range(20):
-        jitter = lambda v, s: float(v + random.gauss(0, s))
-        base["engine_temp_c"] = jitter(base["engine_temp_c"], 0.7)
-        base["battery_voltage"] = jitter(base["battery_voltage"], 0.05)
-        base["oil_pressure_psi"] = jitter(base["oil_pressure_psi"], 0.6)
-        base["vibration_g"] = max(0.0, jitter(base["vibration_g"], 0.05))
-        res = pipeline.run(voice_text, base, customer)
-        risk = res["diagnosis"]["risk_score"]
-        chart.add_rows(pd.DataFrame({"risk": [risk]}))
-        out.json(res)
-        time.sleep(0.5)
+if live_mode:
+    c1, c2 = st.columns(2)
+    vehicles = c1.select_slider("Simulated vehicles", [50, 200, 500, 1000], value=200)
+    refresh = c2.select_slider("Refresh (s)", [0.25, 0.5, 1.0, 2.0], value=0.5)
+    worker, view = get_live_worker(vehicles)
+    worker.interval = refresh
+    worker.configure(voice_text, telemetry, customer)
+    worker.start()
+    ids = worker.ids
+
+    @st.fragment(run_every=refresh)
+    def live_panel():
+        # reruns on its own every `refresh` seconds; only applies the frames produced since
+        # the last run and redraws the small tables, never waits on scoring
+        t0 = time.perf_counter()
+        changed = view.apply(worker.poll())
+        m1, m2, m3, m4 = st.columns(4)
+        last = view.history[-1] if view.history else {"mean_risk": 0.0, "max_risk": 0.0}
+        m1.metric("Fleet mean risk", f'{last["mean_risk"]:.3f}')
+        m2.metric("Max risk", f'{last["max_risk"]:.3f}')
+        m3.metric("Urgent vehicles", view.urgent)
+        m4.metric("Changed this refresh", len(changed))
+        st.line_chart(pd.DataFrame(view.history))
+        t1, t2 = st.columns(2)
+        t1.caption("Highest risk")
+        t1.dataframe(view.rows(view.top(20), ids), hide_index=True)
+        t2.caption("Changed since last refresh")
+        t2.dataframe(view.rows(changed[np.argsort(-view.risk[changed])][:20], ids), hide_index=True)
+        render_ms = (time.perf_counter() - t0) * 1e3
+        st.caption(
+            f"frame {view.seq}: render {render_ms:.1f} ms, scoring {worker.last_score_ms:.1f} ms per tick in the background, "
+            f"{worker.merged} frames merged while the page was behind"
+        )
+
+    live_panel()
+elif "live_worker" in st.session_state:
+    # only this session's worker; its view goes with it
+    st.session_state.pop("live_worker").stop()
+    st.session_state.pop("live_view", None)
+with st.expander("Fleet analytics"):
+    windows = {"Last hour": 3600, "Last 6 hours": 6 * 3600, "Last 24 hours": None}
+    window = st.selectbox("Window", list(windows), index=2)
+    by = st.multiselect("Group by", GROUP_FIELDS, default=["center_id", "issue_category"])
+    rows = analytics.query(windows[window], by=by)
+    st.write(analytics.summary(windows[window]))
+    st.dataframe(pd.DataFrame(rows))
+    if st.button("Save analytics snapshot"):
+        analytics.snapshot(analytics_path)
+        st.write(f"Saved {analytics.stats()['events']} events to {analytics_path}")
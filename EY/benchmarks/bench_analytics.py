@@ -0,0 +1,118 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+# ensure project root is on path when running from benchmarks/ directory
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+import numpy as np
+import pandas as pd
+from voiceguard.analytics import AnalyticsStore
+
+CATEGORIES = ["Cooling/Overheat", "Electrical/Battery", "Lubrication/Oil Pressure", "Vibration/Suspension", "Stalling/Fuel", "General Inspection"]
+BATCH = 10000
+DAY = 86400.0
+
+
+def event_batch(rng, centers):
+    # analytics fields of BATCH scored requests: skewed centers and categories, risk ~ Beta(2, 5)
+    c = rng.zipf(1.5, BATCH) % len(centers)
+    risk = rng.beta(2, 5, BATCH).round(3)
+    return (
+        [centers[i] for i in c.tolist()],
+        [CATEGORIES[i] for i in rng.choice(len(CATEGORIES), BATCH, p=[0.3, 0.2, 0.15, 0.15, 0.05, 0.15]).tolist()],
+        np.where(risk > 0.6, "urgent", "normal").tolist(),
+        risk,
+    )
+
+
+def latency(fn, reps):
+    times = []
+    for _ in range(reps):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return np.median(times) * 1e3, np.percentile(times, 99) * 1e3
+
+
+def main():
+    ap = argparse.ArgumentParser(description="AnalyticsStore ingest rate, dashboard query latency and snapshot cost")
+    ap.add_argument("--events", default="1000000,2000000,5000000", help="comma-separated ingest checkpoints (cumulative)")
+    ap.add_argument("--centers", type=int, default=50)
+    ap.add_argument("--reps", type=int, default=50)
+    ap.add_argument("--scan-rows", type=int, default=200000, help="archived-JSON rows for the rescan baseline")
+    args = ap.parse_args()
+    checkpoints = [int(s) for s in args.events.split(",")]
+    rng = np.random.default_rng(11)
+    centers = [f"C{i:03d}" for i in range(args.centers)]
+    now = [0.0]
+    store = AnalyticsStore(clock=lambda: now[0])
+    start = 1_700_000_000.0
+    total = checkpoints[-1]
+    step = DAY / (total / BATCH)
+
+    queries = {
+        "24h by center x category": lambda: store.query(by=("center_id", "issue_category")),
+        "1h by priority": lambda: store.query(3600, by=("priority",)),
+        "6h one center by category": lambda: store.query(6 * 3600, by=("issue_category",), center_id=centers[0]),
+        "24h summary": lambda: store.summary(),
+    }
+    print(f"{total} events over 24h, {args.centers} centers x {len(CATEGORIES)} categories x 2 priorities")
+    print(f"  {'events':>9}  {'ingest ev/s':>12}  " + "  ".join(f"{name + ' ms':>28}" for name in queries))
+    ingested, ingest_s, risks = 0, 0.0, []
+    for target in checkpoints:
+        while ingested < target:
+            ids, cats, prios, risk = event_batch(rng, centers)
+            risks.append(risk)
+            now[0] = start + ingested / BATCH * step
+            t0 = time.perf_counter()
+            store.add_many(ids, cats, prios, risk)
+            ingest_s += time.perf_counter() - t0
+            ingested += BATCH
+        cells = [f"{p50:9.3f} (p99 {p99:7.3f})" for p50, p99 in (latency(fn, args.reps) for fn in queries.values())]
+        print(f"  {ingested:>9}  {ingested / ingest_s:12.0f}  " + "  ".join(f"{c:>28}" for c in cells))
+
+    ids, cats, prios, risk = event_batch(rng, centers)
+    t0 = time.perf_counter()
+    for row in zip(ids, cats, prios, risk.tolist()):
+        store.add(*row)
+    print(f"  add() per event: {(time.perf_counter() - t0) / BATCH * 1e6:.2f} us; memory {store.memory_bytes() / 1e6:.1f} MB for {len(store.keys)} keys")
+
+    exact = np.percentile(np.concatenate(risks), [50, 90, 99])
+    s = store.summary()
+    print(f"  quantile error vs exact: p50 {abs(s['p50'] - exact[0]):.4f}  p90 {abs(s['p90'] - exact[1]):.4f}  p99 {abs(s['p99'] - exact[2]):.4f}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "analytics.npz")
+        t0 = time.perf_counter()
+        store.snapshot(path)
+        t_save = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        # same clock as the original: windows end at the clock's now
+        restored = AnalyticsStore.load(path, clock=store.clock)
+        t_load = time.perf_counter() - t0
+        same = restored.query(by=("center_id", "issue_category")) == store.query(by=("center_id", "issue_category"))
+        print(f"  snapshot {os.path.getsize(path) / 1e6:.1f} MB: save {t_save * 1e3:.1f} ms, restore {t_load * 1e3:.1f} ms, identical queries: {same}")
+
+        # what the store replaces: re-reading archived result JSON and grouping it
+        n = args.scan_rows
+        ids, cats, prios, risk = zip(*(event_batch(rng, centers) for _ in range(max(1, n // BATCH))))
+        archive = os.path.join(tmp, "archive.ndjson")
+        with open(archive, "w", encoding="utf-8") as f:
+            for i, c, p, r in zip(sum(ids, []), sum(cats, []), sum(prios, []), np.concatenate(risk).tolist()):
+                f.write(json.dumps({"center_id": i, "issue_category": c, "priority": p, "risk_score": r}) + "\n")
+        t0 = time.perf_counter()
+        frame = pd.read_json(archive, lines=True)
+        frame.groupby(["center_id", "issue_category"])["risk_score"].quantile([0.5, 0.9, 0.99])
+        scan = time.perf_counter() - t0
+        print(f"  rescanning {n} archived JSON rows: {scan * 1e3:.0f} ms (~{scan * 1e6 / n:.1f} s per million events)")
+    if not same:
+        print("FAIL restored snapshot answers differently")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
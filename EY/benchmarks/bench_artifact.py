@@ -0,0 +1,115 @@
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+# ensure project root is on path when running from benchmarks/ directory
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+import numpy as np
+from train import generate_synthetic
+from voiceguard.artifact import MAGIC, read_header, write_artifact
+from voiceguard.inference import CompiledScorer, FEATURES, artifact_path, load_model, predict_proba_batch, save_model
+from voiceguard.training import train_model
+
+
+def median_ms(fn, reps):
+    times = []
+    for _ in range(reps):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return np.median(times) * 1e3
+
+
+def cold_ms(path, compiled):
+    # fresh interpreter: import + first load, what a short-lived scoring job pays
+    code = (f"import time; t0 = time.perf_counter(); from voiceguard.inference import load_model; "
+            f"load_model({path!r}, compiled={compiled}); print((time.perf_counter() - t0) * 1e3)")
+    out = subprocess.run([sys.executable, "-W", "ignore", "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return float(out.stdout)
+
+
+def rejects(fn):
+    try:
+        fn()
+    except ValueError:
+        return True
+    return False
+
+
+def main():
+    ap = argparse.ArgumentParser(description=".vgm artifact vs pickle: load time, round-trip equivalence, many versions side by side")
+    ap.add_argument("--rows", type=int, default=20000, help="training rows for the round-trip model")
+    ap.add_argument("--versions", type=int, default=1000, help="model versions opened side by side")
+    ap.add_argument("--reps", type=int, default=200)
+    args = ap.parse_args()
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        data, pkl = os.path.join(tmp, "train.csv"), os.path.join(tmp, "lg.pkl")
+        generate_synthetic(data, args.rows)
+        train_model(data, pkl)
+        vgm = artifact_path(pkl)
+
+        # round trip: sklearn pickle vs the .vgm written next to it, on fresh inputs
+        X = np.random.default_rng(3).normal(size=(100000, len(FEATURES))) * [8, 0.5, 6, 0.25, 20, 30000, 1] + [92, 12.4, 35, 0.5, 45, 60000, 1]
+        sk, art = load_model(pkl), load_model(vgm)
+        diff = float(np.abs(predict_proba_batch(sk, X) - predict_proba_batch(art, X)).max())
+        header = read_header(vgm)[0]
+        print(f"round trip on {len(X)} rows: max |p_pickle - p_vgm| = {diff:.2e}; header {json.dumps(header['metadata'])}")
+        if diff > 1e-9:
+            failures.append(f"round trip differs by {diff}")
+        # validation: a bad feature list, a flipped payload byte and a non-artifact are all refused
+        bad = os.path.join(tmp, "bad.vgm")
+        write_artifact(bad, {"weights": np.zeros(3), "bias": np.zeros(1)}, {"kind": "logistic", "features": FEATURES[:3]})
+        corrupt = os.path.join(tmp, "corrupt.vgm")
+        raw = bytearray(Path(vgm).read_bytes())
+        raw[-64] ^= 1
+        Path(corrupt).write_bytes(bytes(raw))
+        checks = {
+            "feature mismatch": rejects(lambda: load_model(bad)),
+            "corrupt payload": rejects(lambda: load_model(corrupt)),
+            "pickle renamed .vgm": rejects(lambda: load_model(str(Path(pkl).rename(Path(tmp) / "evil.vgm")))),
+        }
+        print("rejected: " + ", ".join(f"{k} {'yes' if v else 'NO'}" for k, v in checks.items()))
+        failures += [f"{k} accepted" for k, v in checks.items() if not v]
+        Path(tmp, "evil.vgm").rename(pkl)
+
+        # a pickle with no .vgm next to it, so compiled=True really unpickles
+        plain = os.path.join(tmp, "plain.pkl")
+        Path(plain).write_bytes(Path(pkl).read_bytes())
+        print(f"\n  {'load':<34}{'warm ms':>9}{'cold ms':>9}")
+        for label, path, compiled in (("pickle (sklearn objects)", plain, False), ("pickle + compile", plain, True), (".vgm (mmap)", vgm, False)):
+            warm = median_ms(lambda: load_model(path, compiled=compiled), args.reps)
+            cold = min(cold_ms(path, compiled) for _ in range(3))
+            print(f"  {label:<34}{warm:9.3f}{cold:9.1f}")
+
+        # A/B: many versions open at once; each maps its own file, nothing is copied
+        scorer = art["scorer"]
+        rng = np.random.default_rng(5)
+        paths = []
+        for v in range(args.versions):
+            path = os.path.join(tmp, f"v{v}.vgm")
+            save_model({"scorer": CompiledScorer(scorer.weights * rng.normal(1, 0.01, len(FEATURES)), scorer.bias, FEATURES)}, path, {"version": f"v{v}"})
+            paths.append(path)
+        rss0 = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        t0 = time.perf_counter()
+        models = {m["version"]: m for m in (load_model(p) for p in paths)}
+        seconds = time.perf_counter() - t0
+        rss1 = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        scores = np.stack([predict_proba_batch(m, X[:1000]) for m in models.values()])
+        print(f"\n{len(models)} versions opened side by side in {seconds * 1e3:.1f} ms ({seconds / len(models) * 1e6:.0f} us each), "
+              f"max RSS +{(rss1 - rss0) / 1024:.1f} MB; score spread across versions {scores.std(axis=0).mean():.4f}")
+        print(f"artifact: {os.path.getsize(vgm)} bytes, magic {MAGIC!r}, schema {header['schema_version']}, arrays {sorted(header['arrays'])}")
+    for f in failures:
+        print(f"FAIL {f}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import argparse
+import csv
+import os
+import random
+import sys
+import time
+from pathlib import Path
+# ensure project root is on path when running from benchmarks/ directory
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+from voiceguard.pipeline import build_pipeline
+from voiceguard.model import load_model
+
+
+TRANSCRIPTS = [
+    "My car has been overheating and there's a rattling vibration at low speeds. It's urgent.",
+    "Battery seems weak, the car won't start in the morning.",
+    "I noticed an oil leak under the car and the pressure light came on.",
+    "Brakes squeak when I stop, please book a service appointment.",
+    "Just checking when my next service is due.",
+    "Engine stopped on the highway, complete breakdown, need help immediately.",
+]
+
+
+def make_fleet(n: int, seed: int = 7):
+    rng = random.Random(seed)
+    with open(ROOT / "data" / "sim_telemetry.csv", newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    texts, telemetry, customers = [], [], []
+    for i in range(n):
+        r = rows[i % len(rows)]
+        loc = [rng.uniform(8.0, 30.0), rng.uniform(70.0, 88.0)]
+        telemetry.append({
+            "engine_temp_c": float(r["engine_temp_c"]),
+            "battery_voltage": float(r["battery_voltage"]),
+            "oil_pressure_psi": float(r["oil_pressure_psi"]),
+            "vibration_g": float(r["vibration_g"]),
+            "speed_kph": float(r["speed_kph"]),
+            "odometer_km": float(r["odometer_km"]),
+            "error_codes": [f"P0{300 + k}" for k in range(int(r["error_code_count"]))],
+            "location": loc,
+        })
+        customers.append({"id": f"CUST-{i:06d}", "location": loc})
+        texts.append(rng.choice(TRANSCRIPTS))
+    return texts, telemetry, customers
+
+
+def _strip_slot(res):
+    return {**res, "schedule": {k: v for k, v in res["schedule"].items() if k != "slot"}}
+
+
+def main():
+    ap = argparse.ArgumentParser(description="run() loop vs run_batch() throughput")
+    ap.add_argument("--sizes", default="100,1000,10000,50000")
+    ap.add_argument("--model", default=str(ROOT / "models" / "lg.pkl"))
+    ap.add_argument("--no-model", action="store_true")
+    args = ap.parse_args()
+    model_obj = None if args.no_model or not os.path.exists(args.model) else load_model(args.model)
+    pipeline = build_pipeline(model_obj=model_obj)
+    print(f"model={'lg.pkl' if model_obj else 'heuristic'}")
+    print(f"{'n':>8} {'loop rows/s':>12} {'batch rows/s':>13} {'speedup':>8}")
+    for n in [int(x) for x in args.sizes.split(",")]:
+        texts, telemetry, customers = make_fleet(n)
+        t0 = time.perf_counter()
+        looped = [pipeline.run(t, tel, c) for t, tel, c in zip(texts, telemetry, customers)]
+        t_loop = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        batched = pipeline.run_batch(texts, telemetry, customers)
+        t_batch = time.perf_counter() - t0
+        mismatches = sum(_strip_slot(a) != _strip_slot(b) for a, b in zip(looped, batched))
+        print(f"{n:>8} {n / t_loop:>12.0f} {n / t_batch:>13.0f} {t_loop / t_batch:>7.1f}x"
+              + (f"  MISMATCHES={mismatches}" if mismatches else ""))
+
+
+if __name__ == "__main__":
+    main()
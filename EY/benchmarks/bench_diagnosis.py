@@ -0,0 +1,52 @@
+import sys
+import time
+from pathlib import Path
+# ensure project root is on path when running from benchmarks/ directory
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+from voiceguard.agents import DiagnosisAgent, Telemetry, TelemetryAgent, VoiceSummary
+from voiceguard.model import load_model, predict_proba
+
+
+def _per_call(fn, repeat: int = 20000) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat * 1e6
+
+
+def main():
+    voice = VoiceSummary(customer_id="CUST-1", symptoms=["overheat"], severity=0.8, intent="service_request")
+    telem_agent = TelemetryAgent()
+    ok = True
+    for compiled in (False, True):
+        agent = DiagnosisAgent(model_obj=load_model(str(ROOT / "models" / "lg.pkl"), compiled=compiled))
+        label = "compiled" if compiled else "sklearn"
+
+        # saturated inputs: the legacy round trip clips them, the raw path does not
+        for temp, volts in ((125.0, 12.4), (160.0, 12.4), (92.0, 9.0), (92.0, 7.5)):
+            telem = Telemetry(temp, volts, 35.0, 0.5, 40.0, 60000.0, ["P0301"], (12.97, 77.59))
+            feats = telem_agent.process(telem)
+            legacy_in = agent._denormalize(feats)
+            raw_in = telem_agent.raw_features(telem)
+            print(f"[{label}] sent engine={temp:6.1f}C battery={volts:4.1f}V -> model saw "
+                  f"legacy {legacy_in['engine_temp_c']:6.1f}C/{legacy_in['battery_voltage']:4.1f}V p={predict_proba(agent.model_obj, legacy_in):.6f}  "
+                  f"raw {raw_in['engine_temp_c']:6.1f}C/{raw_in['battery_voltage']:4.1f}V p={predict_proba(agent.model_obj, raw_in):.6f}")
+        # the two clipped rows per signal must now score differently
+        hot = [agent.process(voice, telem_agent.process(t), telem_agent.raw_features(t)).risk_score
+               for t in (Telemetry(125.0, 12.4, 35.0, 0.5, 40.0, 60000.0, [], (0, 0)), Telemetry(160.0, 12.4, 35.0, 0.5, 40.0, 60000.0, [], (0, 0)))]
+        ok &= hot[0] != hot[1]
+
+        telem = Telemetry(102.5, 11.9, 28.0, 0.85, 25.0, 120000.0, ["P0520", "P0302"], (12.97, 77.59))
+        feats = telem_agent.process(telem)
+        repeat = 2000 if not compiled else 50000
+        t_legacy = _per_call(lambda: agent.process(voice, feats), repeat)
+        t_raw = _per_call(lambda: agent.process(voice, feats, telem_agent.raw_features(telem)), repeat)
+        print(f"[{label}] per call: legacy round trip {t_legacy:8.2f} us   raw path {t_raw:8.2f} us")
+    if not ok:
+        print("FAIL: model path still sees clipped inputs")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+# ensure project root is on path when running from benchmarks/ directory
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+import numpy as np
+from voiceguard.ensemble import CATEGORY_ALIASES, ModelEnsemble
+from voiceguard.inference import CompiledScorer, FEATURES, load_model, predict_proba_batch
+from voiceguard.pipeline import build_pipeline
+
+
+CATEGORIES = ["Electrical/Battery", "Cooling/Overheat", "Lubrication/Oil Pressure", "Drivetrain/Mechanical Vibration", "General Inspection"]
+
+
+def median_ms(fn, reps):
+    times = []
+    for _ in range(reps):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return np.median(times) * 1e3
+
+
+def variant(scorer, rng, name):
+    # a perturbed copy of production, standing in for a retrained candidate
+    return {"scorer": CompiledScorer(scorer.weights * rng.normal(1, 0.05, len(FEATURES)), scorer.bias + rng.normal(0, 0.2), FEATURES), "version": name}
+
+
+def build(prod, models, rng, category_models=True):
+    # production + the four per-category production models + shadows, `models` in total
+    ens = ModelEnsemble(prod)
+    scorer = prod["scorer"]
+    for short in ("battery", "cooling", "lubrication", "vibration"):
+        if category_models and ens.layout.W.shape[1] < models:
+            ens.register(f"{short}-v1", variant(scorer, rng, f"{short}-v1"), role="production", category=short)
+    while ens.layout.W.shape[1] < models:
+        name = f"shadow-{ens.layout.W.shape[1]}"
+        ens.register(name, variant(scorer, rng, name))
+    return ens
+
+
+def main():
+    ap = argparse.ArgumentParser(description="ModelEnsemble: one vectorized pass over N models vs scoring each model separately")
+    ap.add_argument("--model", default=str(ROOT / "models" / "lg.vgm"))
+    ap.add_argument("--rows", type=int, default=100000)
+    ap.add_argument("--models", default="1,2,4,8,16,32,64")
+    ap.add_argument("--reps", type=int, default=20)
+    args = ap.parse_args()
+    failures = []
+    prod = load_model(args.model)
+    rng = np.random.default_rng(7)
+    X = rng.normal(size=(args.rows, len(FEATURES))) * [8, 0.5, 6, 0.25, 20, 30000, 1] + [92, 12.4, 35, 0.5, 45, 60000, 1]
+    cats = rng.choice(CATEGORIES, args.rows)
+    counts = [int(m) for m in args.models.split(",")]
+
+    print(f"batch of {args.rows} rows, ms per batch (median of {args.reps})")
+    print(f"{'models':>7}{'ensemble':>11}{'x vs 1':>8}{'per model':>11}{'separate':>11}{'x vs 1':>8}{'row us':>9}")
+    base = sep_base = None
+    row = dict(zip(FEATURES, X[0].tolist()))
+    results = {}
+    for m in counts:
+        ens = build(prod, m, rng)
+        models = [{"scorer": CompiledScorer(ens.layout.W[:, j], ens.layout.b[j], FEATURES)} for j in range(m)]
+        # discarding the recorded logits each call keeps the backlog (and memory) flat
+        t = median_ms(lambda: (ens.score(X, cats), ens.reset_stats()), args.reps)
+        sep = median_ms(lambda: [predict_proba_batch(mo, X) for mo in models], args.reps)
+        t_row = median_ms(lambda: [ens.score_row(row, "Cooling/Overheat") for _ in range(1000)], 5)
+        ens.reset_stats()
+        base, sep_base = base or t, sep_base or sep
+        results[m] = (t, sep, t_row)
+        print(f"{m:>7}{t:>11.2f}{t / base:>8.2f}{t / m:>11.3f}{sep:>11.2f}{sep / sep_base:>8.2f}{t_row:>9.2f}")
+    hi = max(counts)
+    if len(counts) > 1 and results[hi][0] / results[min(counts)][0] > hi / min(counts) / 2:
+        failures.append(f"ensemble cost grew {results[hi][0] / results[min(counts)][0]:.1f}x for {hi // min(counts)}x models (want < half of linear)")
+    if len(counts) > 1 and results[hi][0] >= results[hi][1]:
+        failures.append(f"ensemble of {hi} ({results[hi][0]:.1f} ms) is not faster than scoring them one by one ({results[hi][1]:.1f} ms)")
+
+    # routing: every row gets exactly the score of the model that serves its category
+    ens = build(prod, 8, rng)
+    served = ens.score(X, cats)
+    names, P = ens.score_all(X)
+    want = P[:, 0].copy()
+    for short, category in CATEGORY_ALIASES.items():
+        if f"{short}-v1" in names:
+            rows = cats == category
+            want[rows] = P[rows, names.index(f"{short}-v1")]
+    err = float(np.abs(served - want).max())
+    prod_err = float(np.abs(P[:, 0] - predict_proba_batch(prod, X)).max())
+    print(f"\nrouting: max |served - routed model| {err:.2e}; production column vs predict_proba_batch {prod_err:.2e}")
+    if err > 1e-12 or prod_err > 1e-9:
+        failures.append("ensemble scores differ from the models they were built from")
+
+    # shadow stats land asynchronously and match a direct computation
+    ens.reset_stats()
+    ens.start()
+    ens.score(X, cats)
+    time.sleep(ens.interval * 2.5)
+    pending = len(ens._pending)
+    stats = ens.shadow_stats()
+    ens.stop()
+    col = names.index("shadow-5")
+    direct = float(np.abs(P[:, col] - want).mean())
+    print(f"shadow stats folded in the background (pending after {ens.interval * 2.5:.2f}s: {pending}); "
+          f"shadow-5 mean |diff| {stats['shadow-5']['mean_abs_diff']:.5f} vs direct {direct:.5f}, "
+          f"flip rate {stats['shadow-5']['flip_rate']:.4f}, rows {stats['shadow-5']['rows']}")
+    if pending or abs(stats["shadow-5"]["mean_abs_diff"] - direct) > 1e-9 or stats["shadow-5"]["rows"] != args.rows:
+        failures.append("background shadow stats missing or wrong")
+
+    # end to end: single requests through the pipeline, production model vs a 16-model ensemble
+    single = build_pipeline(model_obj=prod)
+    ens = build(prod, 16, rng).start()
+    multi = build_pipeline(model_obj=ens)
+    reqs = [("engine overheating and smoke", {"engine_temp_c": 100 + i % 20, "odometer_km": 1000 * i}, {"id": f"C{i}"}) for i in range(2000)]
+    for label, pipe in (("1 model", single), ("16-model ensemble", multi)):
+        t0 = time.perf_counter()
+        for voice, telem, customer in reqs:
+            pipe.run(voice, telem, customer)
+        print(f"pipeline.run, {label:<18}{(time.perf_counter() - t0) / len(reqs) * 1e6:8.1f} us/request")
+    ens.stop()
+    rows = sum(s["rows"] for s in ens.shadow_stats().values())
+    print(f"shadow comparisons recorded: {rows}, dropped {ens.dropped}")
+    if not rows:
+        failures.append("pipeline ensemble did not record shadows")
+
+    for f in failures:
+        print(f"FAIL {f}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
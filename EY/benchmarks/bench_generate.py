@@ -0,0 +1,49 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+# ensure project root is on path when running from benchmarks/ directory
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+from train import generate_synthetic
+from voiceguard.synthetic import write_synthetic
+
+
+def run(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    fn(*args, **kwargs)
+    seconds = time.perf_counter() - t0
+    tracemalloc.start()
+    fn(*args, **kwargs)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def main():
+    ap = argparse.ArgumentParser(description="rows/s of train.generate_synthetic vs the vectorized voiceguard.synthetic writer")
+    ap.add_argument("--rows", type=int, default=1000000)
+    ap.add_argument("--legacy-max", type=int, default=1000000, help="cap for the per-row generator (it is slow)")
+    args = ap.parse_args()
+    n = args.rows
+    cases = [("generate_synthetic (csv)", "legacy.csv", min(n, args.legacy_max), lambda p, k: generate_synthetic(p, k))]
+    for fmt, voice in (("csv", False), ("csv", True), ("ndjson", False), ("ndjson", True), ("npy", False)):
+        name = f"vectorized {fmt}{' + voice' if voice else ''}"
+        cases.append((name, f"fleet_{fmt}_{voice}.{fmt}", n, lambda p, k, fmt=fmt, voice=voice: write_synthetic(p, k, format=fmt, voice=voice)))
+    print(f"  {'generator':<28}{'rows':>10}{'rows/s':>12}{'speedup':>9}{'peak MB':>9}{'bytes/row':>11}")
+    base = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, filename, rows, fn in cases:
+            path = os.path.join(tmp, filename)
+            seconds, peak = run(fn, path, rows)
+            rate = rows / seconds
+            base = base or rate
+            print(f"  {name:<28}{rows:>10}{rate:12.0f}{rate / base:8.1f}x{peak / 1e6:9.1f}{os.path.getsize(path) / rows:11.1f}")
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+import numpy as np
+# ensure project root is on path when running from benchmarks/ directory
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+from voiceguard.agents import SchedulingAgent
+from voiceguard.geo import CenterIndex, haversine_km_array
+
+
+def random_centers(n: int, rng) -> list:
+    if n <= len(SchedulingAgent.CENTERS):
+        return SchedulingAgent.CENTERS[:n]
+    lat = rng.uniform(8.0, 32.0, n)
+    lon = rng.uniform(68.0, 92.0, n)
+    return [{"id": f"SC-{i:05d}", "name": f"Center {i}", "lat": float(a), "lon": float(b)} for i, (a, b) in enumerate(zip(lat, lon))]
+
+
+def brute_force(index: CenterIndex, lats, lons, k):
+    d = haversine_km_array(lats[:, None], lons[:, None], index.lat, index.lon)
+    return np.sort(d, axis=1)[:, :k]
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Nearest service-center lookup: index vs brute-force haversine")
+    ap.add_argument("--centers", default="4,100,1000,10000")
+    ap.add_argument("--queries", type=int, default=20000)
+    ap.add_argument("--k", type=int, default=3)
+    args = ap.parse_args()
+    rng = np.random.default_rng(11)
+    lats = rng.uniform(8.0, 32.0, args.queries)
+    lons = rng.uniform(68.0, 92.0, args.queries)
+    failed = False
+    print(f"{'centers':>8} {'build ms':>9} {'single us':>10} {'batch q/s':>12} {'brute q/s':>12} {'max err km':>11}")
+    for n in [int(x) for x in args.centers.split(",")]:
+        centers = random_centers(n, rng)
+        t0 = time.perf_counter()
+        index = CenterIndex(centers)
+        build_ms = (time.perf_counter() - t0) * 1000
+
+        t0 = time.perf_counter()
+        single = [index.nearest((la, lo))[0][1] for la, lo in zip(lats[:2000].tolist(), lons[:2000].tolist())]
+        single_us = (time.perf_counter() - t0) / 2000 * 1e6
+
+        t0 = time.perf_counter()
+        idx, dist = index.nearest_batch(lats, lons, k=args.k)
+        t_batch = time.perf_counter() - t0
+        m = min(args.queries, 2000)
+        t0 = time.perf_counter()
+        ref = brute_force(index, lats[:m], lons[:m], args.k)
+        t_brute = (time.perf_counter() - t0) / m * args.queries
+
+        # distances must match brute force (ties may pick a different, equally near center)
+        err = float(np.abs(dist[:m] - ref).max())
+        picked = haversine_km_array(lats[:m, None], lons[:m, None], index.lat[idx[:m]], index.lon[idx[:m]])
+        err = max(err, float(np.abs(picked - ref).max()), float(np.abs(np.array(single[:m]) - ref[:, 0]).max()))
+        failed |= err > 1e-6
+        print(f"{n:>8} {build_ms:>9.2f} {single_us:>10.2f} {args.queries / t_batch:>12.0f} {args.queries / t_brute:>12.0f} {err:>11.2e}")
+    if failed:
+        print("FAIL: index disagrees with brute-force haversine")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
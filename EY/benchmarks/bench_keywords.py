@@ -0,0 +1,91 @@
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+# ensure project root is on path when running from benchmarks/ directory
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+from voiceguard.agents import VoiceCall, VoiceCustomerAgent, VoiceSummary
+
+
+FILLER = (
+    "the car was fine yesterday but today when i drove to work it felt strange and the dashboard "
+    "showed a light i could not read so my wife called the dealer who said to wait until monday"
+).split()
+EXTRA = ["shot", "toil", "overheated", "oil pressure", "won't started", "breakdowns", "serviced", "hotel",
+         "engine stopped suddenly", "no power steering", "ब्रेक", "इंजन गरम", "बैटरी खत्म"]
+
+
+def legacy_process(agent: VoiceCustomerAgent, call: VoiceCall) -> VoiceSummary:
+    # the pre-matcher implementation, kept verbatim as the reference
+    text = call.text.lower()
+    symptoms = []
+    for cat, kws in agent.keywords.items():
+        if any(kw.lower() in text for kw in kws):
+            symptoms.append(cat)
+    base = min(len(symptoms) / 4.0, 1.0)
+    if any(kw.lower() in text for kw in agent.matcher.groups[agent._URGENT]):
+        base = max(base, 0.8)
+    severity = round(base, 2)
+    intent = "service_request" if (any(kw.lower() in text for kw in agent.matcher.groups[agent._INTENT]) or symptoms) else "general_inquiry"
+    return VoiceSummary(customer_id=call.customer_id, symptoms=symptoms, severity=severity, intent=intent)
+
+
+def big_vocabulary(n_phrases: int, rng: random.Random) -> dict:
+    vocab = {cat: list(kws) for cat, kws in VoiceCustomerAgent.KEYWORDS.items()}
+    vocab["brake"] += ["ब्रेक", "ब्रेक फेल"]
+    vocab["overheat"] += ["इंजन गरम", "सूडान गरम"]
+    vocab["battery"] += ["बैटरी खत्म"]
+    cats = list(vocab)
+    syll = ["ka", "ro", "mi", "ten", "sul", "var", "po", "dre", "lin", "qu"]
+    while sum(len(v) for v in vocab.values()) < n_phrases:
+        phrase = " ".join("".join(rng.choice(syll) for _ in range(rng.randint(2, 4))) for _ in range(rng.randint(1, 3)))
+        vocab[rng.choice(cats)].append(phrase)
+    return {"symptoms": vocab, "urgent": VoiceCustomerAgent.URGENT_TERMS, "intent": VoiceCustomerAgent.INTENT_TERMS}
+
+
+def corpus(agent: VoiceCustomerAgent, n: int, words: int, rng: random.Random) -> list:
+    phrases = [kw for kws in agent.matcher.groups.values() for kw in kws] + EXTRA
+    docs = []
+    for _ in range(n):
+        toks = [rng.choice(FILLER) for _ in range(words)]
+        for _ in range(rng.randint(0, 6)):
+            toks.insert(rng.randrange(len(toks) + 1), rng.choice(phrases).upper() if rng.random() < 0.2 else rng.choice(phrases))
+        docs.append(" ".join(toks))
+    return docs
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Compiled keyword matcher vs per-keyword substring scans")
+    ap.add_argument("--docs", type=int, default=500)
+    ap.add_argument("--words", type=int, default=800, help="words per transcript (~5 KB at 800)")
+    ap.add_argument("--vocab", default="0,200,1000", help="vocabulary sizes; 0 = built-in")
+    args = ap.parse_args()
+    rng = random.Random(21)
+    failed = 0
+    print(f"{'phrases':>8} {'KB/doc':>7} {'legacy us':>10} {'matcher us':>11} {'speedup':>8} {'mismatch':>9}")
+    for size in [int(x) for x in args.vocab.split(",")]:
+        agent = VoiceCustomerAgent(big_vocabulary(size, rng) if size else None)
+        docs = corpus(agent, args.docs, args.words, rng)
+        calls = [VoiceCall(customer_id="C", text=d, timestamp=0.0, location=(0.0, 0.0)) for d in docs]
+        t0 = time.perf_counter()
+        ref = [legacy_process(agent, c) for c in calls]
+        t_legacy = (time.perf_counter() - t0) / len(calls) * 1e6
+        t0 = time.perf_counter()
+        new = [agent.process(c) for c in calls]
+        t_new = (time.perf_counter() - t0) / len(calls) * 1e6
+        mismatch = sum(a != b for a, b in zip(ref, new))
+        failed += mismatch
+        n_phrases = sum(len(v) for v in agent.matcher.groups.values())
+        kb = sum(len(d) for d in docs) / len(docs) / 1024
+        print(f"{n_phrases:>8} {kb:>7.1f} {t_legacy:>10.1f} {t_new:>11.1f} {t_legacy / t_new:>7.1f}x {mismatch:>9}")
+    sample = "Engine is too HOT, oil pressure low, won't start - urgent"
+    print("matches:", [(m.group, m.keyword, m.start) for m in VoiceCustomerAgent().matches(sample)])
+    if failed:
+        print("FAIL: matcher disagrees with the substring implementation")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+# ensure project root is on path when running from benchmarks/ directory
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from voiceguard.live import LiveView, LiveWorker
+from voiceguard.model import load_model
+from voiceguard.pipeline import build_pipeline
+
+VOICE = "My car has been overheating and there is rattling vibration at low speeds. It's urgent."
+TELEMETRY = {"engine_temp_c": 102.5, "battery_voltage": 11.9, "oil_pressure_psi": 28.0, "vibration_g": 0.85,
+             "speed_kph": 25.0, "odometer_km": 120000, "error_codes": ["P0520", "P0302"]}
+CUSTOMER = {"id": "CUST", "location": [12.9716, 77.5946]}
+
+
+def render(view, frames, ids):
+    # what the dashboard fragment does per refresh, minus the websocket: apply deltas, build
+    # the two 20-row tables and the history chart, serialize them to Arrow like st.dataframe
+    changed = view.apply(frames)
+    tables = [view.rows(view.top(20), ids), view.rows(changed[np.argsort(-view.risk[changed])][:20], ids)]
+    tables.append(pd.DataFrame(view.history))
+    return sum(pa.Table.from_pandas(t).nbytes for t in tables)
+
+
+def legacy_tick(model_path, n):
+    # the old live loop per refresh: rebuild the pipeline, reload the pickle, run() each vehicle
+    pipeline = build_pipeline(model_obj=load_model(model_path))
+    for _ in range(n):
+        pipeline.run(VOICE, TELEMETRY, CUSTOMER)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Live dashboard: background scoring per tick vs render cost per frame")
+    ap.add_argument("--vehicles", default="100,500,1000")
+    ap.add_argument("--ticks", type=int, default=20)
+    ap.add_argument("--model", default="models/lg.pkl")
+    args = ap.parse_args()
+    model = load_model(args.model, compiled=True)
+    print(f"{'vehicles':>9}{'score ms/tick':>15}{'changed/tick':>14}{'render ms':>11}{'frame KB':>10}{'max Hz':>8}{'legacy ms/tick':>16}")
+    for n in (int(v) for v in args.vehicles.split(",")):
+        worker = LiveWorker(build_pipeline(model_obj=model), vehicles=n, voice_text=VOICE, telemetry=TELEMETRY, customer=CUSTOMER)
+        view, ids = LiveView(n), worker.ids
+        render(view, [worker.tick()], ids)
+        score, changed, draw, size = [], [], [], []
+        for _ in range(args.ticks):
+            frame = worker.tick()
+            score.append(frame.score_ms)
+            changed.append(len(frame.index))
+            t0 = time.perf_counter()
+            size.append(render(view, [frame], ids))
+            draw.append((time.perf_counter() - t0) * 1e3)
+        t0 = time.perf_counter()
+        legacy_tick(args.model, min(n, 100))
+        legacy = (time.perf_counter() - t0) * 1e3 * n / min(n, 100)
+        s, d = np.median(score), np.median(draw)
+        print(f"{n:>9}{s:15.1f}{np.mean(changed):14.0f}{d:11.2f}{np.mean(size) / 1024:10.1f}{1000 / max(s, d):8.1f}{legacy:16.0f}")
+
+    # a page that polls slower than the worker ticks: frames merge in the queue, nothing is lost
+    worker = LiveWorker(build_pipeline(model_obj=model), vehicles=500, interval=0.05, queue_size=4,
+                        voice_text=VOICE, telemetry=TELEMETRY, customer=CUSTOMER).start()
+    view = LiveView(500)
+    for _ in range(4):
+        time.sleep(0.5)
+        view.apply(worker.poll())
+    worker.stop()
+    view.apply(worker.poll())
+    in_sync = bool(np.allclose(view.risk, worker._sent_risk))
+    print(f"slow consumer: {worker.ticks} ticks, {worker.merged} frames merged in a 4-frame queue, view matches worker: {in_sync}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import argparse
+import sys
+import time
+import timeit
+from pathlib import Path
+# ensure project root is on path when running from benchmarks/ directory
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+from bench_batch import make_fleet
+from voiceguard.metrics import STAGES, PipelineMetrics
+from voiceguard.model import load_model
+from voiceguard.pipeline import VoiceGuardPipeline, build_pipeline
+
+
+# the default configuration is held to the instrumentation budget (share of one run() call)
+BUDGET = 0.02
+BUDGETED = ("metrics",)
+
+
+class _NoopPipeline:
+    # the real run() dispatch around a _run() that only does the stage marks
+    run = VoiceGuardPipeline.run
+
+    def __init__(self, metrics):
+        self.metrics = metrics
+
+    @staticmethod
+    def _run(text, telemetry, customer, marks):
+        if marks is not None:
+            for _ in STAGES:
+                marks.append(time.perf_counter())
+        return {}
+
+
+def _per_call_us(fn, number: int) -> float:
+    # min of repeats: the least noisy estimate of a fixed per-call cost
+    return min(timeit.repeat(fn, number=number, repeat=7)) / number * 1e6
+
+
+def instrumentation_cost(metrics: PipelineMetrics, number: int = 10000, rounds: int = 40) -> float:
+    # short interleaved rounds, min of each side: machine noise hits both alike
+    disabled, enabled = _NoopPipeline(None), _NoopPipeline(metrics)
+    off = on = float("inf")
+    for _ in range(rounds):
+        off = min(off, timeit.timeit(lambda: disabled.run("", None, None), number=number))
+        on = min(on, timeit.timeit(lambda: enabled.run("", None, None), number=number))
+    return (on - off) / number * 1e6
+
+
+def main():
+    ap = argparse.ArgumentParser(description="overhead of PipelineMetrics on VoiceGuardPipeline.run")
+    ap.add_argument("--requests", type=int, default=5000, help="distinct requests per block")
+    ap.add_argument("--blocks", type=int, default=20)
+    ap.add_argument("--profile-every", type=int, default=1000)
+    args = ap.parse_args()
+    model_obj = load_model(str(ROOT / "models" / "lg.pkl"), compiled=True)
+    requests = list(zip(*make_fleet(args.requests)))
+    pe = args.profile_every
+    metrics = {
+        "metrics": lambda: PipelineMetrics(),
+        "metrics, all stages timed": lambda: PipelineMetrics(stage_every=1),
+        "metrics+timings": lambda: PipelineMetrics(timings=True),
+        "metrics+timings 1/16": lambda: PipelineMetrics(timings=16),
+        f"profile 1/{pe}": lambda: PipelineMetrics(sample_every=pe),
+        f"profile+tracemalloc 1/{pe}": lambda: PipelineMetrics(sample_every=pe, trace_memory=True),
+    }
+
+    # 1) end-to-end A/B. Machine noise here is larger than the effect being measured, so
+    # configurations take turns block by block (rotating who goes first) and sums are compared.
+    baseline = build_pipeline(model_obj=model_obj)
+    configs = {"disabled": baseline.run, "direct _run()": lambda t, tel, c: baseline._run(t, tel, c, None)}
+    configs.update({name: build_pipeline(model_obj=model_obj, metrics=make()).run for name, make in metrics.items()})
+    totals = dict.fromkeys(configs, 0.0)
+    names = list(configs)
+    for b in range(args.blocks + 1):
+        for name in names[b % len(names):] + names[:b % len(names)]:
+            fn = configs[name]
+            t0 = time.perf_counter()
+            for text, tel, cust in requests:
+                fn(text, tel, cust)
+            if b:  # block 0 is warm-up
+                totals[name] += time.perf_counter() - t0
+    n = args.requests * args.blocks
+    run_us = totals["disabled"] / n * 1e6
+    print(f"end-to-end, {n} runs per configuration (noisy: compare against 'direct _run()')")
+    for name in names:
+        print(f"  {name:<30} {totals[name] / n * 1e6:7.2f} us/run  {(totals[name] / totals['disabled'] - 1) * 100:+6.2f}%")
+
+    # 2) the instrumentation's own per-run cost (run() with vs without metrics around a
+    # _run() that does nothing but the stage marks), relative to the measured run() latency
+    print(f"instrumentation cost per run (vs {run_us:.1f} us run)")
+    failures = []
+    for name, make in metrics.items():
+        if "profile" in name:
+            continue
+        cost = instrumentation_cost(make())
+        print(f"  {name:<30} {cost:7.3f} us/run  {cost / run_us * 100:+6.2f}%")
+        if name in BUDGETED and cost / run_us > BUDGET:
+            failures.append(f"{name} costs {cost / run_us * 100:.2f}% of a run (budget {BUDGET * 100:g}%)")
+    print(f"  {'disabled':<30} {'one `is None` check in run()':>30}")
+    for f in failures:
+        print(f"FAIL {f}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+# ensure project root is on path when running from benchmarks/ directory
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+from bench_batch import make_fleet
+from voiceguard.model import load_model
+from voiceguard.pipeline import build_pipeline
+from voiceguard.results import ResultReader, ResultWriter, _parquet
+
+
+def write_json(path, results):
+    # what archiving looks like today: one pretty-printed JSON document
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+
+def write_ndjson(path, results):
+    with open(path, "w", encoding="utf-8") as f:
+        for r in results:
+            f.write(json.dumps(r) + "\n")
+
+
+def json_group_mean(path):
+    # the JSON equivalent of ResultReader.group_mean("issue_category"): parse every record
+    sums, counts = {}, {}
+    with open(path, encoding="utf-8") as f:
+        records = (json.loads(line) for line in f) if path.endswith(".ndjson") else json.load(f)
+        for r in records:
+            cat = r["analytics"]["issue_category"]
+            sums[cat] = sums.get(cat, 0.0) + r["analytics"]["risk_score"]
+            counts[cat] = counts.get(cat, 0) + 1
+    return {k: sums[k] / counts[k] for k in sums}
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Bytes per record and write/query throughput: nested JSON vs columnar results")
+    ap.add_argument("--vehicles", type=int, default=200000)
+    ap.add_argument("--chunk", type=int, default=50000, help="rows per run_columns/run_batch call and per row group")
+    args = ap.parse_args()
+    pipeline = build_pipeline(model_obj=load_model(str(ROOT / "models" / "lg.pkl"), compiled=True))
+    texts, telemetry, customers = make_fleet(args.vehicles)
+    chunks = [slice(i, i + args.chunk) for i in range(0, args.vehicles, args.chunk)]
+    results = [r for s in chunks for r in pipeline.run_batch(texts[s], telemetry[s], customers[s])]
+    columns = [pipeline.run_columns(texts[s], telemetry[s], customers[s]) for s in chunks]
+    n = len(results)
+
+    formats = ["parquet", "npz"] if _parquet() is not None else ["npz"]
+    cases = [
+        ("json indent=2", "results.json", lambda p: write_json(p, results)),
+        ("ndjson", "results.ndjson", lambda p: write_ndjson(p, results)),
+    ]
+    for fmt in formats:
+        cases.append((f"{fmt} from dicts", f"dicts.{fmt}", lambda p, fmt=fmt: _write(p, fmt, [results[s] for s in chunks])))
+        cases.append((f"{fmt} from run_columns", f"columns.{fmt}", lambda p, fmt=fmt: _write(p, fmt, columns)))
+
+    print(f"{n} results, {len(chunks)} batches of {args.chunk}")
+    print(f"  {'format':<24}{'bytes/record':>13}{'records/s':>12}{'query s':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, filename, write in cases:
+            path = os.path.join(tmp, filename)
+            t0 = time.perf_counter()
+            write(path)
+            t_write = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            if filename.endswith((".json", ".ndjson")):
+                means = json_group_mean(path)
+            else:
+                means = ResultReader(path).group_mean("issue_category")
+            t_query = time.perf_counter() - t0
+            print(f"  {name:<24}{os.path.getsize(path) / n:13.1f}{n / t_write:12.0f}{t_query:10.3f}")
+    print("  query: mean risk_score per issue_category (JSON parses every record; columnar reads two memory-mapped columns)")
+
+
+def _write(path, fmt, batches):
+    with ResultWriter(path, format=fmt) as w:
+        for batch in batches:
+            w.write(batch)
+
+
+if __name__ == "__main__":
+    main()
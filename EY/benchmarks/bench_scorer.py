@@ -0,0 +1,55 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+# ensure project root is on path when running from benchmarks/ directory
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+from voiceguard.model import FEATURES, load_model, predict_proba, predict_proba_batch
+
+
+def _timeit(fn, repeat: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat
+
+
+def main():
+    ap = argparse.ArgumentParser(description="sklearn predict_proba vs compiled scorer")
+    ap.add_argument("--model", default=str(ROOT / "models" / "lg.pkl"))
+    ap.add_argument("--tol", type=float, default=1e-9)
+    args = ap.parse_args()
+    sk = load_model(args.model)
+    fast = load_model(args.model, compiled=True)
+
+    # equivalence: the training set plus out-of-range rows that stress both sigmoid tails
+    X = pd.read_csv(ROOT / "data" / "sim_telemetry.csv")[FEATURES].to_numpy(dtype=float)
+    rng = np.random.default_rng(0)
+    X = np.vstack([X, X[rng.integers(0, len(X), 5000)] * rng.uniform(0.0, 3.0, (5000, len(FEATURES)))])
+    p_sk = predict_proba_batch(sk, X)
+    p_fast = predict_proba_batch(fast, X)
+    rows = [dict(zip(FEATURES, x)) for x in X[:2000].tolist()]
+    p_row = np.array([predict_proba(fast, r) for r in rows])
+    diff = max(np.abs(p_sk - p_fast).max(), np.abs(p_sk[:2000] - p_row).max())
+    print(f"equivalence over {len(X)} rows: max |p_sklearn - p_compiled| = {diff:.3e}")
+    if diff > args.tol:
+        print(f"FAIL: exceeds tolerance {args.tol}")
+        sys.exit(1)
+
+    row = rows[0]
+    t_sk = _timeit(lambda: predict_proba(sk, row), 2000)
+    t_fast = _timeit(lambda: predict_proba(fast, row), 20000)
+    print(f"single row   sklearn {t_sk * 1e6:8.2f} us   compiled {t_fast * 1e6:8.2f} us   {t_sk / t_fast:6.1f}x")
+    for n in (100, 10000, 1000000):
+        Xn = X[rng.integers(0, len(X), n)]
+        rep = max(3, 200000 // n)
+        t_sk = _timeit(lambda: predict_proba_batch(sk, Xn), rep)
+        t_fast = _timeit(lambda: predict_proba_batch(fast, Xn), rep)
+        print(f"batch {n:>7}  sklearn {n / t_sk:12.0f} rows/s   compiled {n / t_fast:12.0f} rows/s   {t_sk / t_fast:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import argparse
+import collections
+import sys
+import time
+from pathlib import Path
+import numpy as np
+# ensure project root is on path when running from benchmarks/ directory
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+from voiceguard.agents import SchedulingAgent
+from voiceguard.slots import SlotAllocator
+
+
+FIXED_NOW = 1_765_000_000.0  # injectable clock: every run books against the same instant
+
+
+def make_requests(n: int, seed: int = 3):
+    rng = np.random.default_rng(seed)
+    # a heat wave: most cars cluster around Bengaluru, the rest spread over India
+    hot = rng.random(n) < 0.7
+    lats = np.where(hot, rng.normal(12.97, 0.15, n), rng.uniform(8.0, 30.0, n))
+    lons = np.where(hot, rng.normal(77.59, 0.15, n), rng.uniform(70.0, 88.0, n))
+    risk = np.round(rng.beta(2, 2, n), 3)
+    priorities = np.where(risk >= 0.7, "urgent", "normal").tolist()
+    return lats, lons, risk, priorities
+
+
+def make_allocator(centers):
+    return SlotAllocator(centers, bays=6, clock=lambda: FIXED_NOW)
+
+
+def check_capacity(bookings, bays: int) -> int:
+    per_slot = collections.Counter((b.center["id"], b.slot_ts) for b in bookings if not b.waitlisted)
+    return sum(1 for c in per_slot.values() if c > bays)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Slot allocator throughput and correctness")
+    ap.add_argument("--bookings", type=int, default=100000)
+    ap.add_argument("--centers", type=int, default=200, help="size of the random catalog (built-in four are always included)")
+    args = ap.parse_args()
+    rng = np.random.default_rng(5)
+    centers = list(SchedulingAgent.CENTERS) + [
+        {"id": f"SC-{i:04d}", "name": f"Center {i}", "lat": float(a), "lon": float(b)}
+        for i, (a, b) in enumerate(zip(rng.uniform(8.0, 30.0, args.centers), rng.uniform(70.0, 88.0, args.centers)))
+    ]
+    lats, lons, risk, priorities = make_requests(args.bookings)
+
+    alloc = make_allocator(centers)
+    t0 = time.perf_counter()
+    single = [alloc.book((la, lo), p) for la, lo, p in zip(lats.tolist(), lons.tolist(), priorities)]
+    t_single = time.perf_counter() - t0
+
+    alloc = make_allocator(centers)
+    t0 = time.perf_counter()
+    bulk = alloc.allocate_batch(lats, lons, risk, priorities)
+    t_bulk = time.perf_counter() - t0
+    again = make_allocator(centers).allocate_batch(lats, lons, risk, priorities)
+
+    deterministic = [(b.center["id"], b.slot_ts) for b in bulk] == [(b.center["id"], b.slot_ts) for b in again]
+    over = check_capacity(single, 6) + check_capacity(bulk, 6)
+    blr = [b for b in bulk if b.center["id"] == "BLR-01" and not b.waitlisted]
+    nearest_idx, _ = alloc.index.nearest_batch(lats, lons)
+    spilled = sum(1 for i, b in zip(nearest_idx[:, 0].tolist(), bulk) if b.center["id"] != centers[i]["id"])
+    waitlisted = sum(b.waitlisted for b in bulk)
+    urgent_wait = np.array([b.slot_ts - FIXED_NOW for b in bulk if b.priority == "urgent" and not b.waitlisted]) / 3600
+    far = sum(1 for i, b in zip(nearest_idx[:, 0].tolist(), bulk) if b.center["id"] != centers[i]["id"] and b.distance_km > alloc.max_spill_km)
+
+    print(f"{args.bookings} bookings over {len(centers)} centers")
+    print(f"  single book():     {args.bookings / t_single:10.0f} bookings/s")
+    print(f"  allocate_batch():  {args.bookings / t_bulk:10.0f} bookings/s")
+    print(f"  BLR-01 bookings: {len(blr)}, distinct BLR-01 slots: {len({b.slot_ts for b in blr})}")
+    print(f"  spilled to a farther center: {spilled}   waitlisted: {waitlisted}   spilled past {alloc.max_spill_km:.0f} km: {far}")
+    print(f"  urgent wait hours p50={np.percentile(urgent_wait, 50):.1f} p99={np.percentile(urgent_wait, 99):.1f}")
+    print(f"  deterministic: {deterministic}   over-capacity slots: {over}")
+    if not deterministic or over or far:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import argparse
+import subprocess
+import sys
+import time
+from pathlib import Path
+# ensure project root is on path when running from benchmarks/ directory
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+# modules the scoring path must not pull in; training code (voiceguard.training) needs them
+FORBIDDEN = ("pandas", "sklearn", "scipy")
+# (label, statement run in a fresh interpreter, checked against the budget and FORBIDDEN)
+ENTRY_POINTS = [
+    ("import voiceguard.inference", "import voiceguard.inference", True),
+    ("import voiceguard.pipeline", "import voiceguard.pipeline", True),
+    ("pipeline + lg.vgm + 1 run", "from voiceguard.inference import load_model; from voiceguard.pipeline import build_pipeline; "
+     "build_pipeline(model_obj=load_model('models/lg.vgm')).run('overheating', {}, {'id': 'c'})", True),
+    ("pipeline + lg.pkl (pickle)", "from voiceguard.inference import load_model; from voiceguard.pipeline import build_pipeline; "
+     "build_pipeline(model_obj=load_model('models/lg.pkl')).run('overheating', {}, {'id': 'c'})", False),
+    ("import voiceguard.training", "import voiceguard.training", False),
+]
+
+
+def import_time_ms(stmt: str) -> float:
+    # sum of the top-level cumulative times reported by -X importtime
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-W", "ignore", "-c", stmt], cwd=ROOT, capture_output=True, text=True, check=True)
+    total = 0
+    for line in proc.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit() and not name.startswith("  "):
+                total += int(cumulative)
+    return total / 1000
+
+
+def wall_ms(stmt: str) -> float:
+    t0 = time.perf_counter()
+    subprocess.run([sys.executable, "-W", "ignore", "-c", stmt], cwd=ROOT, check=True)
+    return (time.perf_counter() - t0) * 1e3
+
+
+def loaded(stmt: str):
+    code = f"{stmt}\nimport sys; print(','.join(m for m in {FORBIDDEN!r} if m in sys.modules))"
+    out = subprocess.run([sys.executable, "-W", "ignore", "-c", code], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    return [m for m in out.strip().split(",") if m]
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Cold-start import time of the scoring path (python -X importtime) with a budget gate")
+    ap.add_argument("--repeat", type=int, default=5, help="fresh interpreters per entry point; the fastest is reported")
+    ap.add_argument("--budget-ms", type=float, default=400.0, help="max import time for the scoring entry points")
+    args = ap.parse_args()
+    print(f"  {'entry point':<30}{'import ms':>10}{'wall ms':>9}  heavy modules loaded")
+    failures = []
+    for label, stmt, gated in ENTRY_POINTS:
+        imp = min(import_time_ms(stmt) for _ in range(args.repeat))
+        wall = min(wall_ms(stmt) for _ in range(args.repeat))
+        heavy = loaded(stmt)
+        print(f"  {label:<30}{imp:10.1f}{wall:9.1f}  {', '.join(heavy) or '-'}")
+        if gated and imp > args.budget_ms:
+            failures.append(f"{label}: {imp:.0f} ms import time > {args.budget_ms:.0f} ms budget")
+        if gated and heavy:
+            failures.append(f"{label}: imports {', '.join(heavy)}")
+    for f in failures:
+        print(f"FAIL {f}")
+    if failures:
+        sys.exit(1)
+    print(f"OK: scoring entry points within {args.budget_ms:.0f} ms and free of {', '.join(FORBIDDEN)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import argparse
+import dataclasses
+import gc
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+# ensure project root is on path when running from benchmarks/ directory
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+import numpy as np
+from voiceguard.agents import DiagnosisResult, Telemetry, TelemetryAgent
+from voiceguard.state import FleetState
+
+
+def unslotted(cls):
+    # the same dataclass without slots=True, i.e. what agents.py had before
+    return dataclasses.make_dataclass(cls.__name__, [(f.name, f.type) for f in dataclasses.fields(cls)])
+
+
+def synthetic_columns(n: int, seed: int = 5):
+    rng = np.random.default_rng(seed)
+    return {
+        "engine_temp_c": rng.normal(92, 8, n).round(2),
+        "battery_voltage": rng.normal(12.4, 0.5, n).round(2),
+        "oil_pressure_psi": rng.normal(35, 6, n).round(2),
+        "vibration_g": np.abs(rng.normal(0.5, 0.25, n)).round(3),
+        "speed_kph": np.abs(rng.normal(45, 20, n)).round(1),
+        "odometer_km": np.abs(rng.normal(60000, 30000, n)).round(0),
+        "error_code_count": np.abs(rng.normal(1, 1, n)).astype(int).astype(float),
+        "lat": rng.uniform(8.0, 30.0, n),
+        "lon": rng.uniform(70.0, 88.0, n),
+        "risk_score": rng.uniform(0, 1, n).round(3),
+    }
+
+
+def build_objects(cols, telemetry_cls, diagnosis_cls):
+    # per-vehicle state as the agents produce it: Telemetry, TelemetryAgent.process() dict,
+    # DiagnosisResult with its own contributing_signals copy
+    agent = TelemetryAgent()
+    state = []
+    rows = zip(*(cols[k].tolist() for k in ("engine_temp_c", "battery_voltage", "oil_pressure_psi", "vibration_g", "speed_kph",
+                                              "odometer_km", "error_code_count", "lat", "lon", "risk_score")))
+    for temp, batt, oil, vib, speed, odo, codes, lat, lon, risk in rows:
+        telem = telemetry_cls(temp, batt, oil, vib, speed, odo, ["P0300"] * int(codes), (lat, lon))
+        feats = agent.process(telem)
+        diag = diagnosis_cls(risk, "General Inspection", {**feats, "voice_severity": 0.0})
+        state.append((telem, feats, diag))
+    return state
+
+
+def build_fleet(cols):
+    fleet = FleetState.from_columns(cols)
+    fleet.update_features()
+    fleet.column("risk_score")[:] = cols["risk_score"]
+    return fleet
+
+
+def measure(fn, *args):
+    gc.collect()
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    obj = fn(*args)
+    seconds = time.perf_counter() - t0
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, current, peak, seconds
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Memory of per-vehicle state: dataclass objects vs slotted vs FleetState")
+    ap.add_argument("--vehicles", type=int, default=1000000)
+    args = ap.parse_args()
+    n = args.vehicles
+    cols = synthetic_columns(n)
+    cases = [
+        ("dataclasses (no slots)", build_objects, cols, unslotted(Telemetry), unslotted(DiagnosisResult)),
+        ("dataclasses (slots=True)", build_objects, cols, Telemetry, DiagnosisResult),
+        ("FleetState", build_fleet, cols),
+    ]
+    print(f"{n} vehicles: telemetry + features + risk held in memory (tracemalloc)")
+    print(f"  {'representation':<26}{'retained MB':>12}{'bytes/veh':>11}{'peak MB':>10}{'build s':>9}")
+    for name, fn, *fn_args in cases:
+        obj, current, peak, seconds = measure(fn, *fn_args)
+        print(f"  {name:<26}{current / 1e6:12.1f}{current / n:11.0f}{peak / 1e6:10.1f}{seconds:9.2f}")
+        del obj
+
+    fleet = build_fleet(cols)
+    idx = np.random.default_rng(1).integers(0, n, 100000).tolist()
+    t0 = time.perf_counter()
+    sum(fleet[i].engine_temp_c for i in idx)
+    t_view = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    window = fleet[n // 2:n // 2 + 1000]
+    t_slice = time.perf_counter() - t0
+    print(f"  view access: {t_view / len(idx) * 1e6:.2f} us per fleet[i].field; "
+          f"fleet[a:b] shares memory: {np.shares_memory(window.column('engine_temp_c'), fleet.column('engine_temp_c'))} "
+          f"({t_slice * 1e6:.0f} us)")
+
+
+if __name__ == "__main__":
+    main()
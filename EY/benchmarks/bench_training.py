@@ -0,0 +1,86 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+# ensure project root is on path when running from benchmarks/ directory
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+import pandas as pd
+from train import generate_synthetic
+from voiceguard.model import FEATURES, load_model, predict_proba_batch, train_incremental, train_model
+
+
+def accuracy(model_path, test):
+    model = load_model(model_path, compiled=True)
+    pred = predict_proba_batch(model, test[FEATURES].to_numpy(dtype=float)) >= 0.5
+    return float((pred == test["label"].to_numpy(dtype=bool)).mean())
+
+
+def timed(fn, data, out, fresh=True, **kwargs):
+    # time untraced (tracemalloc taxes the incremental reader's per-line objects), then
+    # repeat the same run under tracemalloc for the peak; fresh=False keeps the checkpoint
+    def reset():
+        for path in (out, out + ".ckpt"):
+            if os.path.exists(path) and (fresh or path == out):
+                os.remove(path)
+
+    ckpt = out + ".ckpt"
+    saved = None
+    if not fresh and os.path.exists(ckpt):
+        with open(ckpt, "rb") as f:
+            saved = f.read()
+    reset()
+    t0 = time.perf_counter()
+    fn(data, out, **kwargs)
+    seconds = time.perf_counter() - t0
+    reset()
+    if saved is not None:
+        with open(ckpt, "wb") as f:
+            f.write(saved)
+    tracemalloc.start()
+    fn(data, out, **kwargs)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Batch LogisticRegression vs incremental SGD: time, memory, accuracy by dataset size")
+    ap.add_argument("--sizes", default="1000,10000,100000,1000000", help="comma-separated training rows, e.g. up to 10000000")
+    ap.add_argument("--batch-max", type=int, default=2000000, help="skip the batch fit above this many rows (it holds the whole CSV)")
+    ap.add_argument("--chunk", type=int, default=100000)
+    ap.add_argument("--test-rows", type=int, default=50000)
+    args = ap.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",")]
+    with tempfile.TemporaryDirectory() as tmp:
+        test_path = os.path.join(tmp, "test.csv")
+        generate_synthetic(test_path, args.test_rows, seed=7)
+        test = pd.read_csv(test_path)
+        print(f"independent test set: {args.test_rows} rows; incremental holds out every 5th row and trains on the rest")
+        print(f"  {'rows':>9} {'mode':<12}{'seconds':>9}{'rows/s':>10}{'peak MB':>9}{'test acc':>10}")
+        for n in sizes:
+            data = os.path.join(tmp, f"train_{n}.csv")
+            generate_synthetic(data, n)
+            modes = [("incremental", train_incremental, {"chunk_rows": args.chunk})]
+            if n <= args.batch_max:
+                modes.insert(0, ("batch", train_model, {}))
+            for mode, fn, kwargs in modes:
+                out = os.path.join(tmp, f"{mode}_{n}.pkl")
+                seconds, peak = timed(fn, data, out, **kwargs)
+                print(f"  {n:>9} {mode:<12}{seconds:9.2f}{n / seconds:10.0f}{peak / 1e6:9.1f}{accuracy(out, test):10.4f}")
+            # the point of the incremental mode: appending 1% more rows only costs that 1%
+            extra = os.path.join(tmp, "extra.csv")
+            generate_synthetic(extra, max(1, n // 100), seed=n)
+            with open(extra, encoding="utf-8") as src, open(data, "a", encoding="utf-8") as dst:
+                next(src)
+                dst.writelines(src)
+            seconds, peak = timed(train_incremental, data, os.path.join(tmp, f"incremental_{n}.pkl"), fresh=False, chunk_rows=args.chunk)
+            print(f"  {n:>9} {'+1% rerun':<12}{seconds:9.2f}{'':>10}{peak / 1e6:9.1f}{accuracy(os.path.join(tmp, f'incremental_{n}.pkl'), test):10.4f}")
+            os.remove(data)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import argparse
+import http.client
+import importlib.util
+import json
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+# ensure project root is on path when running from benchmarks/ directory
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+
+SAMPLE = {
+    "voice_text": "My car overheats and rattles at low speed",
+    "telemetry": json.loads((ROOT / "data" / "telemetry_sample.json").read_text(encoding="utf-8")),
+    "customer": {"id": "CUST-2002", "location": [12.9716, 77.5946]},
+}
+
+
+def start_local_server():
+    # web/ is not a package, so load server.py by path and serve on an ephemeral port
+    spec = importlib.util.spec_from_file_location("voiceguard_server", ROOT / "web" / "server.py")
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    server = mod.make_server("127.0.0.1", 0, quiet=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def _worker(host, port, path, body, deadline, latencies, errors):
+    # one keep-alive connection per simulated client
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    headers = {"Content-Type": "application/json"}
+    while time.perf_counter() < deadline:
+        t0 = time.perf_counter()
+        try:
+            conn.request("POST", path, body=body, headers=headers)
+            resp = conn.getresponse()
+            resp.read()
+            if resp.status != 200:
+                errors.append(resp.status)
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(repr(e))
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=30)
+            continue
+        latencies.append(time.perf_counter() - t0)
+    conn.close()
+
+
+def run_level(url, path, body, concurrency, duration):
+    u = urlparse(url)
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+    threads = [
+        threading.Thread(target=_worker, args=(u.hostname, u.port, path, body, deadline, latencies, errors))
+        for _ in range(concurrency)
+    ]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    latencies.sort()
+    pct = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000 if latencies else float("nan")
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": len(latencies) / elapsed,
+        "p50_ms": pct(0.50),
+        "p99_ms": pct(0.99),
+        "mean_ms": statistics.fmean(latencies) * 1000 if latencies else float("nan"),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Load test /api/predict or /api/predict_batch")
+    ap.add_argument("--url", help="server base URL; default starts an in-process server")
+    ap.add_argument("--concurrency", default="1,2,4,8,16,32")
+    ap.add_argument("--duration", type=float, default=3.0, help="seconds per concurrency level")
+    ap.add_argument("--batch", type=int, default=0, help="POST N vehicles per request to /api/predict_batch")
+    ap.add_argument("--json", action="store_true", help="print results as JSON")
+    args = ap.parse_args()
+    server = None
+    url = args.url
+    if not url:
+        server, url = start_local_server()
+    path, body = "/api/predict", json.dumps(SAMPLE)
+    if args.batch:
+        path, body = "/api/predict_batch", json.dumps([SAMPLE] * args.batch)
+    rows = [run_level(url, path, body.encode("utf-8"), int(c), args.duration) for c in args.concurrency.split(",")]
+    if server is not None:
+        server.shutdown()
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+    per = max(1, args.batch)
+    print(f"{url}{path}  ({per} vehicle(s)/request)")
+    print(f"{'conc':>5} {'reqs':>7} {'err':>4} {'req/s':>9} {'veh/s':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for r in rows:
+        print(f"{r['concurrency']:>5} {r['requests']:>7} {r['errors']:>4} {r['rps']:>9.1f} {r['rps'] * per:>9.0f} {r['p50_ms']:>8.2f} {r['p99_ms']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
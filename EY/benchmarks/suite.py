@@ -0,0 +1,416 @@
+import argparse
+import csv
+import gc
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+from pathlib import Path
+# ensure project root is on path when running from benchmarks/ directory
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+import numpy as np
+from train import generate_synthetic
+from voiceguard.agents import (
+    Telemetry,
+    VoiceCall,
+    VoiceCustomerAgent,
+    TelemetryAgent,
+    DiagnosisAgent,
+    SchedulingAgent,
+    UEBAAgent,
+    FeedbackAgent,
+    DataAnalysisAgent,
+)
+from voiceguard.model import load_model, predict_proba, predict_proba_batch
+from voiceguard.pipeline import build_pipeline, _telemetry_columns
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+SCHEMA = 1
+FILLER = [
+    "Hi, I'm calling about my car.",
+    "It started last week.",
+    "I drive mostly in the city.",
+    "Not sure if it is related to the last service.",
+    "Someone at home noticed it first.",
+    "Could someone take a look?",
+]
+
+
+def synthetic_transcripts(n: int, seed: int = 11):
+    # 0-3 symptom phrases from the agent's own vocabulary, mixed with filler; some urgent, some booking intent
+    rng = random.Random(seed)
+    phrases = [kw for kws in VoiceCustomerAgent.KEYWORDS.values() for kw in kws]
+    out = []
+    for _ in range(n):
+        parts = [rng.choice(FILLER)]
+        parts += [f"There is a {rng.choice(phrases)} problem." for _ in range(rng.randint(0, 3))]
+        if rng.random() < 0.2:
+            parts.append(f"It's {rng.choice(VoiceCustomerAgent.URGENT_TERMS)}.")
+        if rng.random() < 0.3:
+            parts.append(f"Please {rng.choice(VoiceCustomerAgent.INTENT_TERMS)}.")
+        rng.shuffle(parts)
+        out.append(" ".join(parts))
+    return out
+
+
+def make_fleet(n: int, workdir: str, seed: int = 11):
+    # telemetry from train.generate_synthetic (the training distribution) + transcripts + locations across India
+    path = os.path.join(workdir, f"fleet_{n}.csv")
+    generate_synthetic(path, n)
+    rng = random.Random(seed)
+    telemetry, customers = [], []
+    with open(path, newline="", encoding="utf-8") as f:
+        for i, r in enumerate(csv.DictReader(f)):
+            loc = [rng.uniform(8.0, 30.0), rng.uniform(70.0, 88.0)]
+            telemetry.append({
+                "engine_temp_c": float(r["engine_temp_c"]),
+                "battery_voltage": float(r["battery_voltage"]),
+                "oil_pressure_psi": float(r["oil_pressure_psi"]),
+                "vibration_g": float(r["vibration_g"]),
+                "speed_kph": float(r["speed_kph"]),
+                "odometer_km": float(r["odometer_km"]),
+                "error_codes": [f"P0{300 + k}" for k in range(int(r["error_code_count"]))],
+                "location": loc,
+            })
+            customers.append({"id": f"CUST-{i:07d}", "location": loc})
+    os.remove(path)
+    return synthetic_transcripts(n, seed), telemetry, customers
+
+
+def _per_call(fn, calls):
+    # calls: list of argument tuples; returns per-call latencies in seconds
+    lat = [0.0] * len(calls)
+    pc = time.perf_counter
+    for i, args in enumerate(calls):
+        t0 = pc()
+        fn(*args)
+        lat[i] = pc() - t0
+    return lat
+
+
+def _calibrate_work():
+    # interpreter-bound mix (dict/float/str churn, like the agents) plus a small numpy op
+    rows = [{"t": i * 0.5, "v": 12.0 + (i % 7) * 0.1, "id": f"C{i}"} for i in range(2000)]
+    total = sum(r["t"] * r["v"] for r in rows if r["id"])
+    return total + float(np.arange(2000.0).sum())
+
+
+def calibrate() -> float:
+    # microseconds for a fixed workload, measured right before each case. compare() scales
+    # by the run's median so a slower or faster host (CPU steal, frequency scaling, a
+    # different box) is not reported as a regression of every case.
+    return min(timeit.repeat(_calibrate_work, number=5, repeat=5)) / 5 * 1e6
+
+
+def _peak_kb(fn) -> float:
+    # tracemalloc peak of one untimed execution (Python-level allocations, numpy buffers included)
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def measure(name: str, n: int, fn, calls=None, rows=None, repeat: int = 3, min_time: float = 0.2, max_time: float = 30.0, memory: bool = True) -> dict:
+    # per-call case: fn(*args) for each args in calls; batch case: fn() processes `rows` rows.
+    # Passes repeat until both `repeat` passes and `min_time` seconds are done (capped by
+    # max_time); throughput comes from the fastest pass, percentiles from all of them.
+    calib_us = calibrate()
+    best, lat_all, passes, elapsed = None, [], 0, 0.0
+    # like timeit: collect once, then keep the cyclic GC from firing at random points in the timed passes
+    gc.collect()
+    gc.disable()
+    try:
+        while passes < 1 or ((passes < repeat or elapsed < min_time) and elapsed < max_time):
+            if calls is not None:
+                lat = _per_call(fn, calls)
+                seconds = sum(lat)
+                lat_all += lat
+            else:
+                t0 = time.perf_counter()
+                fn()
+                seconds = time.perf_counter() - t0
+            best = seconds if best is None else min(best, seconds)
+            passes += 1
+            elapsed += seconds
+    finally:
+        gc.enable()
+    rows = len(calls) if calls is not None else rows
+    rec = {
+        "name": name,
+        "n": n,
+        "rows": rows,
+        "passes": passes,
+        "seconds": best,
+        "rows_per_s": rows / best if best > 0 else float("inf"),
+        "calibration_us": calib_us,
+    }
+    if lat_all:
+        lat_all.sort()
+        rec.update(
+            mean_us=elapsed / len(lat_all) * 1e6,
+            p50_us=lat_all[len(lat_all) // 2] * 1e6,
+            p99_us=lat_all[min(len(lat_all) - 1, int(len(lat_all) * 0.99))] * 1e6,
+        )
+    if memory:
+        rec["peak_kb"] = _peak_kb((lambda: _per_call(fn, calls)) if calls is not None else fn)
+    return rec
+
+
+def bench_size(n: int, model_obj, args, workdir: str, sk_model=None) -> list:
+    # sk_model: the training pickle loaded with compiled=False, for the unfolded sklearn case
+    texts, telemetry, customers = make_fleet(n, workdir)
+    m = min(n, args.max_loop)  # per-call cases use the first m vehicles
+    now = time.time()
+    voice_agent, telem_agent, diag_agent = VoiceCustomerAgent(), TelemetryAgent(), DiagnosisAgent(model_obj)
+    sched_agent, ueba_agent, fb_agent, data_agent = SchedulingAgent(), UEBAAgent(), FeedbackAgent(), DataAnalysisAgent()
+
+    # upstream outputs for the first m vehicles, computed once so every agent is timed on real inputs
+    calls = [VoiceCall(c["id"], t, now, tuple(c["location"])) for t, c in zip(texts[:m], customers[:m])]
+    telem = [
+        Telemetry(**{k: v for k, v in t.items() if k not in ("error_codes", "location")},
+                  error_codes=t["error_codes"], location=tuple(t["location"]))
+        for t in telemetry[:m]
+    ]
+    summaries = [voice_agent.process(c) for c in calls]
+    feats = [telem_agent.process(t) for t in telem]
+    raws = [telem_agent.raw_features(t) for t in telem]
+    diags = [diag_agent.process(v, f, r) for v, f, r in zip(summaries, feats, raws)]
+    scheds = [sched_agent.schedule(c.location, d) for c, d in zip(calls, diags)]
+
+    cols = _telemetry_columns(telemetry)
+    raw_matrix = TelemetryAgent.raw_matrix(cols)
+    lats = np.array([c["location"][0] for c in customers])
+    lons = np.array([c["location"][1] for c in customers])
+    all_summaries = [voice_agent.process(VoiceCall(c["id"], t, now, (0.0, 0.0))) for t, c in zip(texts, customers)]
+    symptoms = [v.symptoms for v in all_summaries]
+    severity = np.array([v.severity for v in all_summaries], dtype=float)
+    intents = np.array([v.intent for v in all_summaries])
+    batch_feats = telem_agent.process_batch(cols)
+    risk, categories = diag_agent.process_batch(symptoms, severity, batch_feats, raw_matrix if model_obj is not None else None)
+    priorities = sched_agent.schedule_batch(lats, lons, risk, categories)["priority"]
+
+    pipeline = build_pipeline(model_obj=model_obj)
+    opts = {"repeat": args.repeat, "min_time": args.min_time, "memory": not args.no_memory}
+
+    def run_batch_chunked():
+        # bounded memory at 1M vehicles: results of each chunk are dropped before the next
+        for lo in range(0, n, args.chunk):
+            pipeline.run_batch(texts[lo:lo + args.chunk], telemetry[lo:lo + args.chunk], customers[lo:lo + args.chunk])
+
+    cases = [
+        ("agent.voice", dict(fn=voice_agent.process, calls=[(c,) for c in calls])),
+        ("agent.telemetry", dict(fn=telem_agent.process, calls=[(t,) for t in telem])),
+        ("agent.diagnosis", dict(fn=diag_agent.process, calls=list(zip(summaries, feats, raws)))),
+        ("agent.scheduling", dict(fn=sched_agent.schedule, calls=[(c.location, d) for c, d in zip(calls, diags)])),
+        ("agent.ueba", dict(fn=ueba_agent.monitor, calls=list(zip(summaries, diags)))),
+        ("agent.feedback", dict(fn=fb_agent.generate, calls=list(zip(diags, scheds)))),
+        ("agent.analytics", dict(fn=data_agent.aggregate, calls=list(zip(summaries, diags, scheds)))),
+        ("agent.telemetry_batch", dict(fn=lambda: telem_agent.process_batch(cols), rows=n)),
+        ("agent.diagnosis_batch", dict(fn=lambda: diag_agent.process_batch(symptoms, severity, batch_feats, raw_matrix if model_obj is not None else None), rows=n)),
+        ("agent.scheduling_batch", dict(fn=lambda: sched_agent.schedule_batch(lats, lons, risk, categories), rows=n)),
+        ("agent.ueba_batch", dict(fn=lambda: ueba_agent.monitor_batch(intents, severity, risk), rows=n)),
+        ("agent.feedback_batch", dict(fn=lambda: fb_agent.generate_batch(categories, priorities), rows=n)),
+        ("pipeline.run", dict(fn=pipeline.run, calls=list(zip(texts[:m], telemetry[:m], customers[:m])))),
+        ("pipeline.run_batch", dict(fn=run_batch_chunked, rows=n)),
+    ]
+    if model_obj is not None:
+        cases += [
+            ("model.predict_proba", dict(fn=predict_proba, calls=[(model_obj, row) for row in raws])),
+            ("model.predict_proba_batch", dict(fn=lambda: predict_proba_batch(model_obj, raw_matrix), rows=n)),
+        ]
+    if sk_model is not None:
+        cases.insert(len(cases) - 1, ("model.predict_proba_sklearn", dict(fn=predict_proba, calls=[(sk_model, row) for row in raws])))
+    results = []
+    for name, kw in cases:
+        if args.only and not any(name.startswith(p) for p in args.only.split(",")):
+            continue
+        results.append(measure(name, n, **opts, **kw))
+    if args.http and (not args.only or "http" in args.only):
+        results += bench_http(n, texts, telemetry, customers, args)
+    return results
+
+
+def bench_http(n: int, texts, telemetry, customers, args) -> list:
+    # in-process ThreadingHTTPServer over keep-alive connections (see load_test.py)
+    from load_test import run_level, start_local_server
+
+    server, url = start_local_server()
+    out = []
+    try:
+        payloads = [{"voice_text": t, "telemetry": tel, "customer": c} for t, tel, c in zip(texts, telemetry, customers)]
+        levels = [("http.predict", "/api/predict", json.dumps(payloads[0]).encode("utf-8"), 1)]
+        if n > 1 and n <= args.http_max_batch:
+            levels.append(("http.predict_batch", "/api/predict_batch", json.dumps(payloads).encode("utf-8"), n))
+        for name, path, body, per_request in levels:
+            for conc in (int(c) for c in args.http_concurrency.split(",")):
+                row = run_level(url, path, body, conc, args.http_duration)
+                out.append({
+                    "name": f"{name}@c{conc}",
+                    "n": n,
+                    "rows": row["requests"] * per_request,
+                    "seconds": args.http_duration,
+                    "rows_per_s": row["rps"] * per_request,
+                    "requests_per_s": row["rps"],
+                    "errors": row["errors"],
+                    "p50_us": row["p50_ms"] * 1000,
+                    "p99_us": row["p99_ms"] * 1000,
+                    "mean_us": row["mean_ms"] * 1000,
+                })
+    finally:
+        server.shutdown()
+        server.server_close()
+    return out
+
+
+def _meta(args, model_path) -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ""
+    meta = {
+        "schema": SCHEMA,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "commit": commit or None,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "model": os.path.relpath(model_path, ROOT) if model_path else None,
+        "sizes": args.sizes,
+        "max_loop": args.max_loop,
+        "repeat": args.repeat,
+        "min_time": args.min_time,
+    }
+    return meta
+
+
+def machine_speed(report: dict) -> float:
+    # median calibration over the run's cases: robust to a few cases landing in a slow spell
+    cal = sorted(r["calibration_us"] for r in report["results"] if r.get("calibration_us"))
+    return cal[len(cal) // 2] if cal else 0.0
+
+
+def compare(baseline: dict, current: dict, threshold: float, normalize: bool = True):
+    # Returns (rows, failures, speed). A case regresses when its throughput drops by more than
+    # `threshold` (0.2 = 20% slower) against the baseline entry with the same name and n.
+    # With normalize, baseline throughput is first scaled by how much faster or slower this
+    # run's calibration workload was (speed > 1: this run's machine is faster).
+    speed = 1.0
+    if normalize and machine_speed(baseline) and machine_speed(current):
+        speed = machine_speed(baseline) / machine_speed(current)
+    base = {(r["name"], r["n"]): r for r in baseline["results"]}
+    rows, failures = [], []
+    for r in current["results"]:
+        b = base.get((r["name"], r["n"]))
+        if b is None or not b["rows_per_s"] or not r["rows_per_s"]:
+            continue
+        slowdown = b["rows_per_s"] * speed / r["rows_per_s"] - 1
+        mem = (r["peak_kb"] / b["peak_kb"] - 1) if b.get("peak_kb") and r.get("peak_kb") is not None else None
+        row = {
+            "name": r["name"],
+            "n": r["n"],
+            "baseline_rows_per_s": b["rows_per_s"],
+            "rows_per_s": r["rows_per_s"],
+            "slowdown": slowdown,
+            "memory_growth": mem,
+        }
+        rows.append(row)
+        if slowdown > threshold:
+            failures.append(row)
+    return rows, failures, speed
+
+
+def _print_results(results: list) -> None:
+    print(f"{'case':<32} {'n':>8} {'rows':>8} {'rows/s':>12} {'p50 us':>9} {'p99 us':>9} {'peak KB':>9}")
+    for r in results:
+        p50 = f"{r['p50_us']:.1f}" if "p50_us" in r else "-"
+        p99 = f"{r['p99_us']:.1f}" if "p99_us" in r else "-"
+        peak = f"{r['peak_kb']:.0f}" if "peak_kb" in r else "-"
+        print(f"{r['name']:<32} {r['n']:>8} {r['rows']:>8} {r['rows_per_s']:>12.0f} {p50:>9} {p99:>9} {peak:>9}")
+
+
+def _print_compare(rows: list, threshold: float) -> None:
+    print(f"{'case':<32} {'n':>8} {'baseline/s':>12} {'now/s':>12} {'slowdown':>9} {'mem':>7}")
+    for r in rows:
+        flag = "  REGRESSION" if r["slowdown"] > threshold else ""
+        mem = f"{r['memory_growth']:+.0%}" if r["memory_growth"] is not None else "-"
+        print(f"{r['name']:<32} {r['n']:>8} {r['baseline_rows_per_s']:>12.0f} {r['rows_per_s']:>12.0f} {r['slowdown']:>+9.1%} {mem:>7}{flag}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="VoiceGuard benchmark suite: every agent, the model, the pipeline and the HTTP server")
+    ap.add_argument("--sizes", default="1,100,10000,100000", help="fleet sizes, e.g. 1,100,10000,1000000")
+    ap.add_argument("--max-loop", type=int, default=20000, help="vehicles timed call by call in per-call cases")
+    ap.add_argument("--chunk", type=int, default=10000, help="run_batch chunk size")
+    ap.add_argument("--repeat", type=int, default=3, help="at least N timed passes per case (fastest one counts)")
+    ap.add_argument("--min-time", type=float, default=0.2, help="keep repeating a case until this many seconds were timed")
+    ap.add_argument("--only", help="comma-separated case-name prefixes (e.g. agent.,pipeline.)")
+    ap.add_argument("--model", default=str(ROOT / "models" / "lg.pkl"))
+    ap.add_argument("--no-model", action="store_true", help="heuristic diagnosis, no model cases")
+    ap.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak pass")
+    ap.add_argument("--http", action="store_true", help="also load-test the HTTP server")
+    ap.add_argument("--http-concurrency", default="1,8")
+    ap.add_argument("--http-duration", type=float, default=2.0)
+    ap.add_argument("--http-max-batch", type=int, default=1000, help="largest fleet POSTed to /api/predict_batch in one request")
+    ap.add_argument("--out", help="write results JSON here")
+    ap.add_argument("--json", action="store_true", help="print results JSON instead of a table")
+    ap.add_argument("--compare", metavar="BASELINE", help="compare against a stored results JSON; exit 1 on regression")
+    ap.add_argument("--current", metavar="RESULTS", help="with --compare: use these stored results instead of running")
+    ap.add_argument("--threshold", type=float, default=0.2, help="allowed throughput drop per case (0.2 = 20%%)")
+    ap.add_argument("--no-normalize", action="store_true", help="compare raw throughput, without the calibration scaling")
+    args = ap.parse_args()
+
+    if args.current:
+        with open(args.current, "r", encoding="utf-8") as f:
+            report = json.load(f)
+    else:
+        model_path = None if args.no_model or not os.path.exists(args.model) else args.model
+        model_obj = load_model(model_path, compiled=True) if model_path else None
+        # compiled=True picks up the sibling .vgm, which carries no sklearn objects; the
+        # sklearn comparison needs the pickle itself
+        sk_path = os.path.splitext(model_path)[0] + ".pkl" if model_path else None
+        sk_model = load_model(sk_path) if sk_path and os.path.exists(sk_path) else None
+        report = {"meta": _meta(args, model_path), "results": []}
+        with tempfile.TemporaryDirectory() as workdir:
+            for n in (int(s) for s in args.sizes.split(",")):
+                report["results"] += bench_size(n, model_obj, args, workdir, sk_model)
+        if resource is not None:
+            # ru_maxrss is KB on Linux, bytes on macOS
+            rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            report["meta"]["max_rss_kb"] = rss / 1024 if sys.platform == "darwin" else rss
+        if args.out:
+            with open(args.out, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+        if args.json:
+            print(json.dumps(report, indent=2))
+        else:
+            _print_results(report["results"])
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows, failures, speed = compare(baseline, report, args.threshold, normalize=not args.no_normalize)
+        print(f"machine speed vs baseline: {speed:.2f}x (calibration workload{'' if not args.no_normalize else ', not applied'})")
+        _print_compare(rows, args.threshold)
+        if failures:
+            print(f"FAIL: {len(failures)} case(s) slower than baseline by more than {args.threshold:.0%}")
+            sys.exit(1)
+        print(f"OK: {len(rows)} case(s) within {args.threshold:.0%} of baseline")
+
+
+if __name__ == "__main__":
+    main()
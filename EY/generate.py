@@ -0,0 +1,19 @@
+import argparse
+import sys
+from voiceguard.synthetic import FORMATS, write_synthetic
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Write a large synthetic fleet (vectorized, seeded, constant memory)")
+    ap.add_argument("output", help=".csv, .ndjson or .npy")
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--format", choices=FORMATS, default=None, help="default: from the file extension")
+    ap.add_argument("--voice", action="store_true", help="add matching voice transcripts (csv/ndjson)")
+    args = ap.parse_args()
+    stats = write_synthetic(args.output, args.rows, args.seed, args.format, args.voice)
+    print(f"rows={stats['rows']} format={stats['format']} seconds={stats['seconds']:.1f} rows_per_s={stats['rows_per_s']:.0f}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import argparse
+import json
+import os
+import sys
+from voiceguard.fleet import CHUNK_ROWS, score_file
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Score a fleet dump (CSV or NDJSON) across a process pool")
+    ap.add_argument("input", help="CSV with telemetry columns, or NDJSON with one run() payload per line")
+    ap.add_argument("--out", default="-", help="NDJSON results in input order, or - for stdout")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes (0 scores in this process)")
+    ap.add_argument("--chunk", type=int, default=CHUNK_ROWS, help="rows per task")
+    ap.add_argument("--max-pending", type=int, default=None, help="chunks in flight (default 2 per worker)")
+    ap.add_argument("--format", choices=["csv", "ndjson"], default=None, help="default: from the file extension")
+    ap.add_argument("--model", default="models/lg.vgm")
+    ap.add_argument("--centers", default=None, help="service center catalog (JSON/CSV)")
+    ap.add_argument("--strict", action="store_true", help="fail on the first malformed record instead of skipping it")
+    ap.add_argument("--scaling", default=None, help="comma-separated worker counts, e.g. 1,2,4; results are discarded")
+    args = ap.parse_args()
+    kwargs = dict(chunk_rows=args.chunk, max_pending=args.max_pending, model_path=args.model, centers=args.centers, fmt=args.format, strict=args.strict)
+
+    if args.scaling:
+        counts = [int(w) for w in args.scaling.split(",") if w.strip()]
+        base = None
+        for w in counts:
+            with open(os.devnull, "w", encoding="utf-8") as out:
+                stats = score_file(args.input, out, workers=w, **kwargs)
+            # efficiency: throughput per worker relative to the first count in the list
+            base = base or stats["rows_per_s"] / max(w, 1)
+            stats["speedup"] = stats["rows_per_s"] / (base * max(counts[0], 1))
+            stats["efficiency"] = stats["rows_per_s"] / (base * max(w, 1))
+            print(json.dumps(stats))
+        return
+
+    out = sys.stdout if args.out == "-" else open(args.out, "w", encoding="utf-8")
+    try:
+        stats = score_file(args.input, out, workers=args.workers, **kwargs)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(" ".join(f"{k}={round(v, 1) if isinstance(v, float) else v}" for k, v in stats.items()), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 import json
 from pathlib import Path
 from voiceguard.pipeline import build_pipeline
-from voiceguard.model import load_model
+from voiceguard.inference import load_model
 
 
 def main():
@@ -24,7 +24,7 @@ def main():
         "I think the oil pressure light came on once. It's urgent."
     )
     customer = {"id": "CUST-1001", "location": (12.99, 77.59)}
-    model_obj = load_model("models/lg.pkl") if Path("models/lg.pkl").exists() else None
+    model_obj = load_model("models/lg.vgm", compiled=True) if Path("models/lg.vgm").exists() else None
     pipeline = build_pipeline(model_obj=model_obj)
     result = pipeline.run(voice_text, telemetry, customer)
     print(json.dumps(result, indent=2))
@@ -0,0 +1,33 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+from voiceguard.inference import load_model
+from voiceguard.pipeline import build_pipeline
+from voiceguard.stream import StreamProcessor, read_ndjson
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Score newline-delimited telemetry JSON as it streams in")
+    ap.add_argument("input", nargs="?", default="-", help="NDJSON file, or - for stdin")
+    ap.add_argument("--window", type=int, default=32, help="samples kept per vehicle")
+    ap.add_argument("--alpha", type=float, default=0.2, help="EWMA smoothing factor")
+    ap.add_argument("--threshold", type=float, default=0.02, help="normalized drift that triggers a rescore")
+    ap.add_argument("--max-vehicles", type=int, default=None, help="evict the longest-idle vehicle beyond this many")
+    args = ap.parse_args()
+    model_obj = load_model("models/lg.vgm", compiled=True) if Path("models/lg.vgm").exists() else None
+    processor = StreamProcessor(build_pipeline(model_obj=model_obj), args.window, args.alpha, args.threshold, args.max_vehicles)
+    fp = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+    try:
+        for result in processor.process(read_ndjson(fp)):
+            sys.stdout.write(json.dumps(result) + "\n")
+            sys.stdout.flush()
+    finally:
+        if fp is not sys.stdin:
+            fp.close()
+    print(f"received={processor.received} rescored={processor.rescored} skipped={processor.skipped} vehicles={len(processor.vehicles)} "
+          f"window_bytes={processor.memory_bytes()}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+# ensure project root is on path when running from tests/ directory
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
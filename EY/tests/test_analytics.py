@@ -0,0 +1,127 @@
+import numpy as np
+import pytest
+from voiceguard.analytics import GROUP_FIELDS, AnalyticsStore
+
+HOUR = 3600.0
+
+
+def test_idle_store_expires_old_events_against_the_clock():
+    now = [100 * 24 * HOUR]
+    store = AnalyticsStore(clock=lambda: now[0])
+    store.add("BLR-01", "Cooling/Overheat", "urgent", 0.9)
+    assert store.summary(HOUR)["count"] == 1
+    # nothing ingested for three days: both windows must be empty
+    now[0] += 3 * 24 * HOUR
+    assert store.summary(HOUR) == {"count": 0}
+    assert store.summary() == {"count": 0}
+    assert store.query(by=("center_id",)) == []
+
+
+def test_window_ends_at_now_not_at_last_event():
+    now = [100 * 24 * HOUR]
+    store = AnalyticsStore(clock=lambda: now[0])
+    store.add("BLR-01", "Cooling/Overheat", "urgent", 0.8)
+    now[0] += 2 * HOUR
+    store.add("DEL-02", "Electrical/Battery", "normal", 0.2)
+    now[0] += 30 * 60
+    assert store.summary(HOUR)["count"] == 1
+    assert store.summary(6 * HOUR)["count"] == 2
+    now[0] += 2 * HOUR
+    assert store.summary(HOUR) == {"count": 0}
+    assert store.summary()["count"] == 2
+
+
+def random_events(n, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.choice(["BLR-01", "DEL-02", "MUM-03"], n).tolist()
+    cats = rng.choice(["Cooling/Overheat", "Electrical/Battery", "General"], n).tolist()
+    prios = rng.choice(["urgent", "normal"], n).tolist()
+    return centers, cats, prios, rng.beta(2, 5, n)
+
+
+def test_add_many_matches_add():
+    start = 100 * 24 * HOUR
+    one, many = AnalyticsStore(clock=lambda: start), AnalyticsStore(clock=lambda: start)
+    for hour in range(5):
+        centers, cats, prios, risk = random_events(400, seed=hour)
+        ts = start + hour * HOUR
+        for row in zip(centers, cats, prios, risk.tolist()):
+            one.add(*row, ts=ts)
+        many.add_many(centers, cats, prios, risk, ts=ts)
+    now = start + 5 * HOUR
+    assert one.stats() == many.stats()
+    for window in (None, 2 * HOUR):
+        for by in (("center_id",), ("issue_category", "priority"), ()):
+            a, b = one.query(window, by=by, now=now), many.query(window, by=by, now=now)
+            assert [r["count"] for r in a] == [r["count"] for r in b]
+            for ra, rb in zip(a, b):
+                assert ra == pytest.approx(rb, abs=1e-4)
+
+
+def test_non_finite_risk_is_dropped():
+    now = 100 * 24 * HOUR
+    store = AnalyticsStore(clock=lambda: now)
+    store.add("BLR-01", "General", "normal", float("nan"))
+    store.add("BLR-01", "General", "normal", float("inf"))
+    store.add("BLR-01", "General", "normal", 0.5)
+    store.add_many(["BLR-01"] * 3, ["General"] * 3, ["normal"] * 3, [0.25, float("nan"), -float("inf")])
+    store.add_many(["DEL-02"], ["General"], ["normal"], [float("nan")])
+    assert store.events == 2 and store.dropped == 5
+    assert store.keys == [("BLR-01", "General", "normal")]
+    assert store.summary() == pytest.approx({"count": 2, "mean_risk": 0.375, "p50": 0.26, "p90": 0.5, "p99": 0.5}, abs=0.02)
+
+
+def test_snapshot_round_trip(tmp_path):
+    now = [100 * 24 * HOUR]
+    store = AnalyticsStore(bucket_s=600, slots=12, bins=20, clock=lambda: now[0])
+    for hour in range(3):
+        store.add_many(*random_events(300, seed=hour), ts=now[0] + hour * HOUR)
+    store.add("OLD-00", "General", "normal", 0.1, ts=now[0] - 30 * 24 * HOUR)  # too old: dropped
+    now[0] += 3 * HOUR
+    path = str(tmp_path / "analytics.npz")
+    store.snapshot(path)
+    loaded = AnalyticsStore.load(path, clock=lambda: now[0])
+    # memory_bytes may differ: load() sizes the arrays to the keys, not to the grown capacity
+    assert {**loaded.stats(), "memory_bytes": 0} == {**store.stats(), "memory_bytes": 0}
+    assert loaded.keys == store.keys
+    assert store.dropped == 1
+    for window in (None, HOUR):
+        assert loaded.query(window, by=GROUP_FIELDS) == store.query(window, by=GROUP_FIELDS)
+    # the loaded store keeps ingesting and expiring like the original
+    for s in (store, loaded):
+        s.add("BLR-01", "General", "urgent", 0.7)
+    now[0] += HOUR
+    assert loaded.query(by=("center_id",)) == store.query(by=("center_id",))
+
+
+def test_filters_and_grouping():
+    now = 100 * 24 * HOUR
+    store = AnalyticsStore(clock=lambda: now)
+    centers, cats, prios, risk = random_events(3000, seed=1)
+    store.add_many(centers, cats, prios, risk)
+    rows = store.query(by=("priority",), center_id="BLR-01")
+    assert {r["priority"] for r in rows} == {"urgent", "normal"}
+    for row in rows:
+        mask = [(c == "BLR-01" and p == row["priority"]) for c, p in zip(centers, prios)]
+        assert row["count"] == sum(mask)
+        assert row["mean_risk"] == pytest.approx(risk[mask].mean(), abs=1e-4)
+    rows = store.query(by=("center_id", "issue_category"))
+    assert len(rows) == 9 and sum(r["count"] for r in rows) == 3000
+    assert [r["count"] for r in rows] == sorted((r["count"] for r in rows), reverse=True)
+    assert all(set(r) == {"center_id", "issue_category", "count", "mean_risk", "p50", "p90", "p99"} for r in rows)
+    only = store.query(by=(), center_id="MUM-03", issue_category="General", priority="urgent")
+    assert only[0]["count"] == sum(1 for c, g, p in zip(centers, cats, prios) if (c, g, p) == ("MUM-03", "General", "urgent"))
+    assert store.query(center_id="NOPE-00") == []
+
+
+@pytest.mark.parametrize("bins", [10, 50, 200])
+def test_quantiles_within_a_bin(bins):
+    now = 100 * 24 * HOUR
+    store = AnalyticsStore(bins=bins, clock=lambda: now)
+    risk = np.random.default_rng(bins).beta(2, 5, 20000)
+    store.add_many(["BLR-01"] * len(risk), ["General"] * len(risk), ["normal"] * len(risk), risk)
+    qs = (0.1, 0.5, 0.9, 0.99)
+    row = store.query(by=(), quantiles=qs)[0]
+    for q in qs:
+        assert abs(row[f"p{q * 100:g}"] - np.quantile(risk, q)) <= 1.0 / bins, q
+    assert row["mean_risk"] == pytest.approx(risk.mean(), abs=1e-4)
@@ -0,0 +1,142 @@
+import json
+import mmap
+import os
+import pickle
+
+import numpy as np
+import pytest
+from train import generate_synthetic
+from voiceguard.artifact import ALIGN, MAGIC, read_artifact, read_header, write_artifact
+from voiceguard.inference import FEATURES, CompiledScorer, artifact_path, load_model, predict_proba, predict_proba_batch, save_model
+from voiceguard.training import train_model
+
+
+@pytest.fixture(scope="module")
+def trained(tmp_path_factory):
+    # a small sklearn model and the .vgm train_model writes next to it
+    tmp = tmp_path_factory.mktemp("artifact")
+    data, pkl = str(tmp / "train.csv"), str(tmp / "lg.pkl")
+    generate_synthetic(data, 3000)
+    train_model(data, pkl)
+    return pkl, artifact_path(pkl)
+
+
+def inputs(n=5000, seed=3):
+    return np.random.default_rng(seed).normal(size=(n, len(FEATURES))) * [8, 0.5, 6, 0.25, 20, 30000, 1] + [92, 12.4, 35, 0.5, 45, 60000, 1]
+
+
+def test_round_trip_matches_pickle(trained):
+    pkl, vgm = trained
+    X = inputs()
+    sk, art = load_model(pkl), load_model(vgm)
+    np.testing.assert_allclose(predict_proba_batch(art, X), predict_proba_batch(sk, X), rtol=0, atol=1e-9)
+    row = dict(zip(FEATURES, X[0].tolist()))
+    assert abs(predict_proba(art, row) - predict_proba(sk, row)) < 1e-9
+    # the raw sklearn arrays travel too
+    np.testing.assert_array_equal(art["arrays"]["mean"], sk["scaler"].mean_)
+    np.testing.assert_array_equal(art["arrays"]["coef"], sk["model"].coef_.reshape(-1))
+    assert art["features"] == FEATURES and art["version"]
+
+
+def test_save_and_reload_scorer(tmp_path):
+    scorer = CompiledScorer(np.linspace(-1, 1, len(FEATURES)), 0.25, FEATURES)
+    path = str(tmp_path / "v7.vgm")
+    header = save_model({"scorer": scorer}, path, {"version": "v7", "rows": 10})
+    model = load_model(path)
+    assert model["version"] == "v7" and model["metadata"] == {"version": "v7", "rows": 10}
+    np.testing.assert_array_equal(model["scorer"].weights, scorer.weights)
+    assert model["scorer"].bias == scorer.bias
+    # every array starts on an ALIGN boundary of the payload
+    assert all(spec["offset"] % ALIGN == 0 for spec in header["arrays"].values())
+    assert read_header(path)[1] % ALIGN == 0
+    assert not os.path.exists(path + ".tmp")
+
+
+def buffer_owner(arr):
+    # follow views (and np.frombuffer's memoryview) down to the object owning the bytes
+    base = arr
+    while isinstance(base, np.ndarray):
+        base = base.base
+    return base.obj if isinstance(base, memoryview) else base
+
+
+def test_loaded_arrays_are_read_only_views_of_the_mmap(trained):
+    model = load_model(trained[1])
+    owners = set()
+    for name, arr in model["arrays"].items():
+        assert not arr.flags.writeable, name
+        with pytest.raises(ValueError):
+            arr[...] = 0
+        owner = buffer_owner(arr)
+        assert isinstance(owner, mmap.mmap), f"{name} is a copy"
+        owners.add(id(owner))
+    # every array views the same single mapping of the file
+    assert len(owners) == 1
+
+
+def test_compiled_pickle_load_prefers_fresh_artifact(trained):
+    pkl, vgm = trained
+    os.utime(vgm, (os.path.getmtime(pkl) + 1,) * 2)
+    assert "arrays" in load_model(pkl, compiled=True)
+    os.utime(vgm, (os.path.getmtime(pkl) - 10,) * 2)
+    stale = load_model(pkl, compiled=True)
+    assert "model" in stale and "scorer" in stale
+
+
+def corrupt_payload(vgm, out):
+    raw = bytearray(open(vgm, "rb").read())
+    raw[-64] ^= 1
+    open(out, "wb").write(bytes(raw))
+
+
+def rewrite_header(vgm, out, **changes):
+    raw = open(vgm, "rb").read()
+    length = int.from_bytes(raw[8:12], "little")
+    header = json.loads(raw[12:12 + length])
+    header.update(changes)
+    text = json.dumps(header).encode().ljust(length)
+    assert len(text) == length
+    open(out, "wb").write(raw[:12] + text + raw[12 + length:])
+
+
+@pytest.mark.parametrize("case, match", [
+    ("feature mismatch", "features"),
+    ("corrupt payload", "checksum"),
+    ("pickle renamed .vgm", "not a .vgm"),
+    ("empty file", "not a .vgm"),
+    ("truncated", "truncated|outside"),
+    ("schema version", "schema version"),
+    ("model kind", "model kind"),
+])
+def test_bad_artifacts_are_rejected(trained, tmp_path, case, match):
+    pkl, vgm = trained
+    bad = str(tmp_path / "bad.vgm")
+    if case == "feature mismatch":
+        write_artifact(bad, {"weights": np.zeros(3), "bias": np.zeros(1)}, {"kind": "logistic", "features": FEATURES[:3]})
+    elif case == "corrupt payload":
+        corrupt_payload(vgm, bad)
+    elif case == "pickle renamed .vgm":
+        with open(bad, "wb") as f:
+            pickle.dump(load_model(pkl), f)
+    elif case == "empty file":
+        open(bad, "wb").close()
+    elif case == "truncated":
+        open(bad, "wb").write(open(vgm, "rb").read()[:-ALIGN])
+    elif case == "schema version":
+        rewrite_header(vgm, bad, schema_version=99)
+    elif case == "model kind":
+        rewrite_header(vgm, bad, kind="tree")
+    with pytest.raises(ValueError, match=match):
+        load_model(bad)
+
+
+def test_write_refuses_object_arrays(tmp_path):
+    with pytest.raises(ValueError, match="dtype"):
+        write_artifact(str(tmp_path / "x.vgm"), {"weights": np.array(["a"], dtype=object)}, {})
+
+
+def test_verify_false_skips_checksum(trained, tmp_path):
+    bad = str(tmp_path / "corrupt.vgm")
+    corrupt_payload(trained[1], bad)
+    header, arrays = read_artifact(bad, verify=False)
+    assert open(bad, "rb").read(8) == MAGIC and set(arrays) == set(header["arrays"])
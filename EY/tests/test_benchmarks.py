@@ -0,0 +1,19 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_suite_runs_every_case():
+    # smoke run of the benchmark suite on a tiny fleet: every case must still execute
+    out = subprocess.run(
+        [sys.executable, "-W", "ignore", "benchmarks/suite.py", "--sizes", "10", "--repeat", "1", "--min-time", "0", "--no-memory", "--json"],
+        cwd=ROOT, capture_output=True, text=True, timeout=600,
+    )
+    assert out.returncode == 0, out.stderr[-2000:]
+    names = {r["name"] for r in json.loads(out.stdout)["results"]}
+    if (ROOT / "models" / "lg.pkl").exists():
+        assert {"model.predict_proba", "model.predict_proba_sklearn", "model.predict_proba_batch"} <= names
+    assert "pipeline.run_batch" in names
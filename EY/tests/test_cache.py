@@ -0,0 +1,129 @@
+import math
+
+import numpy as np
+import pytest
+from conftest import ROOT
+from voiceguard.agents import Telemetry
+from voiceguard.cache import LRUCache, PipelineCache
+from voiceguard.inference import load_model
+from voiceguard.pipeline import build_pipeline
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(maxsize=3)
+    for k in "abc":
+        cache.put(k, k.upper())
+    assert cache.get("a") == "A"  # a is now the most recent
+    cache.put("d", "D")
+    assert cache.get("b") is None
+    assert [cache.get(k) for k in "acd"] == ["A", "C", "D"]
+    cache.put("c", "C2")  # overwrite refreshes recency without growing
+    cache.put("e", "E")
+    assert cache.get("a") is None and cache.get("c") == "C2"
+    stats = cache.stats()
+    assert stats["evictions"] == 2 and stats["size"] == 3
+    assert stats["hits"] == 5 and stats["misses"] == 2
+
+
+def test_ttl_expiry():
+    clock = FakeClock()
+    cache = LRUCache(maxsize=10, ttl=60, clock=clock)
+    cache.put("k", 1)
+    clock.now += 60
+    assert cache.get("k") == 1
+    clock.now += 0.5
+    assert cache.get("k", "gone") == "gone"
+    assert len(cache) == 0 and cache.stats()["expirations"] == 1
+    # re-putting restarts the clock
+    cache.put("k", 2)
+    clock.now += 30
+    assert cache.get("k") == 2
+
+
+@pytest.mark.parametrize("kwargs", [{"maxsize": 0}, {"ttl": 0}, {"ttl": -5}])
+def test_lru_rejects_bad_settings(kwargs):
+    with pytest.raises(ValueError):
+        LRUCache(**kwargs)
+
+
+@pytest.mark.parametrize("quant", [{"engine_temp_c": 0}, {"speed_kph": -1}, {"odometer_km": float("nan")}, {"oil_pressure_psi": "1"}, {"tyre_psi": 1.0}])
+def test_pipeline_cache_rejects_bad_quanta(quant):
+    with pytest.raises(ValueError):
+        PipelineCache(quantization=quant)
+
+
+def telemetry(**overrides):
+    values = dict(engine_temp_c=95.0, battery_voltage=12.2, oil_pressure_psi=35.0, vibration_g=0.5,
+                  speed_kph=60.0, odometer_km=80000.0, error_codes=["P0300"], location=(12.97, 77.59))
+    values.update(overrides)
+    return Telemetry(**values)
+
+
+def test_telemetry_key_buckets_and_non_finite():
+    cache = PipelineCache()
+    assert cache.telemetry_key(telemetry()) == cache.telemetry_key(telemetry(engine_temp_c=95.2, speed_kph=61.0))
+    assert cache.telemetry_key(telemetry()) != cache.telemetry_key(telemetry(engine_temp_c=96.0))
+    assert cache.telemetry_key(telemetry()) != cache.telemetry_key(telemetry(error_codes=[]))
+    for bad in (math.nan, math.inf, -math.inf):
+        assert cache.telemetry_key(telemetry(battery_voltage=bad)) is None
+
+
+def fleet_requests(n, seed=4):
+    # parked vehicles repeat their readings exactly, others drift below the quantization step
+    rng = np.random.default_rng(seed)
+    texts = ["engine overheating", "battery weak", "", "vibration at speed"]
+    reqs = []
+    for i in range(n):
+        v = i % 40
+        reqs.append((
+            texts[v % len(texts)],
+            {"engine_temp_c": 85 + v + (0 if v % 2 else float(rng.uniform(-0.2, 0.2))), "battery_voltage": 11.5 + v * 0.02,
+             "oil_pressure_psi": 30 + v % 9, "odometer_km": 1000.0 * v, "error_codes": ["P0217"] * (v % 3)},
+            {"id": f"C{v}", "location": [12.9, 77.6]},
+        ))
+    return reqs
+
+
+@pytest.mark.parametrize("model", [None, "lg.vgm"])
+def test_cached_pipeline_matches_uncached(model):
+    if model and not (ROOT / "models" / model).exists():
+        pytest.skip("model not built")
+    model_obj = load_model(str(ROOT / "models" / model)) if model else None
+    plain = build_pipeline(model_obj=model_obj)
+    cached = build_pipeline(model_obj=model_obj, cache=PipelineCache())
+    for text, telem, cust in fleet_requests(400):
+        a, b = plain.run(text, telem, cust), cached.run(text, telem, cust)
+        for part in ("voice_summary", "security_alerts", "oem_feedback"):
+            assert a[part] == b[part]
+        assert a["schedule"]["center_id"] == b["schedule"]["center_id"]
+        # a hit serves the features of the bucket's first reading: equal to within one quantum
+        assert b["diagnosis"]["issue_category"] == a["diagnosis"]["issue_category"]
+        assert abs(b["diagnosis"]["risk_score"] - a["diagnosis"]["risk_score"]) < 0.02
+    stats = cached.cache.stats()
+    assert stats["diagnosis"]["hits"] > 300 and stats["voice"]["hits"] > 300
+
+
+def test_exact_repeats_are_identical_and_copies():
+    cached = build_pipeline(cache=PipelineCache())
+    req = ("engine overheating", {"engine_temp_c": 112.0, "error_codes": ["P0217"]}, {"id": "C1"})
+    first = cached.run(*req)
+    first["diagnosis"]["signals"]["engine_temp_norm"] = -1  # mutating a result must not poison the cache
+    second = cached.run(*req)
+    assert second["diagnosis"]["signals"]["engine_temp_norm"] != -1
+    assert cached.cache.diagnosis.stats()["hits"] == 1
+
+
+def test_non_finite_telemetry_is_scored_but_not_cached():
+    cached = build_pipeline(cache=PipelineCache())
+    for _ in range(3):
+        result = cached.run("", {"engine_temp_c": float("nan")}, {"id": "C1"})
+        assert "risk_score" in result["diagnosis"]
+    assert len(cached.cache.diagnosis) == 0 and cached.cache.diagnosis.stats()["hits"] == 0
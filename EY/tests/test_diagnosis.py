@@ -0,0 +1,65 @@
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+from voiceguard.agents import DiagnosisAgent, Telemetry, TelemetryAgent, VoiceSummary
+from voiceguard.inference import CompiledScorer, FEATURES, predict_proba, predict_proba_batch
+from voiceguard.pipeline import build_pipeline
+
+
+class RecordingScorer(CompiledScorer):
+    # remembers the rows the model was asked to score
+    __slots__ = ("rows",)
+
+    def score_row(self, row):
+        self.rows.append(dict(row))
+        return super().score_row(row)
+
+
+def recording_model():
+    scorer = RecordingScorer(np.full(len(FEATURES), 0.01), -1.0)
+    scorer.rows = []
+    return {"scorer": scorer}
+
+
+def telemetry(**overrides):
+    values = dict(engine_temp_c=95.0, battery_voltage=12.2, oil_pressure_psi=35.0, vibration_g=0.5,
+                  speed_kph=60.0, odometer_km=80000.0, error_codes=["P0300"], location=(12.97, 77.59))
+    values.update(overrides)
+    return Telemetry(**values)
+
+
+def sklearn_model(rng):
+    X = rng.normal(size=(2000, len(FEATURES))) * [8, 0.5, 6, 0.25, 20, 30000, 1] + [92, 12.4, 35, 0.5, 45, 60000, 1]
+    y = (X[:, 0] + rng.normal(0, 5, len(X)) > 95).astype(int)
+    scaler = StandardScaler().fit(X)
+    return {"model": LogisticRegression(max_iter=500).fit(scaler.transform(X), y), "scaler": scaler, "features": FEATURES}, X
+
+
+def test_model_sees_unclipped_telemetry():
+    model = recording_model()
+    pipeline = build_pipeline(model_obj=model)
+    pipeline.run("engine overheating", {"engine_temp_c": 140.0, "battery_voltage": 8.5}, {"id": "C1"})
+    row = model["scorer"].rows[-1]
+    # the normalized features saturate at 120 C / 9.5 V; the model gets the real values
+    assert row["engine_temp_c"] == 140.0
+    assert row["battery_voltage"] == 8.5
+
+
+def test_raw_path_matches_legacy_path_in_range():
+    agent = DiagnosisAgent(model_obj=recording_model())
+    voice = VoiceSummary(customer_id="C1", symptoms=["overheat"], severity=0.25, intent="service_request")
+    t = telemetry()
+    feats = TelemetryAgent().process(t)
+    new = agent.process(voice, feats, TelemetryAgent.raw_features(t))
+    legacy = agent.process(voice, feats)  # de-normalizes the clipped features
+    assert new.risk_score == legacy.risk_score
+    assert new.issue_category == legacy.issue_category
+
+
+def test_compiled_scorer_matches_sklearn():
+    model, X = sklearn_model(np.random.default_rng(0))
+    compiled = {**model, "scorer": CompiledScorer.from_sklearn(model["scaler"], model["model"])}
+    np.testing.assert_allclose(predict_proba_batch(compiled, X), predict_proba_batch(model, X), atol=1e-9, rtol=0)
+    for x in X[:50]:
+        row = dict(zip(FEATURES, x.tolist()))
+        assert abs(predict_proba(compiled, row) - predict_proba(model, row)) < 1e-9
@@ -0,0 +1,101 @@
+import sys
+import threading
+
+import numpy as np
+from voiceguard.agents import DiagnosisAgent, TelemetryAgent
+from voiceguard.ensemble import ModelEnsemble
+from voiceguard.inference import CompiledScorer, FEATURES, predict_proba, predict_proba_batch
+
+
+def scorer(bias, scale=0.0):
+    # features all weighted by `scale`, so bias alone decides the score for zero-ish inputs
+    return {"scorer": CompiledScorer(np.full(len(FEATURES), scale), bias, FEATURES)}
+
+
+def telemetry(n):
+    return {
+        "engine_temp_c": np.linspace(80, 125, n),
+        "battery_voltage": np.full(n, 12.4),
+        "oil_pressure_psi": np.full(n, 35.0),
+        "vibration_g": np.full(n, 0.4),
+        "speed_kph": np.full(n, 40.0),
+        "odometer_km": np.full(n, 50000.0),
+        "error_code_count": np.zeros(n),
+    }
+
+
+def test_set_production_with_shadow_serves_new_model():
+    ens = ModelEnsemble(scorer(-5.0), name="old")
+    ens.register("shadow", scorer(-5.0))
+    new = scorer(5.0)
+    ens.set_production({**new, "version": "new"})
+    # the new production model is appended after the shadow; it must still be served
+    assert ens.names == ["shadow", "new"]
+    row = dict(zip(FEATURES, [100.0, 12.0, 30.0, 0.5, 50.0, 60000.0, 1.0]))
+    assert abs(ens.score_row(row) - predict_proba(new, row)) < 1e-12
+
+    agent = DiagnosisAgent(model_obj=ens)
+    cols = telemetry(20)
+    feats = TelemetryAgent().process_batch(cols)
+    raw = TelemetryAgent.raw_matrix(cols)
+    risk, _ = agent.process_batch([[] for _ in range(20)], np.zeros(20), feats, raw)
+    np.testing.assert_allclose(risk, predict_proba_batch(new, raw), atol=1e-12)
+    assert ens.shadow_stats()["shadow"]["rows"] == 21
+
+
+def test_category_model_serves_only_its_rows():
+    ens = ModelEnsemble(scorer(0.0))
+    ens.register("cooling", scorer(3.0), role="production", category="cooling")
+    X = np.zeros((3, len(FEATURES)))
+    served = ens.score(X, ["Cooling/Overheat", "General Inspection", "Electrical/Battery"])
+    np.testing.assert_allclose(served, [1 / (1 + np.exp(-3.0)), 0.5, 0.5])
+
+
+def test_register_invalidates_cached_diagnoses():
+    from voiceguard.cache import PipelineCache
+    from voiceguard.pipeline import build_pipeline
+
+    ens = ModelEnsemble(scorer(-4.0))
+    pipe = build_pipeline(model_obj=ens, cache=PipelineCache())
+    args = ("engine overheating", {"engine_temp_c": 110}, {"id": "C1"})
+    version = ens.version
+    assert pipe.run(*args)["diagnosis"]["risk_score"] == round(1 / (1 + np.exp(4.0)), 3)
+    ens.register("cooling", scorer(4.0), role="production", category="cooling")
+    assert ens.version == version + 1
+    assert pipe.run(*args)["diagnosis"]["risk_score"] == round(1 / (1 + np.exp(-4.0)), 3)
+
+
+def test_concurrent_scoring_loses_no_shadow_rows():
+    # several request threads race the background fold; every scored row must end up
+    # either compared or counted as dropped
+    ens = ModelEnsemble(scorer(-1.0, 0.01), interval=0.001, max_pending=2000)
+    ens.register("shadow", scorer(1.0, 0.01))
+    ens.start()
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(64, len(FEATURES)))
+    row = dict(zip(FEATURES, X[0]))
+    scored = [0] * 4
+
+    def worker(i):
+        for j in range(1000):
+            if j % 3:
+                n = 1 + (i + j) % 64
+                ens.score(X[:n])
+                scored[i] += n
+            else:
+                ens.score_row(row)
+                scored[i] += 1
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+    switch = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # force thread switches inside _record and _fold
+    try:
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        sys.setswitchinterval(switch)
+    ens.stop()
+    assert ens.shadow_stats()["shadow"]["rows"] + ens.dropped == sum(scored)
+    assert not ens._pending and ens._pending_size == 0
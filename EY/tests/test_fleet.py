@@ -0,0 +1,111 @@
+import io
+import json
+
+import numpy as np
+import pytest
+from conftest import ROOT
+from voiceguard.fleet import parse_chunk, score_file
+
+MODEL = str(ROOT / "models" / "lg.vgm")
+TEXTS = ["engine overheating", "battery weak, won't start", "", "strange vibration at speed"]
+
+
+def vehicles(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return [
+        {
+            "vehicle_id": f"V{i}",
+            "voice_text": TEXTS[i % len(TEXTS)],
+            "engine_temp_c": round(float(rng.normal(95, 10)), 1),
+            "battery_voltage": round(float(rng.normal(12.2, 0.5)), 2),
+            "oil_pressure_psi": round(float(rng.normal(35, 6)), 1),
+            "vibration_g": round(float(abs(rng.normal(0.5, 0.3))), 2),
+            "speed_kph": round(float(rng.uniform(0, 120)), 1),
+            "odometer_km": int(rng.uniform(0, 200000)),
+            "error_codes": ["P0217"] * int(rng.integers(0, 3)),
+            "location": [round(float(rng.uniform(8, 30)), 4), round(float(rng.uniform(70, 88)), 4)],
+        }
+        for i in range(n)
+    ]
+
+
+def write_ndjson(path, recs, extra_lines=()):
+    lines = [json.dumps(r) for r in recs]
+    for pos, line in extra_lines:
+        lines.insert(pos, line)
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def write_csv(path, recs):
+    cols = [k for k in recs[0] if k not in ("error_codes", "location")]
+    rows = [",".join(cols + ["error_codes", "lat", "lon"])]
+    for r in recs:
+        rows.append(",".join([json.dumps(r[c]) if isinstance(r[c], str) else str(r[c]) for c in cols] + [";".join(r["error_codes"]), str(r["location"][0]), str(r["location"][1])]))
+    path.write_text("\n".join(rows) + "\n", encoding="utf-8")
+
+
+def score(path, **kw):
+    out = io.StringIO()
+    stats = score_file(str(path), out, model_path=MODEL, **kw)
+    return stats, [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+def key(result):
+    # everything but the wall-clock slot
+    return (result["voice_summary"]["customer_id"], result["diagnosis"]["risk_score"], result["diagnosis"]["issue_category"], result["schedule"]["center_id"])
+
+
+def test_blank_lines_are_not_vehicles(tmp_path):
+    path = tmp_path / "fleet.ndjson"
+    path.write_text('{"vehicle_id": "A"}\n\n   \n{}\n', encoding="utf-8")
+    stats, results = score(path)
+    assert [r["voice_summary"]["customer_id"] for r in results] == ["A", "ROW-3"]
+    assert stats["rows"] == 2 and stats["skipped"] == 0
+
+
+def test_malformed_lines_are_skipped_and_counted(tmp_path):
+    path = tmp_path / "fleet.ndjson"
+    write_ndjson(path, vehicles(6), [(2, '{"vehicle_id": "broken"'), (4, "[1, 2]"), (5, "not json")])
+    stats, results = score(path, chunk_rows=4)
+    assert stats["rows"] == 6 and stats["skipped"] == 3
+    assert [r["voice_summary"]["customer_id"] for r in results] == [f"V{i}" for i in range(6)]
+    with pytest.raises(ValueError, match="line 3"):
+        score(path, strict=True)
+
+
+def test_malformed_csv_rows_are_skipped_and_counted(tmp_path):
+    path = tmp_path / "fleet.csv"
+    write_csv(path, vehicles(5))
+    lines = path.read_text(encoding="utf-8").splitlines()
+    lines.insert(3, "V9,too,many,fields,1,2,3,4,5,6,7,8,9,10,11")
+    lines.insert(5, "")
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    stats, results = score(path)
+    assert stats["rows"] == 5 and stats["skipped"] == 1
+    with pytest.raises(ValueError):
+        score(path, strict=True)
+
+
+def test_csv_and_ndjson_score_the_same(tmp_path):
+    recs = vehicles(300)
+    write_ndjson(tmp_path / "fleet.ndjson", recs)
+    write_csv(tmp_path / "fleet.csv", recs)
+    _, from_json = score(tmp_path / "fleet.ndjson", chunk_rows=128)
+    _, from_csv = score(tmp_path / "fleet.csv", chunk_rows=128)
+    assert [key(r) for r in from_json] == [key(r) for r in from_csv]
+
+
+def test_workers_do_not_change_scores(tmp_path):
+    path = tmp_path / "fleet.ndjson"
+    write_ndjson(path, vehicles(500, seed=1), [(100, ""), (250, "{oops")])
+    single, a = score(path, chunk_rows=64)
+    pooled, b = score(path, chunk_rows=64, workers=2)
+    assert single["rows"] == pooled["rows"] == 500 and single["skipped"] == pooled["skipped"] == 1
+    assert [key(r) for r in a] == [key(r) for r in b]
+
+
+def test_parse_chunk_ids_follow_line_numbers():
+    lines = ['{"voice_text": "x"}\n', "\n", '{"customer": {"id": "C7"}}\n', "{}\n"]
+    texts, telemetry, customers, skipped = parse_chunk("ndjson", None, lines, 10)
+    assert [c["id"] for c in customers] == ["ROW-10", "C7", "ROW-13"]
+    assert texts == ["x", "", ""] and skipped == 0
@@ -0,0 +1,53 @@
+import json
+
+import numpy as np
+import pytest
+from voiceguard.geo import BRUTE_FORCE_MAX, CenterIndex, haversine_km, haversine_km_array, load_centers
+
+
+def random_centers(rng, n):
+    # India-ish bounding box plus a few far-away points
+    lat = np.concatenate([rng.uniform(8, 32, n - 3), [-33.9, 51.5, 64.1]])
+    lon = np.concatenate([rng.uniform(68, 92, n - 3), [151.2, -0.1, -21.9]])
+    return [{"id": f"C{i}", "name": f"Center {i}", "lat": float(a), "lon": float(o)} for i, (a, o) in enumerate(zip(lat, lon))]
+
+
+def brute_force(centers, lats, lons, k):
+    lat = np.array([c["lat"] for c in centers])
+    lon = np.array([c["lon"] for c in centers])
+    dist = haversine_km_array(np.reshape(lats, (-1, 1)), np.reshape(lons, (-1, 1)), lat, lon)
+    return np.sort(dist, axis=1)[:, :k]
+
+
+@pytest.mark.parametrize("n", [4, BRUTE_FORCE_MAX, 2000])
+@pytest.mark.parametrize("k", [1, 3])
+def test_nearest_matches_brute_force(n, k):
+    rng = np.random.default_rng(n * 10 + k)
+    centers = random_centers(rng, n)
+    index = CenterIndex(centers)
+    lats, lons = rng.uniform(5, 35, 500), rng.uniform(65, 95, 500)
+    want = brute_force(centers, lats, lons, k)
+    idx, dist = index.nearest_batch(lats, lons, k)
+    np.testing.assert_allclose(dist, want, rtol=0, atol=1e-6)
+    # the reported distance is the real haversine to the reported center
+    got = haversine_km_array(lats[:, None], lons[:, None], index.lat[idx], index.lon[idx])
+    np.testing.assert_allclose(got, want, rtol=0, atol=1e-6)
+    for q in range(0, 500, 25):
+        single = index.nearest((lats[q], lons[q]), k)
+        assert [round(d, 6) for _, d in single] == [round(d, 6) for d in want[q]]
+        assert all(abs(haversine_km((lats[q], lons[q]), (c["lat"], c["lon"])) - d) < 1e-6 for c, d in single)
+
+
+def test_haversine_known_distance():
+    # Bengaluru -> Delhi, great circle ~1750 km
+    assert abs(haversine_km((12.9716, 77.5946), (28.7041, 77.1025)) - 1750) < 5
+
+
+def test_load_centers_json_and_csv(tmp_path):
+    centers = random_centers(np.random.default_rng(1), 10)
+    (tmp_path / "c.json").write_text(json.dumps(centers))
+    (tmp_path / "c.csv").write_text("id,name,lat,lon\n" + "".join(f'{c["id"]},{c["name"]},{c["lat"]},{c["lon"]}\n' for c in centers))
+    for path in (tmp_path / "c.json", tmp_path / "c.csv"):
+        loaded = load_centers(str(path))
+        assert [c["id"] for c in loaded] == [c["id"] for c in centers]
+        assert all(isinstance(c["lat"], float) for c in loaded)
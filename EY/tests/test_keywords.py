@@ -0,0 +1,69 @@
+import random
+
+import pytest
+from voiceguard.agents import VoiceCall, VoiceCustomerAgent
+from voiceguard.keywords import SCAN_MAX_PHRASES, KeywordMatcher
+
+
+def naive_process(text):
+    # VoiceCustomerAgent.process before the compiled matcher: one substring scan per phrase
+    text = text.lower()
+    symptoms = [cat for cat, kws in VoiceCustomerAgent.KEYWORDS.items() if any(kw in text for kw in kws)]
+    base = min(len(symptoms) / 4.0, 1.0)
+    if "urgent" in text or "immediately" in text or "breakdown" in text or "won't start" in text:
+        base = max(base, 0.8)
+    intent = "service_request" if ("service" in text or "appointment" in text or symptoms) else "general_inquiry"
+    return symptoms, round(base, 2), intent
+
+
+def naive_matches(groups, text):
+    out = set()
+    for g, kws in groups.items():
+        for kw in kws:
+            start = text.find(kw)
+            while start >= 0:
+                out.add((g, kw, start, start + len(kw)))
+                start = text.find(kw, start + 1)
+    return out
+
+
+def fuzz_text(rng, phrases, words=80):
+    # phrases glued, split, overlapped and mixed with noise, in random case
+    filler = ["the", "car", "is", "and", "when", "my", "a", "ov", "batt", "oi", "won't", "st"]
+    parts = []
+    for _ in range(words):
+        p = rng.choice(phrases) if rng.random() < 0.4 else rng.choice(filler)
+        if rng.random() < 0.2:
+            p = p[: rng.randrange(1, len(p) + 1)]
+        parts.append(p.upper() if rng.random() < 0.1 else p)
+    return rng.choice(["", " "]).join(parts) if rng.random() < 0.3 else " ".join(parts)
+
+
+def test_agent_matches_naive_scan_on_fuzzed_text():
+    rng = random.Random(0)
+    agent = VoiceCustomerAgent()
+    phrases = [kw for kws in agent.KEYWORDS.values() for kw in kws] + agent.URGENT_TERMS + agent.INTENT_TERMS
+    for _ in range(2000):
+        text = fuzz_text(rng, phrases)
+        s = agent.process(VoiceCall(customer_id="C", text=text, timestamp=0.0, location=(12.97, 77.59)))
+        assert (s.symptoms, s.severity, s.intent) == naive_process(text), text
+
+
+@pytest.mark.parametrize("size", [20, SCAN_MAX_PHRASES * 3])
+def test_matcher_matches_naive_search(size):
+    # both strategies: per-phrase scan (small vocabularies) and the single-pass trie regex
+    rng = random.Random(size)
+    alphabet = "abcde "
+    phrases = sorted({"".join(rng.choice(alphabet) for _ in range(rng.randint(1, 6))).strip() or "a" for _ in range(size)})
+    groups = {f"g{i % 7}": [] for i in range(7)}
+    for i, p in enumerate(phrases):
+        groups[f"g{i % 7}"].append(p)
+        if i % 5 == 0:
+            groups[f"g{(i + 3) % 7}"].append(p)  # a phrase owned by two groups
+    matcher = KeywordMatcher(groups)
+    for _ in range(300):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 200)))
+        want = naive_matches(groups, text)
+        got = {(m.group, m.keyword, m.start, m.end) for m in matcher.finditer(text)}
+        assert got == want
+        assert matcher.groups_in(text) == {g for g, _, _, _ in want}
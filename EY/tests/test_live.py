@@ -0,0 +1,31 @@
+import time
+from voiceguard.live import LiveView, LiveWorker
+from voiceguard.pipeline import build_pipeline
+
+TELEMETRY = {"engine_temp_c": 102.5, "battery_voltage": 11.9, "oil_pressure_psi": 28.0, "vibration_g": 0.85,
+             "speed_kph": 25.0, "odometer_km": 120000, "error_codes": ["P0520"]}
+
+
+def test_sessions_joining_late_see_every_vehicle():
+    pipeline = build_pipeline()
+    first = LiveWorker(pipeline, vehicles=50, telemetry=TELEMETRY)
+    view = LiveView(50)
+    for _ in range(3):
+        view.apply([first.tick()])
+    # a second session gets its own worker, whose first frame is a full snapshot
+    late = LiveWorker(pipeline, vehicles=50, telemetry=TELEMETRY, seed=1)
+    late_view = LiveView(50)
+    frame = late.tick()
+    assert len(frame.index) == 50
+    late_view.apply([frame])
+    assert (late_view.issue_category != "").all()
+    assert (view.issue_category != "").all()
+
+
+def test_worker_stops_when_not_polled():
+    worker = LiveWorker(build_pipeline(), vehicles=10, interval=0.01, idle_s=0.1).start()
+    time.sleep(0.5)
+    assert not worker.running
+    worker.start()
+    assert worker.running
+    worker.stop()
@@ -0,0 +1,48 @@
+import timeit
+
+from conftest import ROOT
+from voiceguard.inference import load_model
+from voiceguard.metrics import STAGES, PipelineMetrics
+from voiceguard.pipeline import build_pipeline
+
+
+def _run(text, telemetry, customer, marks):
+    if marks is not None:
+        marks.extend([0.0] * len(STAGES))
+    return {}
+
+
+def test_stage_marks_are_folded_without_timings():
+    metrics = PipelineMetrics(stage_every=1)
+    for _ in range(3 * metrics.FOLD_EVERY):
+        metrics.observe(_run, "", None, None)
+    # folded in bulk as they arrive, never much more than one fold's worth buffered
+    assert len(metrics._marked) <= metrics.FOLD_EVERY + metrics._check
+    assert metrics.summary()["total"]["count"] == 3 * metrics.FOLD_EVERY
+
+
+def test_sampled_timings():
+    metrics = PipelineMetrics(timings=4)
+    results = [metrics.observe(_run, "", None, None) for _ in range(40)]
+    assert sum("timings" in r for r in results) == 10
+    assert all("timings" in r for r in (PipelineMetrics(timings=True).observe(_run, "", None, None) for _ in range(5)))
+
+
+def _overhead_us(metrics, number=5000, rounds=30):
+    # instrumentation alone: observe() around a run that only makes the stage marks, against
+    # calling that run directly; short interleaved rounds, min of each side
+    direct = lambda: _run("", None, None, None)  # noqa: E731
+    observed = lambda: metrics.observe(_run, "", None, None)  # noqa: E731
+    off = on = float("inf")
+    for _ in range(rounds):
+        off = min(off, timeit.timeit(direct, number=number))
+        on = min(on, timeit.timeit(observed, number=number))
+    return (on - off) / number * 1e6
+
+
+def test_default_instrumentation_within_budget():
+    pipe = build_pipeline(model_obj=load_model(str(ROOT / "models" / "lg.vgm")))
+    request = ("engine overheating and smoke", {"engine_temp_c": 112, "odometer_km": 80000}, {"id": "C1"})
+    run_us = min(timeit.repeat(lambda: pipe.run(*request), number=500, repeat=7)) / 500 * 1e6
+    cost = _overhead_us(PipelineMetrics())
+    assert cost / run_us < 0.02, f"{cost:.2f} us per {run_us:.1f} us run"
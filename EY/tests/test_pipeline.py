@@ -0,0 +1,65 @@
+import random
+
+import pytest
+from conftest import ROOT
+from voiceguard.inference import load_model
+from voiceguard.pipeline import build_pipeline
+
+TRANSCRIPTS = [
+    "My car has been overheating and there's a rattling vibration at low speeds. It's urgent.",
+    "Battery seems weak, the car won't start in the morning.",
+    "I noticed an oil leak under the car and the pressure light came on.",
+    "Brakes squeak when I stop, please book a service appointment.",
+    "Just checking when my next service is due.",
+    "Engine stopped on the highway, complete breakdown, need help immediately.",
+]
+
+
+def fleet(n, seed=7):
+    rng = random.Random(seed)
+    texts, telemetry, customers = [], [], []
+    for i in range(n):
+        loc = [rng.uniform(8.0, 30.0), rng.uniform(70.0, 88.0)]
+        telemetry.append({
+            "engine_temp_c": round(rng.gauss(95, 10), 2),
+            "battery_voltage": round(rng.gauss(12.3, 0.6), 2),
+            "oil_pressure_psi": round(rng.gauss(34, 7), 2),
+            "vibration_g": round(max(0.0, rng.gauss(0.5, 0.3)), 3),
+            "speed_kph": round(max(0.0, rng.gauss(45, 20)), 1),
+            "odometer_km": float(int(max(0.0, rng.gauss(60000, 30000)))),
+            "error_codes": [f"P0{300 + k}" for k in range(rng.randint(0, 3))],
+            "location": loc,
+        })
+        customers.append({"id": f"CUST-{i:06d}", "location": loc})
+        texts.append(rng.choice(TRANSCRIPTS))
+    return texts, telemetry, customers
+
+
+def strip_slot(result):
+    # slot times come from the wall clock at booking, so they can differ between two pipelines
+    return {**result, "schedule": {k: v for k, v in result["schedule"].items() if k != "slot"}}
+
+
+@pytest.mark.parametrize("model", [None, "lg.pkl"])
+def test_run_batch_matches_run(model):
+    if model and not (ROOT / "models" / model).exists():
+        pytest.skip("models/lg.pkl not built")
+    model_obj = load_model(str(ROOT / "models" / model)) if model else None
+    texts, telemetry, customers = fleet(300)
+    looped = build_pipeline(model_obj=model_obj)
+    batched = build_pipeline(model_obj=model_obj)
+    want = [looped.run(t, tel, c) for t, tel, c in zip(texts, telemetry, customers)]
+    got = batched.run_batch(texts, telemetry, customers)
+    assert len(got) == len(want)
+    for i, (a, b) in enumerate(zip(want, got)):
+        assert strip_slot(b) == strip_slot(a), i
+    single = build_pipeline(model_obj=model_obj)
+    rows = [single.run(t, tel, c, compact=True) for t, tel, c in zip(texts, telemetry, customers)]
+    compact = build_pipeline(model_obj=model_obj).run_batch(texts, telemetry, customers, compact=True)
+    assert [strip_slot(r.to_result()) for r in compact] == [strip_slot(r.to_result()) for r in rows]
+
+
+def test_run_batch_rejects_mismatched_lengths():
+    texts, telemetry, customers = fleet(5)
+    with pytest.raises(ValueError, match="same length"):
+        build_pipeline().run_batch(texts[:4], telemetry, customers)
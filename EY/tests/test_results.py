@@ -0,0 +1,99 @@
+import sys
+
+import numpy as np
+import pytest
+from voiceguard.results import RESULT_FIELDS, CompactResult, ResultReader, ResultWriter, default_format, to_columns
+from voiceguard.pipeline import build_pipeline
+
+FORMATS = ["npz", "parquet"]
+
+
+@pytest.fixture(scope="module")
+def results():
+    # rule-based pipeline: varied categories, symptoms, alerts and empty lists
+    pipe = build_pipeline()
+    texts = ["engine overheating and smoke", "battery weak, won't start", "", "vibration at speed, oil light on", "all good"]
+    telemetry = [
+        {"engine_temp_c": 90 + i % 40, "battery_voltage": 11 + (i % 7) * 0.3, "oil_pressure_psi": 20 + i % 25, "vibration_g": (i % 10) / 5, "error_codes": ["P0300"] * (i % 3)}
+        for i in range(60)
+    ]
+    customers = [{"id": f"C{i}", "location": [12 + i % 9, 72 + i % 11]} for i in range(60)]
+    return pipe.run_batch([texts[i % len(texts)] for i in range(60)], telemetry, customers)
+
+
+def path_for(tmp_path, fmt):
+    return str(tmp_path / f"results.{fmt}")
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_round_trip(tmp_path, results, fmt):
+    path = path_for(tmp_path, fmt)
+    with ResultWriter(path) as w:
+        # three batches with different per-batch dictionaries, one as columns
+        w.write(results[:25])
+        w.write([CompactResult.from_result(r) for r in results[25:40]])
+        w.write(to_columns(results[40:]))
+    assert w.rows == len(results)
+    reader = ResultReader(path)
+    assert len(reader) == len(results)
+    want = [CompactResult.from_result(r) for r in results]
+    assert list(reader) == want
+    assert reader.record(-1) == want[-1]
+    assert reader.record(7).to_result() == results[7]
+    np.testing.assert_array_equal(reader.column("risk_score"), [r["diagnosis"]["risk_score"] for r in results])
+    assert reader.column("customer_id").tolist() == [r["voice_summary"]["customer_id"] for r in results]
+    assert reader.column("issue_category").tolist() == [r["diagnosis"]["issue_category"] for r in results]
+    codes, cats = reader.codes("priority")
+    assert cats[codes].tolist() == [r["schedule"]["priority"] for r in results]
+    frame = reader.to_frame(["customer_id", "risk_score", "issue_category"])
+    assert len(frame) == len(results)
+    means = reader.group_mean("issue_category")
+    for cat, mean in means.items():
+        rows = [r["diagnosis"]["risk_score"] for r in results if r["diagnosis"]["issue_category"] == cat]
+        assert mean == pytest.approx(np.mean(rows))
+    with pytest.raises(IndexError):
+        reader.record(len(results))
+
+
+def test_npz_columns_are_memory_mapped(tmp_path, results):
+    path = path_for(tmp_path, "npz")
+    with ResultWriter(path) as w:
+        w.write(results)
+    reader = ResultReader(path)
+    assert isinstance(reader.column("risk_score"), np.memmap)
+    assert isinstance(reader.codes("issue_category")[0], np.memmap)
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_empty_file(tmp_path, fmt):
+    path = path_for(tmp_path, fmt)
+    ResultWriter(path).close()
+    reader = ResultReader(path)
+    assert len(reader) == 0 and list(reader) == []
+    for k in RESULT_FIELDS:
+        assert len(reader.column(k)) == 0
+    assert reader.group_mean("issue_category") == {}
+    assert len(reader.to_frame()) == 0
+
+
+def test_write_after_close_rejected(tmp_path, results):
+    w = ResultWriter(path_for(tmp_path, "npz"))
+    w.close()
+    with pytest.raises(ValueError):
+        w.write(results)
+
+
+def test_without_pyarrow(tmp_path, monkeypatch, results):
+    # None in sys.modules makes `import pyarrow` raise ImportError
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    monkeypatch.setitem(sys.modules, "pyarrow.parquet", None)
+    assert default_format(str(tmp_path / "out.bin")) == "npz"
+    with pytest.raises(RuntimeError, match="pyarrow"):
+        ResultWriter(path_for(tmp_path, "parquet"))
+    # the fallback still round-trips
+    path = str(tmp_path / "out.bin")
+    with ResultWriter(path) as w:
+        w.write(results)
+    assert list(ResultReader(path, format="npz")) == [CompactResult.from_result(r) for r in results]
+    with pytest.raises(RuntimeError, match="pyarrow"):
+        ResultReader(path_for(tmp_path, "parquet"))
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+from conftest import ROOT
+from voiceguard.inference import FEATURES, compile_model, load_model, predict_proba, predict_proba_batch
+
+MODEL = ROOT / "models" / "lg.pkl"
+pytestmark = pytest.mark.skipif(not MODEL.exists(), reason="models/lg.pkl not built (python train.py)")
+
+
+def fleet(n=20000, seed=11):
+    # typical readings plus tails well outside the training range
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, len(FEATURES))) * [8, 0.5, 6, 0.25, 20, 30000, 1] + [92, 12.4, 35, 0.5, 45, 60000, 1]
+    X[: n // 10] *= rng.uniform(0, 3, (n // 10, len(FEATURES)))
+    X[:, -1] = np.abs(np.round(X[:, -1]))
+    return X
+
+
+def test_compiled_scorer_matches_shipped_model():
+    sk = load_model(str(MODEL))
+    compiled = {"scorer": compile_model(sk)}
+    X = fleet()
+    want = predict_proba_batch(sk, X)
+    np.testing.assert_allclose(predict_proba_batch(compiled, X), want, rtol=0, atol=1e-9)
+    for x, p in zip(X[:500], want[:500]):
+        row = dict(zip(FEATURES, x.tolist()))
+        assert abs(predict_proba(compiled, row) - p) < 1e-9
+        assert abs(predict_proba(sk, row) - p) < 1e-9
+
+
+def test_compiled_load_matches_shipped_model():
+    # compiled=True may pick up models/lg.vgm; either way the scores are the pickle's
+    sk, fast = load_model(str(MODEL)), load_model(str(MODEL), compiled=True)
+    X = fleet(seed=12)
+    np.testing.assert_allclose(predict_proba_batch(fast, X), predict_proba_batch(sk, X), rtol=0, atol=1e-9)
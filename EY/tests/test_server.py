@@ -0,0 +1,67 @@
+import json
+import sys
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "web"))
+import server  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def base_url():
+    httpd = server.make_server("127.0.0.1", 0, quiet=True)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def post(url, payload):
+    req = urllib.request.Request(url, json.dumps(payload).encode(), {"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req, timeout=10) as resp:
+            return resp.status, json.loads(resp.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+@pytest.mark.parametrize("payload", [
+    {"vehicles": [{"telemetry": 5}]},
+    {"vehicles": [{"voice_text": "ok"}, {"customer": "C1"}]},
+    {"vehicles": [{"voice_text": ["not", "text"]}]},
+    {"vehicles": [7]},
+    {"vehicles": {"telemetry": {}}},
+])
+def test_malformed_batch_entry_is_rejected(base_url, payload):
+    status, body = post(base_url + "/api/predict_batch", payload)
+    assert status == 400
+    assert "error" in body
+
+
+@pytest.mark.parametrize("payload", [
+    {"telemetry": [1, 2]},
+    [1, 2],
+    {"customer": {"location": [1]}},
+    {"customer": {"location": [12.9, "east"]}},
+    {"customer": {"location": 5}},
+    {"telemetry": {"location": [12.9, 77.5, 3]}},
+    {"telemetry": {"engine_temp_c": "hot"}},
+    {"telemetry": {"battery_voltage": None}},
+    {"telemetry": {"engine_temp_c": float("nan")}},
+    {"telemetry": {"error_codes": 3}},
+])
+def test_malformed_single_payload_is_rejected(base_url, payload):
+    status, body = post(base_url + "/api/predict", payload)
+    assert status == 400
+    assert "error" in body
+    # the same entry in a batch gets the same answer
+    assert post(base_url + "/api/predict_batch", [payload])[0] == 400
+
+
+def test_valid_batch_still_scores(base_url):
+    status, body = post(base_url + "/api/predict_batch", {"vehicles": [{"voice_text": "battery weak", "telemetry": {"battery_voltage": 10.8}}, {}]})
+    assert status == 200 and len(body) == 2
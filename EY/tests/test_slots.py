@@ -0,0 +1,106 @@
+import collections
+
+import pytest
+from voiceguard.agents import DiagnosisResult, SchedulingAgent
+from voiceguard.slots import LEAD_MINUTES, MAX_WAIT_MINUTES, SlotAllocator
+
+NOW = 1_765_000_000.0  # 2025-12-06 05:46 UTC, 11:16 local
+BLR = (12.97, 77.59)
+# two centers 10 km apart in Bengaluru, one 291 km away in Chennai
+CENTERS = [
+    {"id": "BLR-01", "name": "Bengaluru Central", "lat": 12.9716, "lon": 77.5946},
+    {"id": "BLR-02", "name": "Bengaluru East", "lat": 12.9716, "lon": 77.6866},
+    {"id": "CHE-04", "name": "Chennai North", "lat": 13.0827, "lon": 80.2707},
+]
+
+
+def allocator(centers=CENTERS, **kw):
+    kw.setdefault("bays", 2)
+    return SlotAllocator(centers, clock=lambda: NOW, **kw)
+
+
+def test_capacity_is_never_exceeded():
+    alloc = allocator(centers=SchedulingAgent.CENTERS, max_spill_km=5000)
+    bookings = [alloc.book(BLR, "urgent" if i % 3 else "normal") for i in range(500)]
+    held = [b for b in bookings if not b.waitlisted]
+    per_slot = collections.Counter((b.center["id"], b.slot_ts) for b in held)
+    assert max(per_slot.values()) <= 2
+    assert sum(alloc.load().values()) == len(held)
+
+
+def test_spills_to_next_nearest_then_waitlists():
+    alloc = allocator()
+    # urgent: slots within MAX_WAIT of the first opening, 2 bays each
+    per_center = 2 * (MAX_WAIT_MINUTES["urgent"] // 60 + 1)
+    bookings = [alloc.book(BLR, "urgent") for _ in range(3 * per_center)]
+    ids = [None if b.waitlisted else b.center["id"] for b in bookings]
+    assert ids == ["BLR-01"] * per_center + ["BLR-02"] * per_center + [None] * per_center
+    # each center fills its earliest slots first
+    first = [b.slot_ts for b in bookings[:per_center]]
+    assert first == sorted(first) and first[0] >= NOW + LEAD_MINUTES["urgent"] * 60
+    # nobody is sent to Chennai; waitlisted requests keep their nearest center
+    assert all(b.center["id"] == "BLR-01" for b in bookings[2 * per_center:])
+
+
+def test_max_spill_km_allows_farther_centers():
+    alloc = allocator(max_spill_km=500)
+    ids = {alloc.book(BLR, "urgent").center["id"] for _ in range(40)}
+    assert ids == {"BLR-01", "BLR-02", "CHE-04"}
+
+
+def test_batch_books_urgent_before_normal_then_by_risk():
+    alloc = allocator(centers=CENTERS[:1], bays=1)
+    n = 8
+    risk = [0.1, 0.95, 0.5, 0.2, 0.8, 0.3, 0.75, 0.4]
+    prio = ["urgent" if r >= 0.7 or i == 0 else "normal" for i, r in enumerate(risk)]
+    bookings = alloc.allocate_batch([BLR[0]] * n, [BLR[1]] * n, risk, prio)
+    urgent = sorted((b.slot_ts, r) for b, r, p in zip(bookings, risk, prio) if p == "urgent")
+    normal = sorted((b.slot_ts, r) for b, r, p in zip(bookings, risk, prio) if p == "normal")
+    # one bay: each booking takes the next hour, in order of (urgent first, highest risk)
+    assert [r for _, r in urgent] == [0.95, 0.8, 0.75, 0.1]
+    assert [r for _, r in normal] == [0.5, 0.4, 0.3, 0.2]
+
+
+def test_deterministic_under_fixed_clock():
+    requests = [((12.9 + i % 7 * 0.02, 77.5 + i % 5 * 0.03), "urgent" if i % 4 else "normal") for i in range(300)]
+    lats, lons = [loc[0] for loc, _ in requests], [loc[1] for loc, _ in requests]
+    risk = [round((i * 37 % 100) / 100, 2) for i in range(300)]
+    runs = []
+    for _ in range(2):
+        alloc = allocator(centers=SchedulingAgent.CENTERS)
+        single = [alloc.book(loc, p) for loc, p in requests]
+        bulk = allocator(centers=SchedulingAgent.CENTERS).allocate_batch(lats, lons, risk, [p for _, p in requests])
+        runs.append([(b.center["id"], b.slot_ts) for b in single + bulk])
+    assert runs[0] == runs[1]
+
+
+def test_slots_respect_opening_hours():
+    alloc = allocator(centers=[dict(CENTERS[0], open_hour=9, close_hour=18)], bays=1, max_spill_km=0)
+    bookings = [alloc.book(BLR, "normal") for _ in range(30)]
+    for b in bookings:
+        if not b.waitlisted:
+            local_hour = (b.slot_ts + alloc.utc_offset_s) % 86400 / 3600
+            assert 9 <= local_hour < 18
+
+
+def test_overnight_opening_hours():
+    alloc = allocator(centers=[dict(CENTERS[0], open_hour=20, close_hour=6)], bays=1)
+    hours = []
+    for _ in range(12):
+        b = alloc.book(BLR, "urgent")
+        if not b.waitlisted:
+            hours.append((b.slot_ts + alloc.utc_offset_s) % 86400 / 3600)
+    assert hours == [20, 21, 22, 23, 0]
+
+
+@pytest.mark.parametrize("hours", [(9, 9), (-1, 18), (9, 25)])
+def test_invalid_opening_hours_rejected_at_load(hours):
+    with pytest.raises(ValueError, match="BLR-01"):
+        allocator(centers=[dict(CENTERS[0], open_hour=hours[0], close_hour=hours[1])])
+
+
+def test_scheduling_agent_reports_waitlist():
+    agent = SchedulingAgent(allocator=allocator(centers=CENTERS[:1], bays=1))
+    diag = DiagnosisResult(risk_score=0.9, issue_category="Cooling/Overheat", contributing_signals={})
+    slots = [agent.schedule(BLR, diag).slot_iso for _ in range(10)]
+    assert slots[0] and slots[-1] == ""
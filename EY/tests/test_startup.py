@@ -0,0 +1,40 @@
+import subprocess
+import sys
+
+import pytest
+from conftest import ROOT
+
+# same gate as benchmarks/bench_startup.py: the scoring path stays free of the training stack
+FORBIDDEN = ("pandas", "sklearn", "scipy")
+BUDGET_MS = 400.0
+
+
+def import_profile(stmt):
+    # -> (import time in ms from -X importtime, forbidden modules loaded) in a fresh interpreter
+    code = f"{stmt}\nimport sys; print(','.join(m for m in {FORBIDDEN!r} if m in sys.modules))"
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-W", "ignore", "-c", code], cwd=ROOT, capture_output=True, text=True, timeout=120)
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    total = 0
+    for line in proc.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit() and not name.startswith("  "):
+                total += int(cumulative)
+    return total / 1000, [m for m in proc.stdout.strip().split(",") if m]
+
+
+@pytest.mark.parametrize("stmt", [
+    "import voiceguard.pipeline",
+    "import voiceguard.inference",
+    "from voiceguard.inference import load_model; from voiceguard.pipeline import build_pipeline; "
+    "build_pipeline(model_obj=load_model('models/lg.vgm')).run('overheating', {}, {'id': 'c'})",
+])
+def test_scoring_path_import_budget(stmt):
+    if "lg.vgm" in stmt and not (ROOT / "models" / "lg.vgm").exists():
+        pytest.skip("models/lg.vgm not built (python train.py)")
+    # best of three cold starts: the budget is for the imports, not for a busy machine
+    runs = [import_profile(stmt) for _ in range(3)]
+    heavy = runs[0][1]
+    assert not heavy, f"scoring path imports {', '.join(heavy)}"
+    ms = min(t for t, _ in runs)
+    assert ms <= BUDGET_MS, f"{ms:.0f} ms import time > {BUDGET_MS:.0f} ms budget"
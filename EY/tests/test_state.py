@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+from conftest import ROOT
+from voiceguard.agents import DiagnosisAgent, Telemetry, TelemetryAgent, VoiceSummary
+from voiceguard.inference import FEATURES, load_model
+from voiceguard.state import FleetState
+
+
+def records(n, seed=0):
+    rng = np.random.default_rng(seed)
+    telemetry = [
+        {
+            "engine_temp_c": float(rng.normal(95, 15)),
+            "battery_voltage": float(rng.normal(12.2, 0.8)),
+            "oil_pressure_psi": float(rng.normal(35, 10)),
+            "vibration_g": float(abs(rng.normal(0.5, 0.4))),
+            "speed_kph": float(rng.uniform(0, 140)),
+            "odometer_km": float(rng.uniform(0, 250000)),
+            "error_codes": ["P0300"] * int(rng.integers(0, 4)),
+        }
+        for _ in range(n)
+    ]
+    customers = [{"id": f"V{i}", "location": [float(rng.uniform(8, 30)), float(rng.uniform(70, 88))]} for i in range(n)]
+    return telemetry, customers
+
+
+def per_object(telemetry, customers, diag_agent):
+    # the dataclass path: Telemetry -> TelemetryAgent.process -> DiagnosisAgent.process
+    agent = TelemetryAgent()
+    out = []
+    for t, c in zip(telemetry, customers):
+        telem = Telemetry(**{k: t[k] for k in FEATURES if k != "error_code_count"}, error_codes=t["error_codes"], location=tuple(c["location"]))
+        feats = agent.process(telem)
+        raw = agent.raw_features(telem) if diag_agent.model_obj is not None else None
+        diag = diag_agent.process(VoiceSummary(c["id"], [], 0.0, "service_request"), feats, raw)
+        out.append((feats, diag))
+    return out
+
+
+@pytest.mark.parametrize("model", [None, "lg.vgm"])
+def test_fleet_matches_per_object_path(model):
+    if model and not (ROOT / "models" / model).exists():
+        pytest.skip("model not built")
+    diag_agent = DiagnosisAgent(load_model(str(ROOT / "models" / model)) if model else None)
+    telemetry, customers = records(400)
+    fleet = FleetState.from_records(telemetry, customers)
+    fleet.update_features()
+    categories = fleet.update_risk(diag_agent)
+    for i, (feats, diag) in enumerate(per_object(telemetry, customers, diag_agent)):
+        v = fleet[i]
+        assert v.id == customers[i]["id"]
+        assert (v.lat, v.lon) == tuple(customers[i]["location"])
+        assert v.features() == pytest.approx(feats, abs=1e-12)
+        assert v.risk_score == diag.risk_score
+        assert categories[i] == diag.issue_category
+
+
+def test_views_share_memory():
+    telemetry, customers = records(50)
+    fleet = FleetState.from_records(telemetry, customers)
+    v = fleet[10]
+    v.engine_temp_c = 130.0
+    assert fleet.column("engine_temp_c")[10] == 130.0
+    part = fleet[5:20]
+    assert np.shares_memory(part.column("risk_score"), fleet.column("risk_score"))
+    part.column("risk_score")[:] = 0.5
+    assert fleet[7].risk_score == 0.5 and fleet[4].risk_score == 0.0
+    assert part[5].engine_temp_c == 130.0 and part.ids[0] == "V5"
+    assert fleet[-1].id == "V49"
+    with pytest.raises(IndexError):
+        fleet[50]
+    with pytest.raises(AttributeError):
+        v.colour = 1
+
+
+def test_extend_grows_geometrically():
+    fleet = FleetState(0)
+    cols, _ = records(1000, seed=3)
+    data = FleetState.from_records(cols)
+    reallocations, capacity = 0, fleet.capacity
+    for start in range(0, 1000, 7):
+        batch = {k: data.column(k)[start:start + 7] for k in (*FEATURES, "lat", "lon")}
+        span = fleet.extend(batch)
+        assert span == slice(start, min(start + 7, 1000))
+        if fleet.capacity != capacity:
+            reallocations, capacity = reallocations + 1, fleet.capacity
+    assert len(fleet) == 1000 and fleet.capacity >= 1000
+    # doubling: a handful of reallocations for 143 appends, at most 2x spare room
+    assert reallocations <= 10 and fleet.capacity < 2 * 1000 + 7
+    for k in FEATURES:
+        np.testing.assert_array_equal(fleet.column(k), data.column(k))
+
+
+def test_extend_ids_and_reserve():
+    telemetry, customers = records(30)
+    fleet = FleetState.from_records(telemetry[:10], customers[:10])
+    fleet.reserve(100)
+    assert fleet.capacity == 100 and len(fleet) == 10
+    view = fleet[3]
+    # a longer id widens the id buffer; existing views keep working across reallocations
+    fleet.extend_records(telemetry[10:12], [{"id": "VEHICLE-WITH-A-LONG-ID", "location": [1, 2]}, customers[11]])
+    fleet.reserve(1000)
+    assert fleet.ids.tolist() == [c["id"] for c in customers[:10]] + ["VEHICLE-WITH-A-LONG-ID", "V11"]
+    view.battery_voltage = 9.0
+    assert fleet.column("battery_voltage")[3] == 9.0
+    with pytest.raises(ValueError):
+        fleet.extend_records(telemetry[12:14])  # ids for every batch or for none
+    with pytest.raises(ValueError):
+        fleet.extend({k: np.zeros(2) for k in FEATURES}, ids=["a"])
+    assert len(fleet) == 12
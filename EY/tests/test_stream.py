@@ -0,0 +1,103 @@
+import io
+
+import numpy as np
+import pytest
+from voiceguard.inference import FEATURES
+from voiceguard.stream import RingBuffer, StreamProcessor, VehicleWindow, read_ndjson
+
+
+class FakePipeline:
+    def __init__(self):
+        self.calls = []
+
+    def run(self, text, telemetry, customer):
+        self.calls.append((text, telemetry, customer))
+        return {"risk_score": 0.0}
+
+
+def sample(i, **over):
+    rec = {
+        "vehicle_id": "V1",
+        "ts": float(i),
+        "engine_temp_c": 90.0 + (i % 7),
+        "battery_voltage": 12.6 - 0.01 * (i % 5),
+        "oil_pressure_psi": 40.0,
+        "vibration_g": 0.2,
+        "speed_kph": 60.0,
+        "odometer_km": 50000.0 + i,
+        "error_codes": ["P0300"] if i % 3 == 0 else [],
+    }
+    rec.update(over)
+    return rec
+
+
+def test_ring_buffer_wraparound():
+    ring = RingBuffer(3)
+    assert [ring.push(v) for v in (1.0, 2.0, 3.0)] == [None, None, None]
+    assert len(ring) == 3 and list(ring.values()) == [1.0, 2.0, 3.0]
+    assert ring.push(4.0) == 1.0
+    assert ring.push(5.0) == 2.0
+    assert len(ring) == 3 and list(ring.values()) == [3.0, 4.0, 5.0]
+    for v in range(6, 20):
+        ring.push(float(v))
+    assert list(ring.values()) == [17.0, 18.0, 19.0]
+
+
+def test_window_matches_reference():
+    rng = np.random.default_rng(0)
+    alpha, cap = 0.2, 8
+    w = VehicleWindow(cap)
+    rows = rng.normal(size=(50, len(FEATURES))) + 10.0
+    ts = np.cumsum(rng.uniform(0.5, 1.5, size=50)) + 1000.0
+    ref = rows[0].copy()
+    for i, (t, row) in enumerate(zip(ts, rows)):
+        w.update(float(t), tuple(row), alpha)
+        if i:
+            ref += alpha * (row - ref)
+        np.testing.assert_allclose(w.ewma, ref, rtol=1e-12)
+        lo = max(0, i + 1 - cap)
+        np.testing.assert_allclose(w.min_battery, rows[lo:i + 1, 1].min())
+        if i:
+            slope = np.polyfit(ts[lo:i + 1] - ts[0], rows[lo:i + 1, 0], 1)[0]
+            assert w.slope == pytest.approx(slope, rel=1e-6, abs=1e-9)
+    assert w.samples == 50
+
+
+def test_bad_records_are_skipped_and_counted():
+    pipe = FakePipeline()
+    proc = StreamProcessor(pipe, window=4)
+    records = [
+        sample(0),
+        sample(1, engine_temp_c="hot"),
+        sample(2, battery_voltage=None),
+        sample(3, ts="yesterday"),
+        sample(4, speed_kph=float("nan")),
+        sample(5, vehicle_id="V2", odometer_km=[1]),
+        "not a record",
+        sample(6),
+    ]
+    list(proc.process(records))
+    assert proc.received == 8 and proc.skipped == 6
+    assert list(proc.vehicles) == ["V1"]  # a bad record never creates vehicle state
+    assert proc.vehicles["V1"].samples == 2
+    assert all(np.isfinite(proc.vehicles["V1"].ewma))
+
+
+def test_stream_survives_bad_ndjson_lines():
+    lines = ['{"vehicle_id": "V1", "engine_temp_c": 95}', "", "{oops", "[1, 2]",
+             '{"vehicle_id": "V1", "engine_temp_c": "hot"}', '{"vehicle_id": "V2", "engine_temp_c": 120}']
+    proc = StreamProcessor(FakePipeline())
+    out = list(proc.process(read_ndjson(io.StringIO("\n".join(lines)))))
+    assert proc.received == 3 and proc.skipped == 1
+    assert [r["vehicle_id"] for r in out] == ["V1", "V2"]
+
+
+def test_rescores_only_on_drift():
+    pipe = FakePipeline()
+    proc = StreamProcessor(pipe, threshold=0.05)
+    steady = [sample(i, engine_temp_c=90.0, error_codes=[], battery_voltage=12.6, odometer_km=50000.0) for i in range(20)]
+    out = list(proc.process(steady))
+    assert len(out) == 1 and proc.rescored == 1
+    hot = [sample(20 + i, engine_temp_c=140.0, error_codes=[], battery_voltage=12.6, odometer_km=50000.0) for i in range(5)]
+    assert list(proc.process(hot))
+    assert out[0]["stream"]["samples"] == 1 and len(pipe.calls) == proc.rescored
@@ -0,0 +1,108 @@
+import csv
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from train import generate_synthetic
+from voiceguard.inference import FEATURES
+from voiceguard.pipeline import TELEMETRY_DEFAULTS
+from voiceguard.synthetic import BLOCK_ROWS, ERROR_CODES, NPY_DTYPE, TRAIN_COLUMNS, synthetic_block, transcripts, write_synthetic
+from voiceguard.training import train_model
+
+
+def test_same_seed_same_bytes(tmp_path):
+    for fmt in ("csv", "ndjson", "npy"):
+        a, b, c = (str(tmp_path / f"{name}.{fmt}") for name in "abc")
+        write_synthetic(a, 3000, seed=7, format=fmt)
+        write_synthetic(b, 3000, seed=7, format=fmt)
+        write_synthetic(c, 3000, seed=8, format=fmt)
+        with open(a, "rb") as fa, open(b, "rb") as fb, open(c, "rb") as fc:
+            da, db, dc = fa.read(), fb.read(), fc.read()
+        assert da == db, fmt
+        assert da != dc, fmt
+
+
+def test_smaller_n_is_a_prefix(tmp_path):
+    # row i depends only on (seed, i), including transcripts and across block boundaries
+    n = BLOCK_ROWS + 500
+    full = synthetic_block(BLOCK_ROWS, seed=3, block=1)
+    head = synthetic_block(500, seed=3, block=1)
+    for k in head:
+        np.testing.assert_array_equal(head[k], full[k][:500])
+    assert transcripts(head, 3, 1) == transcripts(full, 3, 1)[:500]
+    small, big = str(tmp_path / "small.ndjson"), str(tmp_path / "big.ndjson")
+    write_synthetic(small, 1000, seed=3, voice=True)
+    write_synthetic(big, n, seed=3, voice=True)
+    with open(small, encoding="utf-8") as fs, open(big, encoding="utf-8") as fb:
+        lines = fs.readlines()
+        assert lines == [next(fb) for _ in lines]
+    arr = str(tmp_path / "big.npy")
+    write_synthetic(arr, n, seed=3)
+    rec = np.load(arr, mmap_mode="r")
+    assert rec.dtype == NPY_DTYPE and len(rec) == n
+    np.testing.assert_array_equal(rec["engine_temp_c"][BLOCK_ROWS:], full["engine_temp_c"][:500])
+
+
+def test_csv_matches_training_schema(tmp_path):
+    path = str(tmp_path / "train.csv")
+    write_synthetic(path, 5000, seed=11)
+    df = pd.read_csv(path)
+    assert list(df.columns) == TRAIN_COLUMNS == FEATURES + ["label"]
+    assert len(df) == 5000 and not df.isna().any().any()
+    assert df["odometer_km"].dtype.kind == "i" and df["error_code_count"].dtype.kind == "i"
+    assert set(df["label"].unique()) <= {0, 1}
+    for k in ("vibration_g", "speed_kph", "odometer_km", "error_code_count"):
+        assert (df[k] >= 0).all(), k
+    # rounding matches generate_synthetic's csv
+    for k, places in (("engine_temp_c", 2), ("battery_voltage", 2), ("oil_pressure_psi", 2), ("vibration_g", 3), ("speed_kph", 1)):
+        np.testing.assert_array_equal(df[k], df[k].round(places))
+    info = train_model(path, str(tmp_path / "lg.pkl"))
+    assert info["features"] == FEATURES and info["accuracy"] > 0.8
+
+
+def test_distributions_match_generate_synthetic(tmp_path):
+    ref_path, path = str(tmp_path / "ref.csv"), str(tmp_path / "fast.csv")
+    generate_synthetic(ref_path, 20000)
+    write_synthetic(path, 20000)
+    ref, fast = pd.read_csv(ref_path), pd.read_csv(path)
+    for k in TRAIN_COLUMNS:
+        spread = max(ref[k].std(), 1e-9)
+        assert abs(fast[k].mean() - ref[k].mean()) < 0.05 * spread, k
+        assert fast[k].std() == pytest.approx(ref[k].std(), rel=0.05), k
+    assert fast["label"].mean() == pytest.approx(ref["label"].mean(), abs=0.02)
+
+
+def test_ndjson_records_are_telemetry_shaped(tmp_path):
+    path = str(tmp_path / "fleet.ndjson")
+    write_synthetic(path, 2000, seed=5, voice=True)
+    with open(path, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    assert len(records) == 2000
+    for i, rec in enumerate(records):
+        assert rec["vehicle_id"] == f"VEH-{i:08d}"
+        assert set(TELEMETRY_DEFAULTS) <= set(rec)
+        assert all(isinstance(rec[k], (int, float)) for k in TELEMETRY_DEFAULTS)
+        assert set(rec["error_codes"]) <= set(ERROR_CODES)
+        lat, lon = rec["location"]
+        assert 8.0 <= lat <= 30.0 and 70.0 <= lon <= 88.0
+        assert rec["label"] in (0, 1) and isinstance(rec["voice_text"], str) and rec["voice_text"]
+    cols = synthetic_block(2000, seed=5)
+    assert [len(r["error_codes"]) for r in records] == cols["error_code_count"].tolist()
+
+
+def test_voice_csv_round_trips_through_csv_reader(tmp_path):
+    path = str(tmp_path / "fleet.csv")
+    write_synthetic(path, 500, seed=9, voice=True)
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert list(rows[0]) == TRAIN_COLUMNS + ["vehicle_id", "lat", "lon", "voice_text"]
+    cols = synthetic_block(500, seed=9)
+    assert [r["voice_text"] for r in rows] == transcripts(cols, 9, 0)
+
+
+def test_bad_format_rejected(tmp_path):
+    with pytest.raises(ValueError, match="unknown format"):
+        write_synthetic(str(tmp_path / "x.bin"), 10, format="parquet")
+    with pytest.raises(ValueError, match="voice"):
+        write_synthetic(str(tmp_path / "x.npy"), 10, voice=True)
@@ -0,0 +1,42 @@
+import os
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+from train import generate_synthetic
+from voiceguard.inference import FEATURES, load_model, predict_proba_batch
+from voiceguard.training import train_incremental, train_model
+
+
+def test_incremental_scaler_matches_batch_fit(tmp_path):
+    data = str(tmp_path / "train.csv")
+    generate_synthetic(data, 6000)
+    df = pd.read_csv(data)
+    head = str(tmp_path / "grow.csv")
+    df.iloc[:2500].to_csv(head, index=False)
+    out = str(tmp_path / "inc.pkl")
+    # two runs: the second only reads the rows appended after the first
+    train_incremental(head, out, chunk_rows=700)
+    df.iloc[2500:].to_csv(head, mode="a", header=False, index=False)
+    info = train_incremental(head, out, chunk_rows=700)
+    assert info["rows_new"] == 3500
+    train_rows = np.arange(len(df)) % 5 != 0
+    assert info["rows_trained"] == int(train_rows.sum())
+    batch = StandardScaler().fit(df[FEATURES].values[train_rows].astype(float))
+    inc = load_model(out)["scaler"]
+    np.testing.assert_allclose(inc.mean_, batch.mean_, rtol=1e-9)
+    np.testing.assert_allclose(inc.var_, batch.var_, rtol=1e-9)
+
+
+def test_incremental_model_agrees_with_batch_model(tmp_path):
+    data = str(tmp_path / "train.csv")
+    generate_synthetic(data, 20000)
+    full = train_model(data, str(tmp_path / "lg.pkl"))
+    inc = train_incremental(data, str(tmp_path / "inc.pkl"), chunk_rows=2000, epochs=3)
+    assert abs(inc["accuracy"] - full["accuracy"]) < 0.05
+    X = pd.read_csv(data)[FEATURES].values.astype(float)[:2000]
+    # both artifacts export the same .vgm form, and decisions mostly agree
+    p_full = predict_proba_batch(load_model(str(tmp_path / "lg.vgm")), X)
+    p_inc = predict_proba_batch(load_model(str(tmp_path / "inc.vgm")), X)
+    assert ((p_full >= 0.5) == (p_inc >= 0.5)).mean() > 0.9
+    assert os.path.exists(str(tmp_path / "inc.pkl.ckpt"))
@@ -0,0 +1,72 @@
+from collections import Counter, deque
+
+import numpy as np
+from voiceguard.agents import DiagnosisResult, UEBAAgent, VoiceSummary
+from voiceguard.ueba import CUSTOMER_ALERT, FleetUEBA, SlidingCountMin
+
+CATEGORIES = ["Cooling/Overheat", "Electrical/Battery", "General Inspection"]
+
+
+def events(rng, n, customers=300):
+    # a steady background plus one noisy customer and one regional surge
+    ids = [f"C{i}" for i in rng.integers(0, customers, n)]
+    lats, lons = rng.uniform(10, 20, n), rng.uniform(70, 80, n)
+    cats = rng.choice(CATEGORIES, n)
+    for i in range(n // 2, n // 2 + 200, 10):
+        ids[i] = "NOISY"
+    lats[n - 400:], lons[n - 400:], cats[n - 400:] = 12.9, 77.6, "Cooling/Overheat"
+    return ids, lats, lons, cats
+
+
+def test_sketch_never_undercounts_and_stays_close():
+    rng = np.random.default_rng(0)
+    sketch = SlidingCountMin(width=1 << 12, depth=4, window_s=100.0, slots=10)
+    window = deque()
+    for step in range(20000):
+        ts = step * 0.05
+        key = f"k{int(rng.zipf(1.3)) % 2000}"
+        est = sketch.add(key, ts)
+        window.append((sketch._bucket, key))
+        # exact count over the buckets the sketch still holds
+        while window[0][0] <= sketch._bucket - sketch.slots:
+            window.popleft()
+        if step % 97 == 0:
+            exact = Counter(k for _, k in window)
+            assert est >= exact[key]
+            for k in list(exact)[:50]:
+                assert exact[k] <= sketch.estimate(k) <= exact[k] + 0.01 * len(window) + 2
+
+
+def test_single_and_batch_paths_agree():
+    rng = np.random.default_rng(1)
+    n = 5000
+    ids, lats, lons, cats = events(rng, n)
+    intents = rng.choice(["service_request", "general_inquiry"], n)
+    severity, risk = rng.uniform(0, 1, n), rng.uniform(0, 1, n)
+    clock = lambda: 1_000_000.0  # noqa: E731
+    make = lambda: FleetUEBA(window_s=600, customer_limit=10, surge_min=20, clock=clock)  # noqa: E731
+    single, batch = UEBAAgent(fleet=make()), UEBAAgent(fleet=make())
+    want = []
+    for i in range(n):
+        voice = VoiceSummary(customer_id=ids[i], symptoms=[], severity=float(severity[i]), intent=str(intents[i]))
+        diag = DiagnosisResult(risk_score=float(risk[i]), issue_category=str(cats[i]), contributing_signals={})
+        want.append(single.monitor(voice, diag, (lats[i], lons[i])))
+    got = batch.monitor_batch(intents, severity, risk, ids, lats, lons, cats)
+    assert got == want
+    assert any(CUSTOMER_ALERT in a for a in got)
+
+
+def test_memory_is_bounded_by_configuration():
+    rng = np.random.default_rng(2)
+    fleet = FleetUEBA(width=1 << 12, depth=4, max_regions=100, cell_deg=0.01, clock=lambda: 0.0)
+    budget = fleet.customers.nbytes()
+    sizes = []
+    for chunk in range(5):
+        n = 20000
+        fleet.observe_batch([f"C{chunk}-{i}" for i in range(n)], rng.uniform(-60, 60, n), rng.uniform(-180, 180, n), rng.choice(CATEGORIES, n))
+        sizes.append(fleet.memory_bytes())
+        assert len(fleet.regions) <= 100
+    # the sketch is fixed-size and the region map is capped: memory stops growing
+    assert fleet.customers.nbytes() == budget
+    assert sizes[-1] == sizes[0]
+    assert fleet.stats()["region_evictions"] > 0
@@ -1,11 +1,12 @@
+import argparse
 import random
 import csv
 from pathlib import Path
-from voiceguard.model import train_model
+from voiceguard.training import train_incremental, train_model
 
 
-def generate_synthetic(path: str, n: int = 1200):
-    rng = random.Random(42)
+def generate_synthetic(path: str, n: int = 1200, seed: int = 42):
+    rng = random.Random(seed)
     with open(path, "w", newline="", encoding="utf-8") as f:
         w = csv.writer(f)
         w.writerow([
@@ -40,13 +41,23 @@ def generate_synthetic(path: str, n: int = 1200):
 
 
 def main():
-    data_path = "data/sim_telemetry.csv"
-    model_path = "models/lg.pkl"
-    Path("data").mkdir(exist_ok=True)
-    Path("models").mkdir(exist_ok=True)
-    if not Path(data_path).exists():
-        generate_synthetic(data_path, 2000)
-    report = train_model(data_path, model_path)
+    ap = argparse.ArgumentParser(description="Train the risk model on labeled telemetry")
+    ap.add_argument("--data", default="data/sim_telemetry.csv", help="CSV with the model features and a label column")
+    ap.add_argument("--model", default="models/lg.pkl")
+    ap.add_argument("--rows", type=int, default=2000, help="rows to generate when --data does not exist")
+    ap.add_argument("--incremental", action="store_true", help="chunked partial_fit that resumes from --checkpoint")
+    ap.add_argument("--checkpoint", default=None, help="incremental state (default: <model>.ckpt)")
+    ap.add_argument("--chunk", type=int, default=100_000, help="rows per chunk in incremental mode")
+    ap.add_argument("--epochs", type=int, default=1, help="passes over new rows in incremental mode")
+    args = ap.parse_args()
+    Path(args.data).parent.mkdir(parents=True, exist_ok=True)
+    Path(args.model).parent.mkdir(parents=True, exist_ok=True)
+    if not Path(args.data).exists():
+        generate_synthetic(args.data, args.rows)
+    if args.incremental:
+        report = train_incremental(args.data, args.model, args.checkpoint, chunk_rows=args.chunk, epochs=args.epochs)
+    else:
+        report = train_model(args.data, args.model)
     print("trained", report)
 
 
@@ -2,9 +2,15 @@ from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple
 import math
 import time
+import numpy as np
+from .geo import CenterIndex, haversine_km, load_centers
+from .keywords import KeywordMatch, KeywordMatcher
+from .ensemble import ModelEnsemble
+from .inference import FEATURES, predict_proba, predict_proba_batch
+from .slots import SlotAllocator
 
 
-@dataclass
+@dataclass(slots=True)
 class Telemetry:
     engine_temp_c: float
     battery_voltage: float
@@ -16,7 +22,7 @@ class Telemetry:
     location: Tuple[float, float]  # lat, lon
 
 
-@dataclass
+@dataclass(slots=True)
 class VoiceCall:
     customer_id: str
     text: str
@@ -24,7 +30,7 @@ class VoiceCall:
     location: Tuple[float, float]
 
 
-@dataclass
+@dataclass(slots=True)
 class VoiceSummary:
     customer_id: str
     symptoms: List[str]
@@ -32,19 +38,19 @@ class VoiceSummary:
     intent: str  # e.g., "service_request"
 
 
-@dataclass
+@dataclass(slots=True)
 class DiagnosisResult:
     risk_score: float  # 0..1
     issue_category: str
     contributing_signals: Dict[str, float]
 
 
-@dataclass
+@dataclass(slots=True)
 class ScheduleResult:
     center_name: str
     center_id: str
     eta_minutes: int
-    slot_iso: str
+    slot_iso: str  # "" when the allocator waitlisted the request
     priority: str  # "normal" | "urgent"
 
 
@@ -57,23 +63,56 @@ class VoiceCustomerAgent:
         "stall": ["stall", "engine stopped", "cut off"],
         "brake": ["brake", "squeak", "soft pedal"],
     }
+    URGENT_TERMS = ["urgent", "immediately", "breakdown", "won't start"]
+    INTENT_TERMS = ["service", "appointment"]
+    # reserved matcher groups; symptom categories may not start with "_"
+    _URGENT = "_urgent"
+    _INTENT = "_intent"
+
+    def __init__(self, vocabulary: Optional[Dict] = None):
+        # vocabulary: keywords.load_vocabulary() shape; defaults to the class-level lists
+        vocab = vocabulary or {}
+        self.keywords: Dict[str, List[str]] = dict(vocab.get("symptoms", self.KEYWORDS))
+        self.matcher = KeywordMatcher({
+            **self.keywords,
+            self._URGENT: vocab.get("urgent", self.URGENT_TERMS),
+            self._INTENT: vocab.get("intent", self.INTENT_TERMS),
+        })
+
+    def matches(self, text: str) -> List[KeywordMatch]:
+        # every (group, keyword, offset) hit, for explaining a summary
+        return list(self.matcher.finditer(text.lower()))
 
     def process(self, call: VoiceCall) -> VoiceSummary:
-        text = call.text.lower()
-        symptoms: List[str] = []
-        for cat, kws in self.KEYWORDS.items():
-            if any(kw in text for kw in kws):
-                symptoms.append(cat)
+        found = self.matcher.groups_in(call.text.lower())
+        symptoms: List[str] = [cat for cat in self.keywords if cat in found]
         # naive severity estimate: number of symptoms + presence of "urgent"
         base = min(len(symptoms) / 4.0, 1.0)
-        if "urgent" in text or "immediately" in text or "breakdown" in text or "won't start" in text:
+        if self._URGENT in found:
             base = max(base, 0.8)
         severity = round(base, 2)
-        intent = "service_request" if ("service" in text or "appointment" in text or symptoms) else "general_inquiry"
+        intent = "service_request" if (self._INTENT in found or symptoms) else "general_inquiry"
         return VoiceSummary(customer_id=call.customer_id, symptoms=symptoms, severity=severity, intent=intent)
 
 
 class TelemetryAgent:
+    @staticmethod
+    def raw_features(telemetry: Telemetry) -> Dict[str, float]:
+        # Unclipped model inputs in FEATURES units; no normalize/denormalize round trip
+        return {
+            "engine_temp_c": telemetry.engine_temp_c,
+            "battery_voltage": telemetry.battery_voltage,
+            "oil_pressure_psi": telemetry.oil_pressure_psi,
+            "vibration_g": telemetry.vibration_g,
+            "speed_kph": telemetry.speed_kph,
+            "odometer_km": telemetry.odometer_km,
+            "error_code_count": float(len(telemetry.error_codes)),
+        }
+
+    @staticmethod
+    def raw_matrix(cols: Dict[str, np.ndarray]) -> np.ndarray:
+        return np.column_stack([cols[k] for k in FEATURES])
+
     def process(self, telemetry: Telemetry) -> Dict[str, float]:
         # Normalize features roughly to 0..1 ranges
         features = {
@@ -87,25 +126,61 @@ class TelemetryAgent:
         }
         return features
 
+    def process_batch(self, cols: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        # Column-wise twin of process(): same formulas, one array op per feature
+        return {
+            "engine_temp_norm": np.clip((cols["engine_temp_c"] - 70) / 50, 0.0, 1.0),
+            "battery_drop_norm": np.clip((12.5 - cols["battery_voltage"]) / 3, 0.0, 1.0),
+            "oil_pressure_low_norm": np.clip((40 - cols["oil_pressure_psi"]) / 40, 0.0, 1.0),
+            "vibration_norm": np.clip(cols["vibration_g"] / 2, 0.0, 1.0),
+            "speed_norm": np.clip(cols["speed_kph"] / 180, 0.0, 1.0),
+            "odometer_norm": np.clip(cols["odometer_km"] / 200000, 0.0, 1.0),
+            "error_code_count": cols["error_code_count"].astype(float),
+        }
+
 
 class DiagnosisAgent:
     def __init__(self, model_obj=None):
+        # model_obj: a loaded model, or a ModelEnsemble (per-category and shadow models)
         self.model_obj = model_obj
 
-    def process(self, voice: VoiceSummary, telem_features: Dict[str, float]) -> DiagnosisResult:
+    @staticmethod
+    def _denormalize(telem_features: Dict[str, float]) -> Dict[str, float]:
+        # Legacy fallback for callers that only have the clipped 0..1 features;
+        # saturated values (e.g. >120C, <9.5V) cannot be recovered here.
+        return {
+            "engine_temp_c": telem_features["engine_temp_norm"] * 50 + 70,
+            "battery_voltage": 12.5 - telem_features["battery_drop_norm"] * 3,
+            "oil_pressure_psi": 40 - telem_features["oil_pressure_low_norm"] * 40,
+            "vibration_g": telem_features["vibration_norm"] * 2,
+            "speed_kph": telem_features["speed_norm"] * 180,
+            "odometer_km": telem_features["odometer_norm"] * 200000,
+            "error_code_count": telem_features["error_code_count"],
+        }
+
+    def process(self, voice: VoiceSummary, telem_features: Dict[str, float], raw: Optional[Dict[str, float]] = None) -> DiagnosisResult:
+        # Map symptoms + telemetry to issue category
+        if "battery" in voice.symptoms or telem_features["battery_drop_norm"] > 0.6:
+            category = "Electrical/Battery"
+        elif "overheat" in voice.symptoms or telem_features["engine_temp_norm"] > 0.7:
+            category = "Cooling/Overheat"
+        elif "oil" in voice.symptoms or telem_features["oil_pressure_low_norm"] > 0.6:
+            category = "Lubrication/Oil Pressure"
+        elif "vibration" in voice.symptoms or telem_features["vibration_norm"] > 0.6:
+            category = "Drivetrain/Mechanical Vibration"
+        else:
+            category = "General Inspection"
         # Simple logistic-style risk model combining telemetry + voice severity
-        if self.model_obj is not None:
-            raw = {
-                "engine_temp_c": telem_features["engine_temp_norm"] * 50 + 70,
-                "battery_voltage": 12.5 - telem_features["battery_drop_norm"] * 3,
-                "oil_pressure_psi": 40 - telem_features["oil_pressure_low_norm"] * 40,
-                "vibration_g": telem_features["vibration_norm"] * 2,
-                "speed_kph": telem_features["speed_norm"] * 180,
-                "odometer_km": telem_features["odometer_norm"] * 200000,
-                "error_code_count": telem_features["error_code_count"],
-            }
-            from .model import predict_proba
-            risk = predict_proba(self.model_obj, raw)
+        model_obj = self.model_obj  # read once: the model may be hot-swapped mid-call
+        if model_obj is not None:
+            # raw: TelemetryAgent.raw_features(); the model was trained on raw units
+            if raw is None:
+                raw = self._denormalize(telem_features)
+            if isinstance(model_obj, ModelEnsemble):
+                # category models serve their own category; shadows are recorded off the request path
+                risk = model_obj.score_row(raw, category)
+            else:
+                risk = predict_proba(model_obj, raw)
         else:
             w = {
                 "engine_temp_norm": 0.6,
@@ -126,20 +201,49 @@ class DiagnosisAgent:
             )
             risk = 1 / (1 + math.exp(-3 * (linear - 0.6)))
             risk = max(0.0, min(1.0, risk))
-        # Map symptoms + telemetry to issue category
-        if "battery" in voice.symptoms or telem_features["battery_drop_norm"] > 0.6:
-            category = "Electrical/Battery"
-        elif "overheat" in voice.symptoms or telem_features["engine_temp_norm"] > 0.7:
-            category = "Cooling/Overheat"
-        elif "oil" in voice.symptoms or telem_features["oil_pressure_low_norm"] > 0.6:
-            category = "Lubrication/Oil Pressure"
-        elif "vibration" in voice.symptoms or telem_features["vibration_norm"] > 0.6:
-            category = "Drivetrain/Mechanical Vibration"
-        else:
-            category = "General Inspection"
         contrib = {**telem_features, "voice_severity": voice.severity}
         return DiagnosisResult(risk_score=round(risk, 3), issue_category=category, contributing_signals=contrib)
 
+    def process_batch(
+        self, symptoms: List[List[str]], severity: np.ndarray, feats: Dict[str, np.ndarray], raw: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        # Returns (unrounded risk, issue_category) arrays for N vehicles; raw is TelemetryAgent.raw_matrix()
+        has = lambda cat: np.fromiter((cat in s for s in symptoms), dtype=bool, count=len(symptoms))
+        category = np.select(
+            [
+                has("battery") | (feats["battery_drop_norm"] > 0.6),
+                has("overheat") | (feats["engine_temp_norm"] > 0.7),
+                has("oil") | (feats["oil_pressure_low_norm"] > 0.6),
+                has("vibration") | (feats["vibration_norm"] > 0.6),
+            ],
+            ["Electrical/Battery", "Cooling/Overheat", "Lubrication/Oil Pressure", "Drivetrain/Mechanical Vibration"],
+            default="General Inspection",
+        )
+        model_obj = self.model_obj
+        if model_obj is not None:
+            if raw is None:
+                raw = np.column_stack([self._denormalize(feats)[k] for k in FEATURES])
+            if isinstance(model_obj, ModelEnsemble):
+                risk = model_obj.score(raw, category)
+            else:
+                risk = predict_proba_batch(model_obj, raw)
+        else:
+            linear = (
+                0.6 * feats["engine_temp_norm"]
+                + 0.5 * feats["battery_drop_norm"]
+                + 0.4 * feats["oil_pressure_low_norm"]
+                + 0.3 * feats["vibration_norm"]
+                + 0.25 * (feats["error_code_count"] / 5.0)
+                + 0.2 * feats["odometer_norm"]
+                + 0.5 * severity
+            )
+            risk = np.clip(1 / (1 + np.exp(-3 * (linear - 0.6))), 0.0, 1.0)
+        return risk, category
+
+
+def _slot_iso(slot_ts: Optional[float]) -> str:
+    return "" if slot_ts is None else time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(slot_ts))
+
 
 class SchedulingAgent:
     CENTERS = [
@@ -149,30 +253,108 @@ class SchedulingAgent:
         {"id": "CHE-04", "name": "Chennai North", "lat": 13.0827, "lon": 80.2707},
     ]
 
+    def __init__(self, centers: Optional[List[Dict]] = None, allocator: Optional[SlotAllocator] = None):
+        # with an allocator, bookings respect bay capacity/opening hours and it owns the center catalog
+        self.allocator = allocator
+        if allocator is not None:
+            self.index = allocator.index
+        else:
+            self.index = CenterIndex(list(centers) if centers is not None else self.CENTERS)
+        self.centers = self.index.centers
+
+    @classmethod
+    def from_file(cls, path: str) -> "SchedulingAgent":
+        return cls(load_centers(path))
+
     @staticmethod
     def _dist_km(a: Tuple[float, float], b: Tuple[float, float]) -> float:
-        # rough planar approximation for small distances
-        return math.sqrt((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2) * 111
+        return haversine_km(a, b)
+
+    def nearest_centers(self, customer_loc: Tuple[float, float], k: int = 1) -> List[Tuple[Dict, float]]:
+        return self.index.nearest(customer_loc, k)
 
     def schedule(self, customer_loc: Tuple[float, float], diag: DiagnosisResult) -> ScheduleResult:
-        nearest = min(self.CENTERS, key=lambda c: self._dist_km(customer_loc, (c["lat"], c["lon"])))
         urgent = diag.risk_score >= 0.7 or diag.issue_category != "General Inspection"
         priority = "urgent" if urgent else "normal"
+        if self.allocator is not None:
+            b = self.allocator.book(customer_loc, priority)
+            return ScheduleResult(
+                center_name=b.center["name"],
+                center_id=b.center["id"],
+                eta_minutes=int(b.distance_km / 40 * 60),
+                slot_iso=_slot_iso(b.slot_ts),
+                priority=priority,
+            )
+        nearest, dist_km = self.index.nearest(customer_loc)[0]
         # simple slot: now + offset minutes
         offset = 60 if urgent else 3 * 24 * 60
-        eta = int(self._dist_km(customer_loc, (nearest["lat"], nearest["lon"])) / 40 * 60)  # assume 40km/h
+        eta = int(dist_km / 40 * 60)  # assume 40km/h
         slot_ts = time.time() + (offset * 60)
         slot_iso = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(slot_ts))
         return ScheduleResult(center_name=nearest["name"], center_id=nearest["id"], eta_minutes=eta, slot_iso=slot_iso, priority=priority)
 
+    def schedule_batch(self, lats: np.ndarray, lons: np.ndarray, risk: np.ndarray, categories: np.ndarray) -> Dict[str, np.ndarray]:
+        # risk must already be rounded the way DiagnosisResult.risk_score is
+        urgent = (risk >= 0.7) | (categories != "General Inspection")
+        if self.allocator is not None:
+            priority = np.where(urgent, "urgent", "normal")
+            bookings = self.allocator.allocate_batch(lats, lons, risk, priority.tolist())
+            return {
+                "center_id": np.array([b.center["id"] for b in bookings]),
+                "center_name": np.array([b.center["name"] for b in bookings]),
+                "eta_minutes": (np.array([b.distance_km for b in bookings]) / 40 * 60).astype(int),
+                "slot": np.array([_slot_iso(b.slot_ts) for b in bookings]),
+                "priority": priority,
+            }
+        idx, dist = self.index.nearest_batch(lats, lons)
+        idx = idx[:, 0]
+        eta = (dist[:, 0] / 40 * 60).astype(int)
+        now = time.time()
+        slots = [time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now + offset * 60)) for offset in (3 * 24 * 60, 60)]
+        return {
+            "center_id": self.index.ids[idx],
+            "center_name": self.index.names[idx],
+            "eta_minutes": eta,
+            "slot": np.where(urgent, slots[1], slots[0]),
+            "priority": np.where(urgent, "urgent", "normal"),
+        }
+
 
 class UEBAAgent:
-    def monitor(self, voice: VoiceSummary, diag: DiagnosisResult) -> List[str]:
+    def __init__(self, fleet=None):
+        # fleet: optional ueba.FleetUEBA adding fleet-level rate alerts to the per-request rules
+        self.fleet = fleet
+
+    def monitor(self, voice: VoiceSummary, diag: DiagnosisResult, location: Optional[Tuple[float, float]] = None) -> List[str]:
         alerts: List[str] = []
         if voice.intent != "service_request" and diag.risk_score > 0.8:
             alerts.append("High risk without explicit service intent")
         if voice.severity > 0.9 and diag.risk_score < 0.3:
             alerts.append("Mismatched high severity vs low model risk")
+        if self.fleet is not None and location is not None:
+            alerts += self.fleet.observe(voice.customer_id, location[0], location[1], diag.issue_category)
+        return alerts
+
+    def monitor_batch(
+        self,
+        intents: np.ndarray,
+        severity: np.ndarray,
+        risk: np.ndarray,
+        customer_ids: Optional[List[str]] = None,
+        lats: Optional[np.ndarray] = None,
+        lons: Optional[np.ndarray] = None,
+        categories: Optional[np.ndarray] = None,
+    ) -> List[List[str]]:
+        no_intent = (intents != "service_request") & (risk > 0.8)
+        mismatch = (severity > 0.9) & (risk < 0.3)
+        alerts: List[List[str]] = [[] for _ in range(len(risk))]
+        for i in np.flatnonzero(no_intent):
+            alerts[i].append("High risk without explicit service intent")
+        for i in np.flatnonzero(mismatch):
+            alerts[i].append("Mismatched high severity vs low model risk")
+        if self.fleet is not None and customer_ids is not None:
+            for row, extra in zip(alerts, self.fleet.observe_batch(customer_ids, lats, lons, categories)):
+                row += extra
         return alerts
 
 
@@ -183,9 +365,22 @@ class FeedbackAgent:
             "recommended_action": "pre-stock parts" if schedule.priority == "urgent" else "standard-prep",
         }
 
+    def generate_batch(self, categories: np.ndarray, priorities: np.ndarray) -> Dict[str, np.ndarray]:
+        investigate = np.isin(categories, ["Lubrication/Oil Pressure", "Cooling/Overheat"])
+        return {
+            "oem_quality_flag": np.where(investigate, "investigate", "monitor"),
+            "recommended_action": np.where(priorities == "urgent", "pre-stock parts", "standard-prep"),
+        }
+
 
 class DataAnalysisAgent:
+    def __init__(self, store=None):
+        # store: optional analytics.AnalyticsStore that every scored request is rolled into
+        self.store = store
+
     def aggregate(self, voice: VoiceSummary, diag: DiagnosisResult, schedule: ScheduleResult) -> Dict[str, object]:
+        if self.store is not None:
+            self.store.add(schedule.center_id, diag.issue_category, schedule.priority, diag.risk_score)
         return {
             "customer_id": voice.customer_id,
             "issue_category": diag.issue_category,
@@ -193,3 +388,7 @@ class DataAnalysisAgent:
             "priority": schedule.priority,
             "center_id": schedule.center_id,
         }
+
+    def aggregate_batch(self, center_ids: np.ndarray, categories: np.ndarray, priorities: np.ndarray, risk: np.ndarray) -> None:
+        if self.store is not None:
+            self.store.add_many(center_ids.tolist(), categories.tolist(), priorities.tolist(), risk)
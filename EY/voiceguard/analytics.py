@@ -0,0 +1,265 @@
+from itertools import compress
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import json
+import math
+import os
+import threading
+import time
+import numpy as np
+
+
+# the dimensions every event is keyed by, in key-tuple order
+GROUP_FIELDS = ("center_id", "issue_category", "priority")
+SNAPSHOT_VERSION = 1
+
+
+class AnalyticsStore:
+    # Time-bucketed rollups of scored requests behind DataAnalysisAgent.
+    # Every (center_id, issue_category, priority) key gets, per time bucket, a count and
+    # a risk sum (exact mean) plus a fixed-bin risk histogram (percentiles to within half
+    # a bin). Histograms are mergeable by addition, so any window or grouping is a sum of
+    # buckets; a running total over the whole retention answers full-range queries without
+    # touching the buckets. Ingest is O(1) per event; query cost depends on the number of
+    # keys and buckets, never on how many events were ingested.
+    #   bucket_s x slots   retention (default 15 min x 96 = 24 h); older events are dropped
+    # Events with a NaN or infinite risk are dropped as well, and counted in `dropped`.
+    #   bins               risk histogram resolution over [0, 1]
+    # Memory is (slots + 1) * keys * (bins + 2) * 8 bytes.
+    def __init__(self, bucket_s: float = 900.0, slots: int = 96, bins: int = 50, clock: Callable[[], float] = time.time):
+        if slots < 1 or bins < 1:
+            raise ValueError("slots and bins must be >= 1")
+        self.bucket_s, self.slots, self.bins = bucket_s, slots, bins
+        self.clock = clock
+        self.keys: List[Tuple[str, str, str]] = []
+        self._index: Dict[Tuple[str, str, str], int] = {}
+        cap = 16
+        self._hist = np.zeros((slots, cap, bins), dtype=np.int64)
+        self._sums = np.zeros((slots, cap))
+        self._total_hist = np.zeros((cap, bins), dtype=np.int64)
+        self._total_sums = np.zeros(cap)
+        # absolute bucket number each slot currently holds (-1: empty)
+        self._slot_bucket = np.full(slots, -1, dtype=np.int64)
+        self._bucket: Optional[int] = None
+        self.events = 0
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    # ---- ingest ----
+
+    def _key(self, key: Tuple[str, str, str]) -> int:
+        k = self._index.get(key)
+        if k is None:
+            k = self._index[key] = len(self.keys)
+            self.keys.append(key)
+            if k == self._total_sums.shape[0]:
+                self._grow(2 * k)
+        return k
+
+    def _grow(self, cap: int) -> None:
+        extra = cap - self._total_sums.shape[0]
+        self._hist = np.concatenate([self._hist, np.zeros((self.slots, extra, self.bins), dtype=np.int64)], axis=1)
+        self._sums = np.concatenate([self._sums, np.zeros((self.slots, extra))], axis=1)
+        self._total_hist = np.concatenate([self._total_hist, np.zeros((extra, self.bins), dtype=np.int64)])
+        self._total_sums = np.concatenate([self._total_sums, np.zeros(extra)])
+
+    def _slot(self, ts: float) -> Optional[int]:
+        # -> slot for ts, expiring every bucket that fell out of retention; None when ts is too old
+        b = int(ts // self.bucket_s)
+        cur = self._bucket
+        if cur is None or b > cur:
+            start = b - self.slots + 1 if cur is None else max(cur + 1, b - self.slots + 1)
+            for step in range(start, b + 1):
+                s = step % self.slots
+                if self._slot_bucket[s] >= 0:
+                    self._total_hist -= self._hist[s]
+                    self._total_sums -= self._sums[s]
+                    self._hist[s] = 0
+                    self._sums[s] = 0.0
+                self._slot_bucket[s] = step
+            self._bucket = b
+        elif b <= cur - self.slots:
+            return None
+        return b % self.slots
+
+    def add(self, center_id: str, issue_category: str, priority: str, risk: float, ts: Optional[float] = None) -> None:
+        ts = self.clock() if ts is None else ts
+        if not math.isfinite(risk):
+            with self._lock:
+                self.dropped += 1
+            return
+        b = min(max(int(risk * self.bins), 0), self.bins - 1)
+        with self._lock:
+            s = self._slot(ts)
+            if s is None:
+                self.dropped += 1
+                return
+            k = self._key((center_id, issue_category, priority))
+            self._hist[s, k, b] += 1
+            self._sums[s, k] += risk
+            self._total_hist[k, b] += 1
+            self._total_sums[k] += risk
+            self.events += 1
+
+    def add_many(self, center_ids: Sequence[str], categories: Sequence[str], priorities: Sequence[str], risk, ts: Optional[float] = None) -> None:
+        # one timestamp for the whole batch; same result as add() per row
+        ts = self.clock() if ts is None else ts
+        risk = np.asarray(risk, dtype=float)
+        finite = np.isfinite(risk)
+        bad = len(risk) - int(finite.sum())
+        if bad:
+            center_ids, categories, priorities = (list(compress(c, finite)) for c in (center_ids, categories, priorities))
+            risk = risk[finite]
+        bins = np.clip((risk * self.bins).astype(np.int64), 0, self.bins - 1)
+        with self._lock:
+            self.dropped += bad
+            s = self._slot(ts)
+            if s is None:
+                self.dropped += len(risk)
+                return
+            index = self._index
+            keys = []
+            for key in zip(center_ids, categories, priorities):
+                k = index.get(key)
+                keys.append(self._key(key) if k is None else k)
+            keys = np.array(keys, dtype=np.int64)
+            n_keys = len(self.keys)
+            hist = np.bincount(keys * self.bins + bins, minlength=n_keys * self.bins).reshape(n_keys, self.bins)
+            sums = np.bincount(keys, weights=risk, minlength=n_keys)
+            self._hist[s, :n_keys] += hist
+            self._sums[s, :n_keys] += sums
+            self._total_hist[:n_keys] += hist
+            self._total_sums[:n_keys] += sums
+            self.events += len(risk)
+
+    # ---- queries ----
+
+    def _window(self, window_s: Optional[float], now: float) -> Tuple[np.ndarray, np.ndarray, int]:
+        # (histograms, risk sums, key count) over the window ending at now, rounded up to
+        # whole buckets. Buckets that fell out of retention by `now` are expired first, so
+        # an idle store does not keep answering with its last, stale contents.
+        n_keys = len(self.keys)
+        if self._bucket is None:
+            return np.zeros((0, self.bins), dtype=np.int64), np.zeros(0), 0
+        self._slot(now)
+        last = int(now // self.bucket_s)
+        first = self._bucket - self.slots + 1 if window_s is None else last - int(np.ceil(window_s / self.bucket_s)) + 1
+        if first <= self._bucket - self.slots + 1 and last >= self._bucket:
+            return self._total_hist[:n_keys].copy(), self._total_sums[:n_keys].copy(), n_keys
+        live = (self._slot_bucket >= first) & (self._slot_bucket <= last)
+        return self._hist[live, :n_keys].sum(axis=0), self._sums[live, :n_keys].sum(axis=0), n_keys
+
+    def query(
+        self,
+        window_s: Optional[float] = None,
+        by: Sequence[str] = ("center_id", "issue_category"),
+        quantiles: Sequence[float] = (0.5, 0.9, 0.99),
+        now: Optional[float] = None,
+        **filters: str,
+    ) -> List[Dict[str, object]]:
+        # One row per group of `by` (a subset of GROUP_FIELDS) over the last window_s seconds
+        # (None: all retained): count, mean_risk and risk quantiles as p50/p90/...; keyword
+        # filters on GROUP_FIELDS restrict the keys, e.g. query(by=("priority",), center_id="BLR-01").
+        # now defaults to the store's clock.
+        now = self.clock() if now is None else now
+        fields = [GROUP_FIELDS.index(f) for f in by]
+        wanted = [(GROUP_FIELDS.index(f), v) for f, v in filters.items()]
+        with self._lock:
+            hist, sums, n_keys = self._window(window_s, now)
+            keys = self.keys[:n_keys]
+        groups: Dict[Tuple[str, ...], int] = {}
+        gid = np.full(n_keys, -1, dtype=np.int64)
+        for k, key in enumerate(keys):
+            if all(key[i] == v for i, v in wanted):
+                gid[k] = groups.setdefault(tuple(key[i] for i in fields), len(groups))
+        sel = gid >= 0
+        g_hist = np.zeros((len(groups), self.bins), dtype=np.int64)
+        np.add.at(g_hist, gid[sel], hist[sel])
+        g_sums = np.bincount(gid[sel], weights=sums[sel], minlength=len(groups))
+        counts = g_hist.sum(axis=1)
+        qs = {f"p{q * 100:g}": _quantiles(g_hist, counts, q) for q in quantiles}
+        rows = []
+        for (group, g), count, total in zip(groups.items(), counts.tolist(), g_sums.tolist()):
+            if not count:
+                continue
+            row: Dict[str, object] = dict(zip(by, group))
+            row["count"] = count
+            row["mean_risk"] = round(total / count, 4)
+            for name, values in qs.items():
+                row[name] = round(float(values[g]), 4)
+            rows.append(row)
+        rows.sort(key=lambda r: -r["count"])
+        return rows
+
+    def summary(self, window_s: Optional[float] = None, now: Optional[float] = None) -> Dict[str, object]:
+        rows = self.query(window_s, by=(), now=now)
+        return rows[0] if rows else {"count": 0}
+
+    def memory_bytes(self) -> int:
+        return self._hist.nbytes + self._sums.nbytes + self._total_hist.nbytes + self._total_sums.nbytes
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "events": self.events,
+            "dropped": self.dropped,
+            "keys": len(self.keys),
+            "retention_s": self.bucket_s * self.slots,
+            "memory_bytes": self.memory_bytes(),
+        }
+
+    # ---- persistence ----
+
+    def snapshot(self, path: str) -> None:
+        # uncompressed .npz, no pickled objects; written next to path and renamed into place
+        with self._lock:
+            n_keys = len(self.keys)
+            meta = {
+                "version": SNAPSHOT_VERSION,
+                "bucket_s": self.bucket_s,
+                "slots": self.slots,
+                "bins": self.bins,
+                "bucket": self._bucket,
+                "events": self.events,
+                "dropped": self.dropped,
+                "keys": self.keys,
+            }
+            arrays = {"hist": self._hist[:, :n_keys], "sums": self._sums[:, :n_keys], "slot_bucket": self._slot_bucket}
+            tmp = path + ".tmp"
+            with open(tmp, "wb") as f:
+                np.savez(f, meta=np.array(json.dumps(meta)), **arrays)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str, clock: Callable[[], float] = time.time) -> "AnalyticsStore":
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            if meta.get("version") != SNAPSHOT_VERSION:
+                raise ValueError(f"unsupported analytics snapshot version {meta.get('version')!r}")
+            store = cls(meta["bucket_s"], meta["slots"], meta["bins"], clock)
+            keys = [tuple(k) for k in meta["keys"]]
+            store._grow(max(16, len(keys)))
+            store.keys = keys
+            store._index = {k: i for i, k in enumerate(keys)}
+            n_keys = len(keys)
+            store._hist[:, :n_keys] = data["hist"]
+            store._sums[:, :n_keys] = data["sums"]
+            store._slot_bucket[:] = data["slot_bucket"]
+        live = store._slot_bucket >= 0
+        store._total_hist[:n_keys] = store._hist[live, :n_keys].sum(axis=0)
+        store._total_sums[:n_keys] = store._sums[live, :n_keys].sum(axis=0)
+        store._bucket = meta["bucket"]
+        store.events, store.dropped = meta["events"], meta["dropped"]
+        return store
+
+
+def _quantiles(hist: np.ndarray, counts: np.ndarray, q: float) -> np.ndarray:
+    # per row, linear interpolation inside the bin holding the q-th observation
+    if not len(hist):
+        return np.zeros(0)
+    bins = hist.shape[1]
+    cum = np.cumsum(hist, axis=1)
+    rank = q * counts
+    idx = np.minimum((cum < rank[:, None]).sum(axis=1), bins - 1)
+    rows = np.arange(len(hist))
+    below = np.where(idx > 0, cum[rows, np.maximum(idx - 1, 0)], 0)
+    inside = np.maximum(hist[rows, idx], 1)
+    return (idx + np.clip((rank - below) / inside, 0.0, 1.0)) / bins
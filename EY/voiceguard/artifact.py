@@ -0,0 +1,110 @@
+from typing import Dict, Optional, Tuple
+import hashlib
+import json
+import math
+import mmap
+import os
+import struct
+import numpy as np
+
+
+# .vgm model artifact, no pickle anywhere:
+#   MAGIC (8 bytes) | header length (uint32 LE) | JSON header, space-padded | payload
+# The payload starts on an ALIGN boundary and holds raw little-endian arrays, each
+# ALIGN-aligned at the offset the header gives. Readers mmap the file and hand out views,
+# so opening an artifact costs a header parse whatever the payload size, and any number of
+# versions can be open at once, sharing the OS page cache.
+MAGIC = b"VGMODEL\0"
+SCHEMA_VERSION = 1
+ALIGN = 64
+# payload dtypes a reader accepts; never object arrays
+DTYPES = ("<f8", "<f4", "<i8", "<i4")
+_PREFIX = struct.Struct("<8sI")
+
+
+def _align(n: int) -> int:
+    return -(-n // ALIGN) * ALIGN
+
+
+def write_artifact(path: str, arrays: Dict[str, np.ndarray], header: Dict) -> Dict:
+    # header: JSON-serializable fields (features, metadata, ...); "schema_version",
+    # "arrays" and "payload_sha256" are filled in here. Written to path + ".tmp" and
+    # renamed into place, so a watching ModelRegistry never sees a partial file.
+    layout, chunks, offset = {}, [], 0
+    for name, arr in arrays.items():
+        arr = np.ascontiguousarray(arr)
+        dtype = arr.dtype.newbyteorder("<") if arr.dtype.byteorder == ">" else arr.dtype
+        if dtype.str not in DTYPES:
+            raise ValueError(f"array {name!r}: dtype {arr.dtype} is not one of {DTYPES}")
+        data = arr.astype(dtype, copy=False).tobytes()
+        layout[name] = {"offset": offset, "shape": list(arr.shape), "dtype": dtype.str}
+        chunks.append(data + b"\0" * (_align(len(data)) - len(data)))
+        offset += len(chunks[-1])
+    payload = b"".join(chunks)
+    header = {**header, "schema_version": SCHEMA_VERSION, "arrays": layout, "payload_sha256": hashlib.sha256(payload).hexdigest()}
+    text = json.dumps(header, sort_keys=True).encode("utf-8")
+    start = _align(_PREFIX.size + len(text))
+    text += b" " * (start - _PREFIX.size - len(text))
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_PREFIX.pack(MAGIC, len(text)))
+        f.write(text)
+        f.write(payload)
+    os.replace(tmp, path)
+    return header
+
+
+def _parse(buf, size: int, path: str) -> Tuple[Dict, int]:
+    # buf: the first bytes of the file (at least the header); validates framing and layout
+    if size < _PREFIX.size:
+        raise ValueError(f"{path}: not a .vgm model artifact")
+    magic, length = _PREFIX.unpack_from(buf)
+    if magic != MAGIC:
+        raise ValueError(f"{path}: not a .vgm model artifact")
+    if _PREFIX.size + length > size:
+        raise ValueError(f"{path}: truncated header")
+    header = json.loads(bytes(buf[_PREFIX.size:_PREFIX.size + length]))
+    if header.get("schema_version") != SCHEMA_VERSION:
+        raise ValueError(f"{path}: unsupported schema version {header.get('schema_version')!r} (expected {SCHEMA_VERSION})")
+    start = _align(_PREFIX.size + length)
+    for name, spec in header["arrays"].items():
+        if spec["dtype"] not in DTYPES:
+            raise ValueError(f"{path}: array {name!r} has unsupported dtype {spec['dtype']!r}")
+        nbytes = math.prod(spec["shape"]) * int(spec["dtype"][2:])
+        if spec["offset"] % ALIGN or start + spec["offset"] + nbytes > size:
+            raise ValueError(f"{path}: array {name!r} lies outside the payload")
+    return header, start
+
+
+def read_header(path: str) -> Tuple[Dict, int]:
+    # -> (header, payload start) without mapping the payload
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        prefix = f.read(_PREFIX.size)
+        if len(prefix) == _PREFIX.size and prefix[:8] == MAGIC:
+            prefix += f.read(_PREFIX.unpack(prefix)[1])
+        return _parse(prefix, size, path)
+
+
+def read_artifact(path: str, verify: bool = True) -> Tuple[Dict, Dict[str, np.ndarray]]:
+    # -> (header, read-only arrays viewing one mmap of the file); verify checks the
+    # payload checksum, which reads every payload page once
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            raise ValueError(f"{path}: not a .vgm model artifact")
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    header, start = _parse(buf, size, path)
+    if verify and hashlib.sha256(memoryview(buf)[start:]).hexdigest() != header.get("payload_sha256"):
+        raise ValueError(f"{path}: payload checksum mismatch")
+    arrays = {}
+    for name, spec in header["arrays"].items():
+        count = math.prod(spec["shape"])
+        arrays[name] = np.frombuffer(buf, spec["dtype"], count, start + spec["offset"]).reshape(spec["shape"])
+    return header, arrays
+
+
+def artifact_version(header: Dict) -> str:
+    # explicit metadata.version, else the first 12 hex digits of the payload checksum
+    meta: Optional[Dict] = header.get("metadata")
+    return str((meta or {}).get("version") or header["payload_sha256"][:12])
@@ -0,0 +1,123 @@
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Tuple
+import hashlib
+import math
+import threading
+import time
+
+
+# bucket width per raw telemetry field; readings in the same bucket share a diagnosis
+DEFAULT_QUANTIZATION = {
+    "engine_temp_c": 0.5,
+    "battery_voltage": 0.05,
+    "oil_pressure_psi": 0.5,
+    "vibration_g": 0.02,
+    "speed_kph": 5.0,
+    "odometer_km": 500.0,
+}
+
+_MISSING = object()
+
+
+class LRUCache:
+    # Thread-safe LRU with optional TTL and hit/miss/eviction counters
+    def __init__(self, maxsize: int = 4096, ttl: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        if ttl is not None and not ttl > 0:
+            raise ValueError("ttl must be > 0 seconds (or None for no expiry)")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self._data: "OrderedDict[Hashable, Tuple[float, object]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default=None):
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING:
+                self.misses += 1
+                return default
+            stored_at, value = item
+            if self.ttl is not None and self.clock() - stored_at > self.ttl:
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value) -> None:
+        with self._lock:
+            self._data[key] = (self.clock(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+class PipelineCache:
+    # Memoizes the two pure, expensive stages of VoiceGuardPipeline.run:
+    #   voice      transcript hash -> (symptoms, severity, intent)
+    #   diagnosis  (quantized telemetry, error-code count, voice symptoms/severity) -> features + diagnosis
+    # Scheduling is never cached: its slot depends on the current time.
+    def __init__(
+        self,
+        voice_size: int = 4096,
+        diagnosis_size: int = 65536,
+        ttl: Optional[float] = 300.0,
+        quantization: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.quantization = {**DEFAULT_QUANTIZATION, **(quantization or {})}
+        for k, q in self.quantization.items():
+            if k not in DEFAULT_QUANTIZATION:
+                raise ValueError(f"unknown telemetry field {k!r} in quantization; expected {list(DEFAULT_QUANTIZATION)}")
+            if not (isinstance(q, (int, float)) and math.isfinite(q) and q > 0):
+                raise ValueError(f"quantization for {k!r} must be a positive number, got {q!r}")
+        self._quant = tuple(self.quantization.items())
+        self.voice = LRUCache(voice_size, ttl, clock)
+        self.diagnosis = LRUCache(diagnosis_size, ttl, clock)
+
+    @staticmethod
+    def voice_key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+    def telemetry_key(self, telemetry) -> Optional[Tuple]:
+        # telemetry: agents.Telemetry. None for a NaN/inf reading (round() refuses those):
+        # such a request is scored fresh and never cached
+        try:
+            return tuple(round(getattr(telemetry, k) / q) for k, q in self._quant) + (len(telemetry.error_codes),)
+        except (ValueError, OverflowError):
+            return None
+
+    def clear(self) -> None:
+        self.voice.clear()
+        self.diagnosis.clear()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {"voice": self.voice.stats(), "diagnosis": self.diagnosis.stats()}
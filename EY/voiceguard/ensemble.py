@@ -0,0 +1,268 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+import math
+import threading
+import numpy as np
+from .inference import FEATURES, compile_model
+
+
+# short names for the issue categories DiagnosisAgent assigns
+CATEGORY_ALIASES = {
+    "battery": "Electrical/Battery",
+    "cooling": "Cooling/Overheat",
+    "lubrication": "Lubrication/Oil Pressure",
+    "vibration": "Drivetrain/Mechanical Vibration",
+    "general": "General Inspection",
+}
+ROLES = ("production", "shadow")
+
+
+class _Layout:
+    # Immutable scoring plan: every model's folded weights as one (features x models)
+    # matrix. Rebuilt on register/remove and swapped in by reference, so a request that
+    # already holds a layout finishes on it.
+    __slots__ = ("names", "W", "b", "default", "serving", "shadows")
+
+    def __init__(self, entries: List[Tuple[str, object, str, Optional[str]]]):
+        self.names = [name for name, _, _, _ in entries]
+        scorers = [scorer for _, scorer, _, _ in entries]
+        self.W = np.column_stack([s.weights for s in scorers])
+        self.b = np.array([s.bias for s in scorers])
+        # category -> column of its production model (None: the default); shadows are
+        # (column, category or None). register() appends, so any column can be production.
+        self.serving: Dict[Optional[str], int] = {}
+        self.shadows: List[Tuple[int, Optional[str]]] = []
+        for col, (_, _, role, category) in enumerate(entries):
+            if role == "production":
+                self.serving[category] = col
+            else:
+                self.shadows.append((col, category))
+        self.default = self.serving[None]
+
+
+def _logistic(z: np.ndarray) -> np.ndarray:
+    # numerically stable for both tails, as CompiledScorer.score
+    out = np.empty_like(z)
+    pos = z >= 0
+    out[pos] = 1.0 / (1.0 + np.exp(-z[pos]))
+    e = np.exp(z[~pos])
+    out[~pos] = e / (1.0 + e)
+    return out
+
+
+class _ShadowStats:
+    __slots__ = ("n", "abs_sum", "diff_sum", "max_abs", "flips")
+
+    def __init__(self):
+        self.n = 0
+        self.abs_sum = self.diff_sum = self.max_abs = 0.0
+        self.flips = 0
+
+
+class ModelEnsemble:
+    # Several linear models behind DiagnosisAgent, scored in one vectorized pass over the
+    # same raw feature matrix: Z = X @ W + b, a single (n x 7) @ (7 x models) product, so
+    # each extra model adds one column rather than another pass over the rows.
+    #   production   the model whose score is served
+    #   register(name, model, role="production", category=...)  serves that category's rows
+    #   register(name, model)                                    shadow: scored, never served
+    # Shadow logits are only appended to a pending list on the request path (as
+    # PipelineMetrics does with timings), under a lock of their own that is held for the
+    # append and never across a fold; start() folds them into disagreement stats on a
+    # background thread, shadow_stats() folds whatever is left. Past max_pending logits
+    # (rows x models) awaiting a fold, further rows are dropped (counted in `dropped`) rather
+    # than queued; the default bounds the backlog at 32 MB.
+    def __init__(self, production, name: Optional[str] = None, threshold: float = 0.5, interval: float = 0.5, max_pending: int = 1 << 22):
+        self.threshold = threshold
+        self.interval = interval
+        self.max_pending = max_pending
+        self._entries: List[Tuple[str, object, str, Optional[str]]] = []
+        self._layout: Optional[_Layout] = None
+        # bumped on every layout rebuild; caches key on it (ids of freed layouts get reused)
+        self.version = 0
+        self._pending: List[Tuple[_Layout, np.ndarray, np.ndarray, Optional[np.ndarray]]] = []
+        self._pending_size = 0
+        self.dropped = 0
+        # guards _pending, _pending_size and dropped; _lock guards the layout and the stats
+        self._pending_lock = threading.Lock()
+        self._stats: Dict[str, _ShadowStats] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.register(name or _name(production, "production"), production, role="production")
+
+    # ---- registry ----
+
+    def register(self, name: str, model_obj, role: str = "shadow", category: Optional[str] = None) -> None:
+        # model_obj: anything load_model returns (.vgm, or a pickle with or without compiled=True)
+        if role not in ROLES:
+            raise ValueError(f"role must be one of {ROLES}")
+        scorer = model_obj.get("scorer") or compile_model(model_obj)
+        if list(scorer.features) != FEATURES:
+            raise ValueError(f"model {name!r}: features {scorer.features} do not match {FEATURES}")
+        category = CATEGORY_ALIASES.get(category, category)
+        with self._lock:
+            entries = [e for e in self._entries if e[0] != name]
+            if role == "production":
+                entries = [e for e in entries if not (e[2] == "production" and e[3] == category)]
+            entries.append((name, scorer, role, category))
+            if not any(role == "production" and cat is None for _, _, role, cat in entries):
+                raise ValueError("the ensemble needs a production model without a category")
+            self._set_layout(entries)
+
+    def remove(self, name: str) -> None:
+        with self._lock:
+            entries = [e for e in self._entries if e[0] != name]
+            if not any(role == "production" and cat is None for _, _, role, cat in entries):
+                raise ValueError("cannot remove the default production model")
+            self._set_layout(entries)
+
+    def _set_layout(self, entries) -> None:
+        # caller holds the lock. The layout is replaced before the version moves: a reader
+        # that sees the new version (and only then reads the layout) scores on the new one
+        self._entries = entries
+        self._layout = _Layout(entries)
+        self.version += 1
+
+    def set_production(self, model_obj) -> None:
+        # ModelRegistry.subscribe target: swaps the default production model, keeps the rest
+        self.register(_name(model_obj, "production"), model_obj, role="production")
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._layout.names)
+
+    @property
+    def layout(self) -> _Layout:
+        # replaced, never mutated, on every register/remove
+        return self._layout
+
+    # ---- scoring ----
+
+    def score_all(self, X: np.ndarray) -> Tuple[List[str], np.ndarray]:
+        # -> (model names, (n x models) probabilities); no routing, nothing recorded
+        layout = self._layout
+        X = np.asarray(X, dtype=float).reshape(-1, len(FEATURES))
+        return list(layout.names), _logistic(X @ layout.W + layout.b)
+
+    def score(self, X: np.ndarray, categories: Optional[Sequence[str]] = None) -> np.ndarray:
+        # production risk per row (category models where registered); shadows are recorded.
+        # Only the served column goes through the logistic here: shadows are kept as logits
+        # and converted by the fold, so the request pays for one matmul whatever the model count.
+        layout = self._layout
+        X = np.asarray(X, dtype=float).reshape(-1, len(FEATURES))
+        Z = X @ layout.W + layout.b
+        z = Z[:, layout.default]
+        if categories is not None and len(layout.serving) > 1:
+            categories = np.asarray(categories)
+            cols = np.full(len(Z), layout.default)
+            for category, col in layout.serving.items():
+                if category is not None:
+                    cols[categories == category] = col
+            z = Z[np.arange(len(Z)), cols]
+        served = _logistic(z)
+        if layout.shadows:
+            self._record(layout, Z, served, categories)
+        return served
+
+    def score_row(self, row: Dict[str, float], category: Optional[str] = None) -> float:
+        # single request: same models and routing as score(), without the per-call array
+        # bookkeeping (one small matmul, a scalar logistic)
+        layout = self._layout
+        z = np.array([row[k] for k in FEATURES]) @ layout.W + layout.b
+        logit = float(z[layout.serving.get(category, layout.default)])
+        if logit >= 0:
+            served = 1.0 / (1.0 + math.exp(-logit))
+        else:
+            e = math.exp(logit)
+            served = e / (1.0 + e)
+        if layout.shadows:
+            self._record(layout, z, served, category)
+        return served
+
+    def _record(self, layout: _Layout, Z, served, categories) -> None:
+        # Z, served, categories: arrays from score(), or one row's logits, float and category
+        # from score_row(); the fold normalizes both shapes
+        with self._pending_lock:
+            if self._pending_size >= self.max_pending:
+                self.dropped += served.shape[0] if isinstance(served, np.ndarray) else 1
+                return
+            self._pending.append((layout, Z, served, categories))
+            self._pending_size += Z.size
+
+    # ---- shadow statistics ----
+
+    def _fold(self) -> None:
+        with self._lock:
+            with self._pending_lock:
+                pending, self._pending = self._pending, []
+                self._pending_size = 0
+            t = self.threshold
+            for layout, Z, served, categories in pending:
+                Z = Z.reshape(-1, len(layout.names))
+                served = np.atleast_1d(served)
+                if categories is not None:
+                    categories = np.atleast_1d(np.asarray(categories))
+                for col, category in layout.shadows:
+                    shadow, prod = Z[:, col], served
+                    if category is not None:
+                        if categories is None:
+                            continue
+                        rows = categories == category
+                        shadow, prod = shadow[rows], prod[rows]
+                    if not len(shadow):
+                        continue
+                    shadow = _logistic(shadow)
+                    diff = shadow - prod
+                    stats = self._stats.setdefault(layout.names[col], _ShadowStats())
+                    stats.n += len(diff)
+                    stats.abs_sum += float(np.abs(diff).sum())
+                    stats.diff_sum += float(diff.sum())
+                    stats.max_abs = max(stats.max_abs, float(np.abs(diff).max()))
+                    stats.flips += int(((shadow >= t) != (prod >= t)).sum())
+
+    def shadow_stats(self) -> Dict[str, Dict[str, float]]:
+        # per shadow model, against the score actually served for the same rows:
+        # rows compared, mean/max |difference|, mean difference (shadow - served) and the
+        # share of rows whose decision at `threshold` would flip
+        self._fold()
+        with self._lock:
+            return {
+                name: {
+                    "rows": s.n,
+                    "mean_abs_diff": s.abs_sum / s.n,
+                    "max_abs_diff": s.max_abs,
+                    "mean_diff": s.diff_sum / s.n,
+                    "flip_rate": s.flips / s.n,
+                }
+                for name, s in self._stats.items()
+                if s.n
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            with self._pending_lock:
+                self._pending, self._pending_size = [], 0
+                self.dropped = 0
+            self._stats.clear()
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._fold()
+
+    def start(self) -> "ModelEnsemble":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="voiceguard-shadow", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._fold()
+
+
+def _name(model_obj, default: str) -> str:
+    return str(model_obj.get("version") or default)
@@ -0,0 +1,162 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+import io
+import json
+import re
+import time
+import pandas as pd
+from .inference import load_model
+from .pipeline import DEFAULT_LOCATION, build_pipeline
+
+
+CHUNK_ROWS = 5000
+ID_COLUMNS = ("vehicle_id", "customer_id", "id")
+_CODE_SPLIT = re.compile(r"[;|,\s]+")
+
+# set once per worker process by _init_worker
+_PIPELINE = None
+
+
+def detect_format(path: str) -> str:
+    return "ndjson" if path.lower().endswith((".ndjson", ".jsonl", ".json")) else "csv"
+
+
+def iter_chunks(path: str, chunk_rows: int = CHUNK_ROWS, fmt: Optional[str] = None) -> Iterator[Tuple[str, Optional[str], List[str], int]]:
+    # Yields (format, csv header, raw lines, index of the first row). Lines are shipped to
+    # workers unparsed, so parsing is parallel too; assumes one record per line.
+    fmt = fmt or detect_format(path)
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        header = f.readline() if fmt == "csv" else None
+        first = 0
+        while True:
+            lines = list(islice(f, chunk_rows))
+            if not lines:
+                return
+            yield fmt, header, lines, first
+            first += len(lines)
+
+
+def parse_chunk(fmt: str, header: Optional[str], lines: List[str], first_row: int, strict: bool = False):
+    # -> (voice_texts, telemetry, customers, skipped) in the shapes VoiceGuardPipeline.run_batch
+    # accepts. Blank lines are ignored; malformed ones are skipped and counted, as
+    # stream.read_ndjson does, unless strict=True (then ValueError). ROW-<n> ids count lines.
+    if fmt == "csv":
+        blank = sum(1 for line in lines if not line.strip())
+        try:
+            df = pd.read_csv(io.StringIO(header + "".join(lines)), on_bad_lines="error" if strict else "skip")
+        except pd.errors.ParserError as e:
+            raise ValueError(f"rows {first_row + 1}-{first_row + len(lines)}: {e}") from None
+        n = len(df)
+        skipped = len(lines) - blank - n
+        if "error_code_count" not in df.columns and "error_codes" in df.columns:
+            df["error_code_count"] = [len([c for c in _CODE_SPLIT.split(str(v)) if c]) if isinstance(v, str) else 0 for v in df["error_codes"]]
+            df = df.drop(columns="error_codes")
+        id_col = next((c for c in ID_COLUMNS if c in df.columns), None)
+        customers = pd.DataFrame({"id": df[id_col].astype(str) if id_col else [f"ROW-{first_row + i}" for i in range(n)]})
+        if "lat" in df.columns and "lon" in df.columns:
+            customers["lat"], customers["lon"] = df["lat"].to_numpy(dtype=float), df["lon"].to_numpy(dtype=float)
+        texts = df["voice_text"].fillna("").astype(str).tolist() if "voice_text" in df.columns else [""] * n
+        return texts, df, customers, skipped
+    texts, telemetry, customers = [], [], []
+    skipped = 0
+    for i, line in enumerate(lines):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            rec = json.loads(line)
+        except json.JSONDecodeError as e:
+            rec = e
+        if not isinstance(rec, dict):
+            if strict:
+                raise ValueError(f"line {first_row + i + 1}: expected a JSON object ({rec})")
+            skipped += 1
+            continue
+        cust = rec.get("customer") or {}
+        texts.append(rec.get("voice_text", ""))
+        telemetry.append(rec)
+        customers.append({
+            "id": str(cust.get("id") or rec.get("vehicle_id") or f"ROW-{first_row + i}"),
+            "location": cust.get("location", rec.get("location", DEFAULT_LOCATION)),
+        })
+    return texts, telemetry, customers, skipped
+
+
+def _init_worker(model_path: Optional[str], centers=None) -> None:
+    # pool initializer: unpickle the model once per process, not once per task
+    global _PIPELINE
+    model_obj = load_model(model_path, compiled=True) if model_path and Path(model_path).exists() else None
+    _PIPELINE = build_pipeline(model_obj=model_obj, centers=centers)
+
+
+def _score_chunk(task) -> Tuple[int, str, int]:
+    # runs in a worker: parse, score columnar, and serialize there so the parent only writes
+    texts, telemetry, customers, skipped = parse_chunk(*task)
+    results = _PIPELINE.run_batch(texts, telemetry, customers) if texts else []
+    return len(results), "".join(json.dumps(r) + "\n" for r in results), skipped
+
+
+def max_rss_kb() -> Dict[str, float]:
+    # peak resident set of this process and of its largest reaped child (Linux reports KiB)
+    try:
+        import resource
+    except ImportError:  # Windows
+        return {}
+    return {
+        "parent_max_rss_kb": float(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss),
+        "worker_max_rss_kb": float(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss),
+    }
+
+
+def score_file(
+    path: str,
+    out,
+    workers: int = 0,
+    chunk_rows: int = CHUNK_ROWS,
+    max_pending: Optional[int] = None,
+    model_path: Optional[str] = "models/lg.vgm",
+    centers=None,
+    fmt: Optional[str] = None,
+    strict: bool = False,
+) -> Dict:
+    # Scores a CSV/NDJSON fleet dump chunk by chunk and writes NDJSON results to `out` in
+    # input order. workers=0 scores in this process. At most `max_pending` chunks (default
+    # 2 per worker) are in flight, so memory stays flat however large the input is.
+    # Malformed records are skipped and reported as "skipped"; strict=True raises instead.
+    t0 = time.perf_counter()
+    rows = chunks = skipped = 0
+    tasks = ((*task, strict) for task in iter_chunks(path, chunk_rows, fmt))
+    if workers <= 0:
+        _init_worker(model_path, centers)
+        for task in tasks:
+            n, text, bad = _score_chunk(task)
+            out.write(text)
+            rows, chunks, skipped = rows + n, chunks + 1, skipped + bad
+    else:
+        max_pending = max_pending or 2 * workers
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(model_path, centers)) as pool:
+            pending = deque()
+            for task in tasks:
+                if len(pending) >= max_pending:
+                    n, text, bad = pending.popleft().result()
+                    out.write(text)
+                    rows, chunks, skipped = rows + n, chunks + 1, skipped + bad
+                pending.append(pool.submit(_score_chunk, task))
+            while pending:
+                n, text, bad = pending.popleft().result()
+                out.write(text)
+                rows, chunks, skipped = rows + n, chunks + 1, skipped + bad
+    out.flush()
+    seconds = time.perf_counter() - t0
+    return {
+        "rows": rows,
+        "skipped": skipped,
+        "chunks": chunks,
+        "workers": workers,
+        "seconds": seconds,
+        "rows_per_s": rows / seconds if seconds > 0 else 0.0,
+        **max_rss_kb(),
+    }
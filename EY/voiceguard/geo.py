@@ -0,0 +1,118 @@
+from typing import Dict, List, Sequence, Tuple
+import csv
+import json
+import math
+import numpy as np
+
+
+EARTH_RADIUS_KM = 6371.0088
+# below this many centers a vectorized brute-force scan beats building/querying a tree
+BRUTE_FORCE_MAX = 64
+
+
+def _kdtree(points: np.ndarray):
+    # scipy.spatial costs ~0.3 s to import, so only catalogs big enough for a tree pay it;
+    # scipy ships with scikit-learn, but the index stays usable (brute force) without it
+    try:
+        from scipy.spatial import cKDTree
+    except ImportError:
+        return None
+    return cKDTree(points)
+
+
+def haversine_km(a: Tuple[float, float], b: Tuple[float, float]) -> float:
+    lat1, lon1, lat2, lon2 = map(math.radians, (a[0], a[1], b[0], b[1]))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(h)))
+
+
+def haversine_km_array(lat1, lon1, lat2, lon2) -> np.ndarray:
+    # broadcasting haversine over numpy arrays (degrees in, km out)
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=float)) for v in (lat1, lon1, lat2, lon2))
+    h = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(1.0, np.sqrt(h)))
+
+
+def _unit_vectors(lat, lon) -> np.ndarray:
+    lat = np.radians(np.asarray(lat, dtype=float))
+    lon = np.radians(np.asarray(lon, dtype=float))
+    return np.stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)], axis=-1)
+
+
+def load_centers(path: str) -> List[Dict]:
+    # JSON: [{"id", "name", "lat", "lon", ...}, ...]  CSV: header with at least id,name,lat,lon
+    if path.lower().endswith(".json"):
+        with open(path, "r", encoding="utf-8") as f:
+            rows = json.load(f)
+    else:
+        with open(path, "r", newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+    centers = []
+    for r in rows:
+        c = dict(r)
+        c["lat"], c["lon"] = float(r["lat"]), float(r["lon"])
+        centers.append(c)
+    if not centers:
+        raise ValueError(f"no service centers in {path}")
+    return centers
+
+
+class CenterIndex:
+    # Nearest-center lookups by great-circle distance. Centers are stored as 3-D unit
+    # vectors: chord length is monotonic in great-circle distance, so a Euclidean
+    # k-d tree over them returns exact haversine neighbours.
+    def __init__(self, centers: Sequence[Dict]):
+        if not centers:
+            raise ValueError("CenterIndex needs at least one center")
+        self.centers = list(centers)
+        self.lat = np.array([c["lat"] for c in self.centers], dtype=float)
+        self.lon = np.array([c["lon"] for c in self.centers], dtype=float)
+        self.ids = np.array([c["id"] for c in self.centers])
+        self.names = np.array([c["name"] for c in self.centers])
+        self._xyz = _unit_vectors(self.lat, self.lon)
+        self._tree = _kdtree(self._xyz) if len(self.centers) > BRUTE_FORCE_MAX else None
+
+    def __len__(self) -> int:
+        return len(self.centers)
+
+    def nearest_batch(self, lats, lons, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        # Returns (indices, distances_km), each shaped (n, k), nearest first
+        k = min(k, len(self.centers))
+        q = _unit_vectors(lats, lons).reshape(-1, 3)
+        if self._tree is not None:
+            chord, idx = self._tree.query(q, k=k)
+            idx = np.asarray(idx).reshape(len(q), k)
+            chord = np.asarray(chord).reshape(len(q), k)
+            return idx, 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(1.0, chord / 2))
+        lats = np.reshape(np.asarray(lats, dtype=float), (-1, 1))
+        lons = np.reshape(np.asarray(lons, dtype=float), (-1, 1))
+        # chunk queries so the (queries x centers) distance matrix stays ~16 MB
+        step = max(1, 2_000_000 // len(self.centers))
+        idx_out = np.empty((len(q), k), dtype=np.intp)
+        dist_out = np.empty((len(q), k))
+        for lo in range(0, len(q), step):
+            dist = haversine_km_array(lats[lo:lo + step], lons[lo:lo + step], self.lat, self.lon)
+            if k == 1:
+                idx = dist.argmin(axis=1)[:, None]
+            else:
+                idx = np.argsort(dist, axis=1, kind="stable")[:, :k]
+            idx_out[lo:lo + step] = idx
+            dist_out[lo:lo + step] = np.take_along_axis(dist, idx, axis=1)
+        return idx_out, dist_out
+
+    def nearest_indices(self, loc: Tuple[float, float], k: int = 1) -> List[Tuple[int, float]]:
+        # [(center position, distance_km)], nearest first
+        if self._tree is None:
+            # scalar path: a handful of haversines in plain floats beats numpy call overhead
+            scored = ((haversine_km(loc, (c["lat"], c["lon"])), i) for i, c in enumerate(self.centers))
+            scored = [min(scored)] if k == 1 else sorted(scored)
+            return [(i, d) for d, i in scored[:k]]
+        k = min(k, len(self.centers))
+        lat, lon = math.radians(loc[0]), math.radians(loc[1])
+        chord, idx = self._tree.query((math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat)), k=k)
+        if k == 1:
+            chord, idx = [chord], [idx]
+        return [(int(i), 2 * EARTH_RADIUS_KM * math.asin(min(1.0, c / 2))) for c, i in zip(chord, idx)]
+
+    def nearest(self, loc: Tuple[float, float], k: int = 1) -> List[Tuple[Dict, float]]:
+        return [(self.centers[i], d) for i, d in self.nearest_indices(loc, k)]
@@ -0,0 +1,144 @@
+from typing import Dict, Optional
+import math
+import os
+import numpy as np
+from .artifact import artifact_version, read_artifact, write_artifact
+
+
+FEATURES = [
+    "engine_temp_c",
+    "battery_voltage",
+    "oil_pressure_psi",
+    "vibration_g",
+    "speed_kph",
+    "odometer_km",
+    "error_code_count",
+]
+
+
+class CompiledScorer:
+    # StandardScaler + binary LogisticRegression folded into one affine map:
+    # z = ((x - mean) / scale) . coef + b  ==  x . weights + bias
+    __slots__ = ("features", "weights", "bias", "_wt")
+
+    def __init__(self, weights: np.ndarray, bias: float, features=FEATURES):
+        self.features = list(features)
+        self.weights = np.asarray(weights, dtype=float).reshape(len(self.features))
+        self.bias = float(bias)
+        self._wt = tuple(zip(self.features, self.weights.tolist()))
+
+    @classmethod
+    def from_sklearn(cls, scaler, clf, features=FEATURES) -> "CompiledScorer":
+        coef = np.asarray(clf.coef_, dtype=float).reshape(-1)
+        mean = scaler.mean_ if getattr(scaler, "with_mean", True) and scaler.mean_ is not None else np.zeros_like(coef)
+        scale = scaler.scale_ if getattr(scaler, "with_std", True) and scaler.scale_ is not None else np.ones_like(coef)
+        weights = coef / scale
+        bias = float(np.asarray(clf.intercept_, dtype=float).reshape(-1)[0] - np.dot(mean, weights))
+        return cls(weights, bias, features)
+
+    def score_row(self, row: dict) -> float:
+        # plain-float dot product: for 7 features this beats any numpy call
+        z = self.bias
+        for k, w in self._wt:
+            z += w * row[k]
+        if z >= 0:
+            return 1.0 / (1.0 + math.exp(-z))
+        e = math.exp(z)
+        return e / (1.0 + e)
+
+    def score(self, X: np.ndarray) -> np.ndarray:
+        z = np.asarray(X, dtype=float).reshape(-1, len(self.features)) @ self.weights + self.bias
+        # numerically stable logistic for both tails
+        out = np.empty_like(z)
+        pos = z >= 0
+        out[pos] = 1.0 / (1.0 + np.exp(-z[pos]))
+        e = np.exp(z[~pos])
+        out[~pos] = e / (1.0 + e)
+        return out
+
+
+def compile_model(model_obj) -> CompiledScorer:
+    return CompiledScorer.from_sklearn(model_obj["scaler"], model_obj["model"], model_obj.get("features", FEATURES))
+
+
+def artifact_path(path: str) -> str:
+    # models/lg.pkl -> models/lg.vgm
+    return os.path.splitext(path)[0] + ".vgm"
+
+
+def save_model(model_obj, path: str, metadata: Optional[Dict] = None) -> Dict:
+    # Writes the .vgm artifact (see artifact.py): the folded scorer plus, for sklearn
+    # models, the raw scaler and coefficient arrays. Returns the header.
+    scorer = model_obj.get("scorer") or compile_model(model_obj)
+    arrays = {"weights": scorer.weights, "bias": np.array([scorer.bias])}
+    if "model" in model_obj:
+        scaler, clf = model_obj["scaler"], model_obj["model"]
+        arrays.update(
+            mean=np.asarray(scaler.mean_, dtype=float),
+            scale=np.asarray(scaler.scale_, dtype=float),
+            coef=np.asarray(clf.coef_, dtype=float).reshape(-1),
+            intercept=np.asarray(clf.intercept_, dtype=float).reshape(-1),
+        )
+    header = {"kind": "logistic", "features": list(scorer.features), "metadata": dict(metadata or {})}
+    return write_artifact(path, arrays, header)
+
+
+def load_artifact(path: str, verify: bool = True) -> Dict:
+    # -> {"scorer", "features", "version", "metadata", "arrays"}, enough for predict_proba*;
+    # the arrays are read-only views of the mapped file
+    header, arrays = read_artifact(path, verify)
+    if header.get("kind") != "logistic":
+        raise ValueError(f"{path}: unsupported model kind {header.get('kind')!r}")
+    if header.get("features") != FEATURES:
+        raise ValueError(f"{path}: features {header.get('features')} do not match {FEATURES}")
+    for name in ("weights", "bias"):
+        if name not in arrays:
+            raise ValueError(f"{path}: missing array {name!r}")
+    if arrays["weights"].shape != (len(FEATURES),) or arrays["bias"].shape != (1,):
+        raise ValueError(f"{path}: weights/bias shapes {arrays['weights'].shape}/{arrays['bias'].shape} do not fit {len(FEATURES)} features")
+    return {
+        "scorer": CompiledScorer(arrays["weights"], float(arrays["bias"][0]), FEATURES),
+        "features": list(FEATURES),
+        "version": artifact_version(header),
+        "metadata": header.get("metadata", {}),
+        "arrays": arrays,
+    }
+
+
+def load_model(path: str, compiled: bool = False):
+    # .vgm: the versioned array artifact, never unpickled. .pkl: the full sklearn artifact;
+    # with compiled=True a sibling .vgm at least as new as the pickle is loaded instead, so
+    # scoring-only callers never unpickle (and import) scikit-learn.
+    if path.endswith(".vgm"):
+        return load_artifact(path)
+    if compiled:
+        vgm = artifact_path(path)
+        if os.path.exists(vgm) and os.path.getmtime(vgm) >= os.path.getmtime(path):
+            return load_artifact(vgm)
+    import pickle
+    with open(path, "rb") as f:
+        obj = pickle.load(f)
+    if compiled:
+        obj["scorer"] = compile_model(obj)
+    return obj
+
+
+def predict_proba(model_obj, row: dict) -> float:
+    scorer = model_obj.get("scorer")
+    if scorer is not None:
+        return scorer.score_row(row)
+    scaler = model_obj["scaler"]
+    clf = model_obj["model"]
+    feats = np.array([[row[k] for k in FEATURES]], dtype=float)
+    feats_s = scaler.transform(feats)
+    p = float(clf.predict_proba(feats_s)[0, 1])
+    return p
+
+
+def predict_proba_batch(model_obj, X: np.ndarray) -> np.ndarray:
+    # X: (n, len(FEATURES)) raw feature matrix in FEATURES order
+    scorer = model_obj.get("scorer")
+    if scorer is not None:
+        return scorer.score(X)
+    X = np.asarray(X, dtype=float).reshape(-1, len(FEATURES))
+    return model_obj["model"].predict_proba(model_obj["scaler"].transform(X))[:, 1]
@@ -0,0 +1,95 @@
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterator, List, Sequence, Set, Tuple
+import json
+import re
+
+
+# Below this many phrases CPython's C-level substring search per phrase (with early exit
+# per group) beats one regex pass; above it the single pass wins and stays flat.
+SCAN_MAX_PHRASES = 120
+
+
+@dataclass(frozen=True)
+class KeywordMatch:
+    group: str
+    keyword: str
+    start: int
+    end: int
+
+
+def _trie_pattern(words: Sequence[str]) -> str:
+    # Prefix-factored alternation ("oil(?: pressure)?|overheat" style). Each branch starts
+    # with a distinct character, so the regex engine does one lookup per trie level
+    # instead of trying every phrase at every position.
+    trie: Dict = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def emit(node: Dict) -> str:
+        alts = [re.escape(ch) + emit(sub) for ch, sub in sorted(node.items()) if ch != ""]
+        if not alts:
+            return ""
+        if len(alts) == 1 and "" not in node:
+            return alts[0]
+        body = "(?:" + "|".join(alts) + ")"
+        # optional suffixes are greedy, so each position yields its longest phrase
+        return body + "?" if "" in node else body
+
+    return emit(trie)
+
+
+class KeywordMatcher:
+    # Single-pass, substring-semantics matcher over {group: [phrases]}.
+    # A zero-width lookahead tries the trie at every offset, so overlapping phrases
+    # starting at different offsets are all seen; phrases that are prefixes of the
+    # longest phrase at an offset are implied by it (precomputed in _hits).
+    def __init__(self, groups: Dict[str, Sequence[str]]):
+        self.groups = {g: [kw.lower() for kw in kws] for g, kws in groups.items()}
+        owners: Dict[str, List[str]] = {}
+        for g, kws in self.groups.items():
+            for kw in kws:
+                if kw:
+                    owners.setdefault(kw, []).append(g)
+        self._hits: Dict[str, Tuple[Tuple[str, str], ...]] = {}
+        self._groups_of: Dict[str, FrozenSet[str]] = {}
+        for longest in owners:
+            prefixes = (longest[:i] for i in range(1, len(longest) + 1))
+            hits = tuple((g, kw) for kw in prefixes if kw in owners for g in owners[kw])
+            self._hits[longest] = hits
+            self._groups_of[longest] = frozenset(g for g, _ in hits)
+        self._re = re.compile("(?=(" + _trie_pattern(list(owners)) + "))") if owners else None
+        self._scan = len(owners) <= SCAN_MAX_PHRASES
+
+    def finditer(self, text: str) -> Iterator[KeywordMatch]:
+        # text must already be lower-cased
+        if self._re is None:
+            return
+        for m in self._re.finditer(text):
+            start = m.start()
+            for group, kw in self._hits[m.group(1)]:
+                yield KeywordMatch(group=group, keyword=kw, start=start, end=start + len(kw))
+
+    def groups_in(self, text: str) -> Set[str]:
+        # text must already be lower-cased
+        if self._scan:
+            return {g for g, kws in self.groups.items() if any(kw in text for kw in kws if kw)}
+        found: Set[str] = set()
+        if self._re is not None:
+            for m in self._re.finditer(text):
+                found |= self._groups_of[m.group(1)]
+        return found
+
+
+def load_vocabulary(path: str) -> Dict:
+    # {"symptoms": {category: [phrases]}, "urgent": [phrases], "intent": [phrases]}
+    with open(path, "r", encoding="utf-8") as f:
+        vocab = json.load(f)
+    if not isinstance(vocab.get("symptoms"), dict) or not vocab["symptoms"]:
+        raise ValueError(f"{path}: 'symptoms' must map categories to phrase lists")
+    for cat in vocab["symptoms"]:
+        if cat.startswith("_"):
+            raise ValueError(f"{path}: symptom category {cat!r} may not start with '_'")
+    return vocab
@@ -0,0 +1,237 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+import queue
+import threading
+import time
+import numpy as np
+import pandas as pd
+from .pipeline import DEFAULT_LOCATION, TELEMETRY_DEFAULTS
+
+
+# random-walk step per tick and pull back toward the baseline, per telemetry field
+JITTER = {"engine_temp_c": 0.7, "battery_voltage": 0.05, "oil_pressure_psi": 0.6, "vibration_g": 0.05}
+REVERSION = 0.05
+
+
+@dataclass(slots=True)
+class LiveFrame:
+    # Vehicles whose result changed since the previous frame, plus fleet-wide aggregates
+    seq: int
+    ts: float
+    index: np.ndarray  # vehicle positions in the fleet
+    risk: np.ndarray
+    issue_category: np.ndarray
+    priority: np.ndarray
+    mean_risk: float
+    max_risk: float
+    urgent: int
+    score_ms: float
+
+    def merge(self, newer: "LiveFrame") -> "LiveFrame":
+        # one frame carrying both sets of changes; newer values win
+        index = np.concatenate([self.index, newer.index])
+        # np.unique keeps the first occurrence, so search the reversed order for "last wins"
+        _, first = np.unique(index[::-1], return_index=True)
+        keep = len(index) - 1 - first
+        pick = lambda a, b: np.concatenate([a, b])[keep]
+        return LiveFrame(
+            newer.seq, newer.ts, index[keep], pick(self.risk, newer.risk), pick(self.issue_category, newer.issue_category),
+            pick(self.priority, newer.priority), newer.mean_risk, newer.max_risk, newer.urgent, self.score_ms + newer.score_ms,
+        )
+
+
+class LiveWorker:
+    # Scores a simulated fleet on a background thread, one run_columns() pass per tick,
+    # and hands the changes to the UI through a bounded queue. The UI never waits on
+    # scoring: poll() drains whatever is ready. When the UI falls behind, the oldest
+    # queued frames are merged instead of dropped, so no change is lost and memory stays
+    # bounded by queue_size frames.
+    #   vehicles     fleet size; each vehicle random-walks around the baseline telemetry
+    #   interval     seconds between ticks
+    #   min_change   risk moves smaller than this are not reported (category/priority changes always are)
+    #   idle_s       stop the thread when nobody has polled for this long (None: never);
+    #                start() resumes it where it left off
+    # The first frame carries every vehicle, so a worker should feed exactly one LiveView:
+    # a second consumer would see only the changes after it attached.
+    def __init__(
+        self,
+        pipeline,
+        vehicles: int = 200,
+        interval: float = 0.5,
+        voice_text: str = "",
+        telemetry: Optional[Dict] = None,
+        customer: Optional[Dict] = None,
+        queue_size: int = 8,
+        min_change: float = 0.005,
+        seed: int = 0,
+        idle_s: Optional[float] = None,
+    ):
+        self.pipeline = pipeline
+        self.n = vehicles
+        self.interval = interval
+        self.min_change = min_change
+        self.idle_s = idle_s
+        self._last_poll = time.monotonic()
+        self.frames: "queue.Queue[LiveFrame]" = queue.Queue(maxsize=queue_size)
+        self.merged = 0
+        self.ticks = 0
+        self.last_score_ms = 0.0
+        self._rng = np.random.default_rng(seed)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._sent_risk = np.full(vehicles, np.nan)
+        self._sent_category = np.full(vehicles, "", dtype=object)
+        self._sent_priority = np.full(vehicles, "", dtype=object)
+        self._base: Optional[Dict[str, float]] = None
+        self.configure(voice_text, telemetry or {}, customer or {})
+
+    def configure(self, voice_text: str, telemetry: Dict, customer: Dict) -> None:
+        # new baseline from the form; vehicles drift toward it from where they are
+        base = {k: float(telemetry.get(k, d)) for k, d in TELEMETRY_DEFAULTS.items()}
+        lat, lon = customer.get("location", telemetry.get("location", DEFAULT_LOCATION))
+        with self._lock:
+            first = self._base is None
+            self._base = base
+            self._codes = len(telemetry.get("error_codes", []))
+            self._voice = [voice_text] * self.n
+            prefix = customer.get("id", "VEH")
+            self._customers = pd.DataFrame({
+                "id": [f"{prefix}-{i:04d}" for i in range(self.n)],
+                "lat": lat + self._rng.normal(0, 0.05, self.n),
+                "lon": lon + self._rng.normal(0, 0.05, self.n),
+            })
+            if first:
+                self._state = {k: np.full(self.n, v) for k, v in base.items()}
+
+    @property
+    def ids(self) -> List[str]:
+        return self._customers["id"].tolist()
+
+    def _step(self) -> Tuple[Dict[str, np.ndarray], List[str], pd.DataFrame]:
+        with self._lock:
+            base, state = self._base, self._state
+            for k, sigma in JITTER.items():
+                v = state[k]
+                v += REVERSION * (base[k] - v) + self._rng.normal(0, sigma, self.n)
+            np.maximum(state["vibration_g"], 0.0, out=state["vibration_g"])
+            for k in TELEMETRY_DEFAULTS:
+                if k not in JITTER:
+                    state[k][:] = base[k]
+            cols = {k: v.copy() for k, v in state.items()}
+            cols["error_code_count"] = np.full(self.n, float(self._codes))
+            return cols, self._voice, self._customers
+
+    def tick(self) -> LiveFrame:
+        # one scoring pass; returns the delta frame (also usable without the thread)
+        cols, voice, customers = self._step()
+        t0 = time.perf_counter()
+        out = self.pipeline.run_columns(voice, pd.DataFrame(cols), customers)
+        score_ms = (time.perf_counter() - t0) * 1e3
+        risk = np.asarray(out["risk_score"])
+        category = np.asarray(out["issue_category"], dtype=object)
+        priority = np.asarray(out["priority"], dtype=object)
+        changed = ~(np.abs(risk - self._sent_risk) < self.min_change) | (category != self._sent_category) | (priority != self._sent_priority)
+        idx = np.flatnonzero(changed)
+        self._sent_risk[idx] = risk[idx]
+        self._sent_category[idx] = category[idx]
+        self._sent_priority[idx] = priority[idx]
+        self.ticks += 1
+        self.last_score_ms = score_ms
+        return LiveFrame(
+            self.ticks, time.time(), idx, risk[idx], category[idx], priority[idx],
+            float(risk.mean()), float(risk.max()), int((priority == "urgent").sum()), score_ms,
+        )
+
+    def _publish(self, frame: LiveFrame) -> None:
+        # only this thread puts, so after a full drain the put cannot fail
+        try:
+            self.frames.put_nowait(frame)
+        except queue.Full:
+            pending = self._drain()
+            for older in reversed(pending):
+                frame = older.merge(frame)
+            self.merged += len(pending)
+            self.frames.put_nowait(frame)
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            if self.idle_s is not None and time.monotonic() - self._last_poll > self.idle_s:
+                # the consumer went away (e.g. a closed browser tab)
+                return
+            started = time.perf_counter()
+            self._publish(self.tick())
+            self._stop.wait(max(0.0, self.interval - (time.perf_counter() - started)))
+
+    def poll(self) -> List[LiveFrame]:
+        # every frame queued since the last poll, oldest first; never blocks
+        self._last_poll = time.monotonic()
+        return self._drain()
+
+    def _drain(self) -> List[LiveFrame]:
+        frames = []
+        while True:
+            try:
+                frames.append(self.frames.get_nowait())
+            except queue.Empty:
+                return frames
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> "LiveWorker":
+        if not self.running:
+            self._stop.clear()
+            self._last_poll = time.monotonic()
+            self._thread = threading.Thread(target=self._loop, name="voiceguard-live", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+class LiveView:
+    # UI-side state: applies frames to per-vehicle arrays and keeps a bounded history of
+    # fleet aggregates, so each refresh only touches the vehicles that changed
+    def __init__(self, vehicles: int, history: int = 240):
+        self.risk = np.zeros(vehicles)
+        self.issue_category = np.full(vehicles, "", dtype=object)
+        self.priority = np.full(vehicles, "", dtype=object)
+        self.updated = np.zeros(vehicles, dtype=np.int64)  # seq of the last change
+        self.history: List[Dict[str, float]] = []
+        self.history_size = history
+        self.seq = 0
+        self.urgent = 0
+
+    def apply(self, frames: List[LiveFrame]) -> np.ndarray:
+        # -> positions changed by these frames
+        changed = []
+        for f in frames:
+            self.risk[f.index] = f.risk
+            self.issue_category[f.index] = f.issue_category
+            self.priority[f.index] = f.priority
+            self.updated[f.index] = f.seq
+            self.seq, self.urgent = f.seq, f.urgent
+            changed.append(f.index)
+            self.history.append({"mean_risk": f.mean_risk, "max_risk": f.max_risk})
+        if len(self.history) > self.history_size:
+            del self.history[: len(self.history) - self.history_size]
+        return np.unique(np.concatenate(changed)) if changed else np.zeros(0, dtype=np.int64)
+
+    def rows(self, index: np.ndarray, ids: Optional[List[str]] = None) -> pd.DataFrame:
+        return pd.DataFrame({
+            "vehicle": [ids[i] for i in index] if ids is not None else index,
+            "risk": self.risk[index],
+            "issue_category": self.issue_category[index],
+            "priority": self.priority[index],
+        })
+
+    def top(self, k: int = 20) -> np.ndarray:
+        k = min(k, len(self.risk))
+        idx = np.argpartition(-self.risk, k - 1)[:k] if k else np.zeros(0, dtype=np.int64)
+        return idx[np.argsort(-self.risk[idx])]
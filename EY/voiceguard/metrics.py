@@ -0,0 +1,359 @@
+from bisect import bisect_left
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+import cProfile
+import io
+import itertools
+import math
+import pstats
+import threading
+import tracemalloc
+import numpy as np
+
+
+# the seven agent stages of VoiceGuardPipeline.run, in call order
+STAGES = ("voice", "telemetry", "diagnosis", "scheduling", "ueba", "feedback", "analytics")
+_TIMING_KEYS = tuple(f"{s}_ms" for s in STAGES)
+
+# 10 buckets per decade (neighbouring bounds at most 1.5x apart); the 1 / 2.5 / 5
+# bounds of each decade are also exported as Prometheus `le` buckets
+_MANTISSAS = (1, 1.5, 2, 2.5, 3, 4, 5, 6, 7, 8)
+_PROM_MANTISSAS = (1, 2.5, 5)
+
+
+def _decade_bounds(lo_exp: int, hi_exp: int) -> Tuple[Tuple[float, ...], Tuple[int, ...]]:
+    bounds, exported = [], []
+    for e in range(lo_exp, hi_exp + 1):
+        for m in _MANTISSAS:
+            if m in _PROM_MANTISSAS:
+                exported.append(len(bounds))
+            bounds.append(float(f"{m}e{e}"))
+    return tuple(bounds), tuple(exported)
+
+
+LATENCY_BOUNDS = _decade_bounds(-6, 1)  # 1 us .. 80 s
+BYTES_BOUNDS = _decade_bounds(2, 9)  # 100 B .. 8 GB
+
+
+class Histogram:
+    # Fixed-bucket histogram, no per-sample storage. Not locked; PipelineMetrics
+    # serializes updates.
+    __slots__ = ("bounds", "exported", "counts", "count", "sum", "_np_bounds")
+
+    def __init__(self, bounds: Tuple[Tuple[float, ...], Tuple[int, ...]] = LATENCY_BOUNDS):
+        self.bounds, self.exported = bounds
+        self._np_bounds = np.array(self.bounds)
+        self.counts = np.zeros(len(self.bounds) + 1, dtype=np.int64)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def observe_many(self, values: np.ndarray) -> None:
+        # same bucketing as observe() (value == bound goes to that bound's bucket)
+        idx = np.searchsorted(self._np_bounds, values, side="left")
+        self.counts += np.bincount(idx, minlength=len(self.counts))
+        self.count += len(values)
+        self.sum += float(values.sum())
+
+    def quantile(self, q: float) -> float:
+        # linear interpolation inside the bucket holding the q-th observation
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, c in enumerate(self.counts.tolist()):
+            if c and seen + c >= rank:
+                lo = self.bounds[i - 1] if i > 0 else 0.0
+                hi = self.bounds[i] if i < len(self.bounds) else self.bounds[-1]
+                return lo + (hi - lo) * max(0.0, rank - seen) / c
+            seen += c
+        return self.bounds[-1]
+
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def copy(self) -> "Histogram":
+        h = Histogram((self.bounds, self.exported))
+        h.counts = self.counts.copy()
+        h.count = self.count
+        h.sum = self.sum
+        return h
+
+    def buckets(self) -> List[Tuple[str, int]]:
+        # cumulative (le, count) pairs at the exported bounds, ending with +Inf
+        cum = np.cumsum(self.counts).tolist()
+        out = [(f"{self.bounds[i]:g}", cum[i]) for i in self.exported]
+        out.append(("+Inf", self.count))
+        return out
+
+
+class PipelineMetrics:
+    # Latency of VoiceGuardPipeline.run. Attach with build_pipeline(metrics=...).
+    #   stage_every    time the seven stages of 1 in N runs (every run feeds the end-to-end histogram)
+    #   timings        add a "timings" section (milliseconds per stage) to the results of
+    #                  1 in N runs (True: every run) and time their stages
+    #   sample_every   profile 1 in N runs; those runs are kept out of the latency histograms
+    #   profile        cProfile the sampled runs (aggregated, see profile_report)
+    #   trace_memory   tracemalloc the sampled runs (peak bytes + top allocation sites)
+    # The hot path is one modulus and two perf_counter() calls; raw timestamps are bucketed
+    # in bulk every FOLD_EVERY runs or when a snapshot is taken. Measured cost per run
+    # (benchmarks/bench_metrics.py, against a ~35 us run()): default ~0.35 us (~1%),
+    # timings=16 ~0.65 us (~2%), stage_every=1 ~2.5 us (~7%), timings=True ~6 us (~17%,
+    # mostly building the per-result dict). tests/test_metrics.py holds the default to 2%.
+    FOLD_EVERY = 2048
+
+    def __init__(
+        self,
+        stage_every: int = 64,
+        timings: Union[bool, int] = False,
+        sample_every: int = 0,
+        profile: bool = True,
+        trace_memory: bool = False,
+        quantiles: Sequence[float] = (0.5, 0.9, 0.99),
+    ):
+        self.configure(stage_every, timings, sample_every)
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.quantiles = tuple(quantiles)
+        self.stages = {s: Histogram() for s in STAGES}
+        self.total = Histogram()
+        self.peak_memory = Histogram(BYTES_BOUNDS)
+        self.errors = 0
+        self.sampled = 0
+        self.top_allocations: List[str] = []
+        self._seq = itertools.count(1)
+        # list.append is atomic under the GIL, so request threads never take a lock
+        self._totals: List[float] = []
+        self._marked: List[List[float]] = []
+        self._lock = threading.Lock()
+        # cProfile and tracemalloc are process-wide: one sampled run at a time
+        self._sample_lock = threading.Lock()
+        self._profile: Optional[pstats.Stats] = None
+        # pstats merging costs ~0.5 ms per profile; done at report time, not on the request
+        self._profiles: List[cProfile.Profile] = []
+
+    def configure(self, stage_every: Optional[int] = None, timings: Union[bool, int, None] = None, sample_every: Optional[int] = None) -> None:
+        # change the sampling periods after construction (None keeps the current value)
+        stage_every = self.stage_every if stage_every is None else stage_every
+        timings = self.timings if timings is None else int(timings)
+        sample_every = self.sample_every if sample_every is None else sample_every
+        if stage_every < 1:
+            raise ValueError("stage_every must be >= 1")
+        if timings < 0:
+            raise ValueError("timings must be True, False or N >= 1")
+        if sample_every < 0:
+            raise ValueError("sample_every must be >= 0")
+        self.stage_every, self.timings, self.sample_every = stage_every, timings, sample_every  # timings 0: off, N: 1 in N runs
+        self._check = math.gcd(stage_every, timings, sample_every)
+
+    def observe(self, run: Callable, voice_text, telemetry_payload, customer) -> Dict:
+        # run(voice_text, telemetry_payload, customer, marks): marks is None, or a list that
+        # gets a perf_counter() after each stage (VoiceGuardPipeline._run)
+        n = next(self._seq)
+        # one modulus decides the common case: every stage/timings/profile run is a multiple
+        # of _check (the gcd of the active periods, <= stage_every); only those look any
+        # further, and they also fold the buffers once they fill up
+        if not n % self._check:
+            if len(self._totals) >= self.FOLD_EVERY or len(self._marked) >= self.FOLD_EVERY:
+                self._fold()
+            timed = self.timings and n % self.timings == 0
+            if timed or n % self.stage_every == 0 or (self.sample_every and n % self.sample_every == 0):
+                return self._observe_marked(run, n, timed, (voice_text, telemetry_payload, customer))
+        # hot path: end-to-end latency only
+        start = perf_counter()
+        try:
+            result = run(voice_text, telemetry_payload, customer, None)
+        except Exception:
+            self._error()
+            raise
+        self._totals.append(perf_counter() - start)
+        return result
+
+    def _observe_marked(self, run: Callable, n: int, timed, args) -> Dict:
+        if self.sample_every and n % self.sample_every == 0 and self._sample_lock.acquire(blocking=False):
+            try:
+                return self._observe_sampled(run, args, timed)
+            finally:
+                self._sample_lock.release()
+        marks = [perf_counter()]
+        try:
+            result = run(*args, marks)
+        except Exception:
+            self._error()
+            raise
+        marks.append(perf_counter())
+        self._marked.append(marks)
+        if timed:
+            result["timings"] = self._timings(marks)
+        return result
+
+    def _error(self) -> None:
+        with self._lock:
+            self.errors += 1
+
+    def _fold(self) -> None:
+        with self._lock:
+            # a thread that fetched a buffer just before this swap may append to the old
+            # list after it was read; that one sample is dropped, which metrics can afford
+            totals, self._totals = self._totals, []
+            marked, self._marked = self._marked, []
+            if marked:
+                m = np.array(marked)
+                d = np.diff(m[:, :len(STAGES) + 1], axis=1)
+                for i, h in enumerate(self.stages.values()):
+                    h.observe_many(d[:, i])
+                self.total.observe_many(m[:, -1] - m[:, 0])
+            if totals:
+                self.total.observe_many(np.array(totals))
+
+    def _observe_sampled(self, run: Callable, args, timed: bool) -> Dict:
+        prof = cProfile.Profile() if self.profile else None
+        started = False
+        if self.trace_memory:
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+                started = True
+        marks = [perf_counter()]
+        try:
+            if prof is not None:
+                prof.enable()
+            try:
+                result = run(*args, marks)
+            except Exception:
+                self._error()
+                raise
+            finally:
+                if prof is not None:
+                    prof.disable()
+        finally:
+            snapshot = peak = None
+            if self.trace_memory:
+                peak = tracemalloc.get_traced_memory()[1]
+                snapshot = tracemalloc.take_snapshot()
+                if started:
+                    tracemalloc.stop()
+        marks.append(perf_counter())
+        allocations = None
+        if snapshot is not None:
+            snapshot = snapshot.filter_traces((tracemalloc.Filter(False, tracemalloc.__file__),))
+            allocations = [str(s) for s in snapshot.statistics("lineno")[:10]]
+        with self._lock:
+            self.sampled += 1
+            if prof is not None:
+                self._profiles.append(prof)
+                if len(self._profiles) >= 256:
+                    self._merge_profiles()
+            if peak is not None:
+                self.peak_memory.observe(peak)
+                self.top_allocations = allocations
+        if timed:
+            result["timings"] = self._timings(marks)
+            result["timings"]["sampled"] = True
+        return result
+
+    @staticmethod
+    def _timings(marks: List[float]) -> Dict:
+        # round(x * 1e7) / 1e4 keeps 0.1 us resolution and is ~3x cheaper than round(x, 4)
+        out = {k: round((b - a) * 1e7) / 1e4 for k, a, b in zip(_TIMING_KEYS, marks, marks[1:])}
+        out["total_ms"] = round((marks[-1] - marks[0]) * 1e7) / 1e4
+        return out
+
+    def snapshot(self) -> Tuple[Dict[str, Histogram], Histogram, Histogram, Dict[str, int]]:
+        self._fold()
+        with self._lock:
+            stages = {s: h.copy() for s, h in self.stages.items()}
+            requests = self.total.count + self.errors + self.sampled
+            counters = {"requests": requests, "errors": self.errors, "sampled": self.sampled}
+            return stages, self.total.copy(), self.peak_memory.copy(), counters
+
+    def summary(self) -> Dict:
+        # {stage: {count, mean_ms, p50_ms, ...}} for logs, benchmarks and the Streamlit app
+        stages, total, _, counters = self.snapshot()
+        out = dict(counters)
+        for name, h in list(stages.items()) + [("total", total)]:
+            row = {"count": h.count, "mean_ms": round(h.mean() * 1000, 4)}
+            for q in self.quantiles:
+                row[f"p{q * 100:g}_ms"] = round(h.quantile(q) * 1000, 4)
+            out[name] = row
+        return out
+
+    def reset(self) -> None:
+        with self._lock:
+            self._totals, self._marked = [], []
+            self.stages = {s: Histogram() for s in STAGES}
+            self.total = Histogram()
+            self.peak_memory = Histogram(BYTES_BOUNDS)
+            self.errors = self.sampled = 0
+            self.top_allocations = []
+            self._profile = None
+            self._profiles = []
+
+    def _merge_profiles(self) -> None:
+        # caller holds self._lock
+        for prof in self._profiles:
+            if self._profile is None:
+                self._profile = pstats.Stats(prof)
+            else:
+                self._profile.add(prof)
+        self._profiles = []
+
+    def profile_report(self, limit: int = 25, sort: str = "cumulative") -> str:
+        with self._lock:
+            self._merge_profiles()
+            if self._profile is None:
+                return "no profiled runs yet (set sample_every > 0)\n"
+            buf = io.StringIO()
+            self._profile.stream = buf
+            self._profile.sort_stats(sort).print_stats(limit)
+        lines = [buf.getvalue()]
+        if self.top_allocations:
+            lines.append("top allocation sites (last traced run):\n")
+            lines.extend(f"  {a}\n" for a in self.top_allocations)
+        return "".join(lines)
+
+    def prometheus(self, cache=None) -> str:
+        # Prometheus text exposition format 0.0.4
+        stages, total, peak, counters = self.snapshot()
+        out = []
+
+        def counter(name: str, help_: str, value) -> None:
+            out.append(f"# HELP {name} {help_}")
+            out.append(f"# TYPE {name} counter")
+            out.append(f"{name} {value}")
+
+        def histogram(name: str, help_: str, series: List[Tuple[str, Histogram]]) -> None:
+            out.append(f"# HELP {name} {help_}")
+            out.append(f"# TYPE {name} histogram")
+            for labels, h in series:
+                sep = "," if labels else ""
+                for le, c in h.buckets():
+                    out.append(f'{name}_bucket{{{labels}{sep}le="{le}"}} {c}')
+                out.append(f"{name}_sum{{{labels}}} {h.sum!r}" if labels else f"{name}_sum {h.sum!r}")
+                out.append(f"{name}_count{{{labels}}} {h.count}" if labels else f"{name}_count {h.count}")
+
+        counter("voiceguard_requests_total", "Pipeline runs observed.", counters["requests"])
+        counter("voiceguard_errors_total", "Pipeline runs that raised.", counters["errors"])
+        counter("voiceguard_profiled_total", "Runs sampled for profiling (excluded from latency histograms).", counters["sampled"])
+        stage_series = [(f'stage="{s}"', h) for s, h in stages.items()]
+        histogram("voiceguard_stage_seconds", "Per-stage latency of VoiceGuardPipeline.run.", stage_series)
+        histogram("voiceguard_run_seconds", "End-to-end latency of VoiceGuardPipeline.run.", [("", total)])
+        out.append("# HELP voiceguard_stage_quantile_seconds Bucket-interpolated latency percentiles.")
+        out.append("# TYPE voiceguard_stage_quantile_seconds gauge")
+        for s, h in stage_series + [('stage="total"', total)]:
+            for q in self.quantiles:
+                out.append(f'voiceguard_stage_quantile_seconds{{{s},quantile="{q:g}"}} {h.quantile(q)!r}')
+        if peak.count:
+            histogram("voiceguard_profiled_peak_bytes", "tracemalloc peak of sampled runs.", [("", peak)])
+        if cache is not None:
+            out.append("# HELP voiceguard_cache_events_total PipelineCache lookups by outcome.")
+            out.append("# TYPE voiceguard_cache_events_total counter")
+            for name, st in cache.stats().items():
+                for event in ("hits", "misses", "evictions", "expirations"):
+                    out.append(f'voiceguard_cache_events_total{{cache="{name}",event="{event}"}} {st[event]}')
+        return "\n".join(out) + "\n"
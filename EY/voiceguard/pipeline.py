@@ -1,7 +1,10 @@
-from typing import Dict, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
 from .agents import (
     Telemetry,
     VoiceCall,
+    VoiceSummary,
+    DiagnosisResult,
     VoiceCustomerAgent,
     TelemetryAgent,
     DiagnosisAgent,
@@ -10,47 +13,205 @@ from .agents import (
     FeedbackAgent,
     DataAnalysisAgent,
 )
+from .analytics import AnalyticsStore
+from .cache import PipelineCache
+from .ensemble import ModelEnsemble
+from .keywords import load_vocabulary
+from .metrics import PipelineMetrics
+from .results import FEATURE_FIELDS, RESULT_FIELDS, CompactResult
+from .slots import SlotAllocator
+from .ueba import FleetUEBA
+from time import perf_counter
 import time
 
 
+DEFAULT_LOCATION = (12.9716, 77.5946)
+TELEMETRY_DEFAULTS = {
+    "engine_temp_c": 90,
+    "battery_voltage": 12.4,
+    "oil_pressure_psi": 35,
+    "vibration_g": 0.4,
+    "speed_kph": 40,
+    "odometer_km": 45000,
+}
+
+
+def _is_frame(obj) -> bool:
+    return hasattr(obj, "columns") and hasattr(obj, "to_dict")
+
+
+def _telemetry_columns(telemetry) -> Dict[str, np.ndarray]:
+    # Accepts a list of telemetry dicts or a DataFrame with one column per field.
+    # A DataFrame may carry either an `error_codes` list column or `error_code_count`.
+    if _is_frame(telemetry):
+        n = len(telemetry)
+        cols = {
+            k: telemetry[k].to_numpy(dtype=float) if k in telemetry.columns else np.full(n, float(d))
+            for k, d in TELEMETRY_DEFAULTS.items()
+        }
+        if "error_code_count" in telemetry.columns:
+            cols["error_code_count"] = telemetry["error_code_count"].to_numpy(dtype=float)
+        elif "error_codes" in telemetry.columns:
+            cols["error_code_count"] = np.array([len(c) for c in telemetry["error_codes"]], dtype=float)
+        else:
+            cols["error_code_count"] = np.zeros(n)
+        return cols
+    cols = {k: np.array([float(t.get(k, d)) for t in telemetry], dtype=float) for k, d in TELEMETRY_DEFAULTS.items()}
+    cols["error_code_count"] = np.array([len(t.get("error_codes", [])) for t in telemetry], dtype=float)
+    return cols
+
+
+def _customer_columns(customers) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    # Accepts a list of customer dicts or a DataFrame with `id` and either `location` or `lat`/`lon`
+    if _is_frame(customers):
+        n = len(customers)
+        ids = customers["id"].astype(str).tolist() if "id" in customers.columns else ["unknown"] * n
+        if "lat" in customers.columns and "lon" in customers.columns:
+            return ids, customers["lat"].to_numpy(dtype=float), customers["lon"].to_numpy(dtype=float)
+        if "location" in customers.columns:
+            locs = np.array([tuple(loc) for loc in customers["location"]], dtype=float).reshape(n, 2)
+        else:
+            locs = np.tile(np.array(DEFAULT_LOCATION, dtype=float), (n, 1))
+        return ids, locs[:, 0], locs[:, 1]
+    ids = [c.get("id", "unknown") for c in customers]
+    locs = np.array([tuple(c.get("location", DEFAULT_LOCATION)) for c in customers], dtype=float).reshape(len(ids), 2)
+    return ids, locs[:, 0], locs[:, 1]
+
+
 class VoiceGuardPipeline:
-    def __init__(self, model_obj=None):
-        self.voice_agent = VoiceCustomerAgent()
+    def __init__(
+        self,
+        model_obj=None,
+        centers=None,
+        allocator: Optional[SlotAllocator] = None,
+        vocabulary=None,
+        cache: Optional[PipelineCache] = None,
+        metrics: Optional[PipelineMetrics] = None,
+        ueba: Optional[FleetUEBA] = None,
+        analytics: Optional[AnalyticsStore] = None,
+    ):
+        # centers: list of service-center dicts, a path to a JSON/CSV catalog, or None for the built-ins.
+        # allocator: capacity-aware SlotAllocator; it then owns the center catalog.
+        # vocabulary: keyword dict or path to a JSON vocabulary (see keywords.load_vocabulary).
+        # cache: PipelineCache memoizing voice parsing and diagnosis for repeated inputs.
+        # metrics: PipelineMetrics collecting per-stage latency of run().
+        # ueba: FleetUEBA tracking per-customer call rates and regional issue surges.
+        # analytics: AnalyticsStore receiving every scored request (run and run_batch).
+        self.cache = cache
+        self.metrics = metrics
+        if isinstance(vocabulary, str):
+            vocabulary = load_vocabulary(vocabulary)
+        self.voice_agent = VoiceCustomerAgent(vocabulary)
         self.telemetry_agent = TelemetryAgent()
         self.diagnosis_agent = DiagnosisAgent(model_obj=model_obj)
-        self.scheduling_agent = SchedulingAgent()
-        self.ueba_agent = UEBAAgent()
+        if allocator is not None:
+            self.scheduling_agent = SchedulingAgent(allocator=allocator)
+        elif isinstance(centers, str):
+            self.scheduling_agent = SchedulingAgent.from_file(centers)
+        else:
+            self.scheduling_agent = SchedulingAgent(centers)
+        self.ueba_agent = UEBAAgent(fleet=ueba)
         self.feedback_agent = FeedbackAgent()
-        self.data_agent = DataAnalysisAgent()
+        self.data_agent = DataAnalysisAgent(store=analytics)
+
+    def set_model(self, model_obj) -> None:
+        # atomic reference swap; calls already inside DiagnosisAgent keep the old model
+        self.diagnosis_agent.model_obj = model_obj
+        if self.cache is not None:
+            self.cache.diagnosis.clear()
+
+    def _voice_summary(self, voice: VoiceCall) -> VoiceSummary:
+        if self.cache is None:
+            return self.voice_agent.process(voice)
+        key = self.cache.voice_key(voice.text)
+        hit = self.cache.voice.get(key)
+        if hit is None:
+            summary = self.voice_agent.process(voice)
+            self.cache.voice.put(key, (tuple(summary.symptoms), summary.severity, summary.intent))
+            return summary
+        symptoms, severity, intent = hit
+        return VoiceSummary(customer_id=voice.customer_id, symptoms=list(symptoms), severity=severity, intent=intent)
+
+    def _diagnose(self, telem: Telemetry, voice_summary: VoiceSummary, marks: Optional[List[float]] = None) -> Tuple[Dict[str, float], DiagnosisResult]:
+        # marks: when given, a perf_counter() is appended after the telemetry and the diagnosis stage
+        cache = self.cache
+        model_obj = self.diagnosis_agent.model_obj
+        tkey = cache.telemetry_key(telem) if cache is not None else None
+        if tkey is None:
+            cache = None
+        else:
+            # an ensemble changes in place on register(), so key on its layout version
+            token = (id(model_obj), model_obj.version) if isinstance(model_obj, ModelEnsemble) else id(model_obj)
+            key = (tkey, tuple(voice_summary.symptoms), voice_summary.severity, token)
+            hit = cache.diagnosis.get(key)
+            if hit is not None:
+                # hand out copies so callers can't mutate the cached entry
+                feats, diag = hit
+                if marks is not None:
+                    marks.append(perf_counter())
+                    marks.append(marks[-1])
+                return dict(feats), DiagnosisResult(diag.risk_score, diag.issue_category, dict(diag.contributing_signals))
+        telem_features = self.telemetry_agent.process(telem)
+        raw = self.telemetry_agent.raw_features(telem) if model_obj is not None else None
+        if marks is not None:
+            marks.append(perf_counter())
+        diagnosis = self.diagnosis_agent.process(voice_summary, telem_features, raw)
+        if marks is not None:
+            marks.append(perf_counter())
+        if cache is not None:
+            cache.diagnosis.put(key, (dict(telem_features), DiagnosisResult(diagnosis.risk_score, diagnosis.issue_category, dict(diagnosis.contributing_signals))))
+        return telem_features, diagnosis
+
+    def run(self, voice_text: str, telemetry_payload: Dict, customer: Dict, compact: bool = False):
+        # compact=True returns a flat CompactResult instead of the nested dict
+        if self.metrics is None:
+            result = self._run(voice_text, telemetry_payload, customer, None)
+        else:
+            result = self.metrics.observe(self._run, voice_text, telemetry_payload, customer)
+        return CompactResult.from_result(result) if compact else result
 
-    def run(self, voice_text: str, telemetry_payload: Dict, customer: Dict) -> Dict:
+    def _run(self, voice_text: str, telemetry_payload: Dict, customer: Dict, marks: Optional[List[float]]) -> Dict:
+        # marks: None, or a list that gets one perf_counter() appended after each of metrics.STAGES
         voice = VoiceCall(
             customer_id=customer.get("id", "unknown"),
             text=voice_text,
             timestamp=time.time(),
-            location=tuple(customer.get("location", (12.9716, 77.5946))),
+            location=tuple(customer.get("location", DEFAULT_LOCATION)),
         )
+        voice_summary = self._voice_summary(voice)
+        if marks is not None:
+            marks.append(perf_counter())
         telem = Telemetry(
-            engine_temp_c=float(telemetry_payload.get("engine_temp_c", 90)),
-            battery_voltage=float(telemetry_payload.get("battery_voltage", 12.4)),
-            oil_pressure_psi=float(telemetry_payload.get("oil_pressure_psi", 35)),
-            vibration_g=float(telemetry_payload.get("vibration_g", 0.4)),
-            speed_kph=float(telemetry_payload.get("speed_kph", 40)),
-            odometer_km=float(telemetry_payload.get("odometer_km", 45000)),
+            engine_temp_c=float(telemetry_payload.get("engine_temp_c", TELEMETRY_DEFAULTS["engine_temp_c"])),
+            battery_voltage=float(telemetry_payload.get("battery_voltage", TELEMETRY_DEFAULTS["battery_voltage"])),
+            oil_pressure_psi=float(telemetry_payload.get("oil_pressure_psi", TELEMETRY_DEFAULTS["oil_pressure_psi"])),
+            vibration_g=float(telemetry_payload.get("vibration_g", TELEMETRY_DEFAULTS["vibration_g"])),
+            speed_kph=float(telemetry_payload.get("speed_kph", TELEMETRY_DEFAULTS["speed_kph"])),
+            odometer_km=float(telemetry_payload.get("odometer_km", TELEMETRY_DEFAULTS["odometer_km"])),
             error_codes=list(telemetry_payload.get("error_codes", [])),
-            location=tuple(telemetry_payload.get("location", customer.get("location", (12.9716, 77.5946)))),
+            location=tuple(telemetry_payload.get("location", customer.get("location", DEFAULT_LOCATION))),
         )
-
-        voice_summary = self.voice_agent.process(voice)
-        telem_features = self.telemetry_agent.process(telem)
-        diagnosis = self.diagnosis_agent.process(voice_summary, telem_features)
+        telem_features, diagnosis = self._diagnose(telem, voice_summary, marks)
         schedule = self.scheduling_agent.schedule(voice.location, diagnosis)
-        ueba_alerts = self.ueba_agent.monitor(voice_summary, diagnosis)
+        if marks is not None:
+            marks.append(perf_counter())
+        ueba_alerts = self.ueba_agent.monitor(voice_summary, diagnosis, voice.location)
+        if marks is not None:
+            marks.append(perf_counter())
         feedback = self.feedback_agent.generate(diagnosis, schedule)
+        if marks is not None:
+            marks.append(perf_counter())
         aggregate = self.data_agent.aggregate(voice_summary, diagnosis, schedule)
+        if marks is not None:
+            marks.append(perf_counter())
 
         return {
-            "voice_summary": voice_summary.__dict__,
+            "voice_summary": {
+                "customer_id": voice_summary.customer_id,
+                "symptoms": voice_summary.symptoms,
+                "severity": voice_summary.severity,
+                "intent": voice_summary.intent,
+            },
             "telemetry_features": telem_features,
             "diagnosis": {
                 "risk_score": diagnosis.risk_score,
@@ -69,7 +230,111 @@ class VoiceGuardPipeline:
             "analytics": aggregate,
         }
 
+    def run_batch(self, voice_texts: Sequence[str], telemetry, customers, compact: bool = False) -> List:
+        # Score N vehicles in one columnar pass; returns the same per-vehicle dicts as run(),
+        # or CompactResults with compact=True
+        cols = self.run_columns(voice_texts, telemetry, customers)
+        if compact:
+            return [CompactResult(*row) for row in zip(*(cols[k] for k in RESULT_FIELDS))]
+        feat_names = list(FEATURE_FIELDS)
+        feat_rows = zip(*(cols[k] for k in feat_names))
+        ids, severity, risk_l, cat_l, prio_l, cid_l = (
+            cols["customer_id"], cols["severity"], cols["risk_score"], cols["issue_category"], cols["priority"], cols["center_id"]
+        )
+        results = []
+        for i, frow in enumerate(feat_rows):
+            telem_features = dict(zip(feat_names, frow))
+            results.append({
+                "voice_summary": {"customer_id": ids[i], "symptoms": list(cols["symptoms"][i]), "severity": severity[i], "intent": cols["intent"][i]},
+                "telemetry_features": telem_features,
+                "diagnosis": {
+                    "risk_score": risk_l[i],
+                    "issue_category": cat_l[i],
+                    "signals": {**telem_features, "voice_severity": severity[i]},
+                },
+                "schedule": {
+                    "center_id": cid_l[i],
+                    "center_name": cols["center_name"][i],
+                    "slot": cols["slot"][i],
+                    "eta_minutes": cols["eta_minutes"][i],
+                    "priority": prio_l[i],
+                },
+                "security_alerts": list(cols["security_alerts"][i]),
+                "oem_feedback": {"oem_quality_flag": cols["oem_quality_flag"][i], "recommended_action": cols["recommended_action"][i]},
+                "analytics": {
+                    "customer_id": ids[i],
+                    "issue_category": cat_l[i],
+                    "risk_score": risk_l[i],
+                    "priority": prio_l[i],
+                    "center_id": cid_l[i],
+                },
+            })
+        return results
+
+    def run_columns(self, voice_texts: Sequence[str], telemetry, customers) -> Dict[str, list]:
+        # run_batch() as {field: list}, one entry per results.RESULT_FIELDS; feeds ResultWriter directly
+        voice_texts = list(voice_texts)
+        n = len(voice_texts)
+        cols = _telemetry_columns(telemetry)
+        ids, lats, lons = _customer_columns(customers)
+        if not (len(ids) == len(cols["engine_temp_c"]) == n):
+            raise ValueError("voice_texts, telemetry and customers must have the same length")
+
+        # transcripts repeat heavily across a fleet, so parse each distinct one once
+        now = time.time()
+        parsed: Dict[str, VoiceSummary] = {}
+        refs = []
+        for cid, text, loc in zip(ids, voice_texts, zip(lats.tolist(), lons.tolist())):
+            ref = parsed.get(text)
+            if ref is None:
+                ref = parsed[text] = self._voice_summary(VoiceCall(customer_id=cid, text=text, timestamp=now, location=loc))
+            refs.append(ref)
+        symptoms = [v.symptoms for v in refs]
+        severity = np.array([v.severity for v in refs], dtype=float)
+        intents = np.array([v.intent for v in refs])
+
+        feats = self.telemetry_agent.process_batch(cols)
+        raw = self.telemetry_agent.raw_matrix(cols) if self.diagnosis_agent.model_obj is not None else None
+        risk, categories = self.diagnosis_agent.process_batch(symptoms, severity, feats, raw)
+        risk = np.array([round(r, 3) for r in risk.tolist()])
+        sched = self.scheduling_agent.schedule_batch(lats, lons, risk, categories)
+        alerts = self.ueba_agent.monitor_batch(intents, severity, risk, ids, lats, lons, categories)
+        feedback = self.feedback_agent.generate_batch(categories, sched["priority"])
+        self.data_agent.aggregate_batch(sched["center_id"], categories, sched["priority"], risk)
+
+        out = {
+            "customer_id": list(ids),
+            "symptoms": [tuple(s) for s in symptoms],
+            "severity": severity.tolist(),
+            "intent": intents.tolist(),
+        }
+        out.update((k, v.tolist()) for k, v in feats.items())
+        out["risk_score"] = risk.tolist()
+        out["issue_category"] = categories.tolist()
+        out.update((k, v.tolist()) for k, v in sched.items())
+        out["security_alerts"] = [tuple(a) for a in alerts]
+        out.update((k, v.tolist()) for k, v in feedback.items())
+        return {k: out[k] for k in RESULT_FIELDS}
+
 
-def build_pipeline(model_obj=None) -> VoiceGuardPipeline:
-    return VoiceGuardPipeline(model_obj=model_obj)
+def build_pipeline(
+    model_obj=None,
+    centers=None,
+    allocator: Optional[SlotAllocator] = None,
+    vocabulary=None,
+    cache: Optional[PipelineCache] = None,
+    metrics: Optional[PipelineMetrics] = None,
+    ueba: Optional[FleetUEBA] = None,
+    analytics: Optional[AnalyticsStore] = None,
+) -> VoiceGuardPipeline:
+    return VoiceGuardPipeline(
+        model_obj=model_obj,
+        centers=centers,
+        allocator=allocator,
+        vocabulary=vocabulary,
+        cache=cache,
+        metrics=metrics,
+        ueba=ueba,
+        analytics=analytics,
+    )
 
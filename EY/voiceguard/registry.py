@@ -0,0 +1,108 @@
+from typing import Callable, List, Optional, Tuple
+import hashlib
+import logging
+import os
+import threading
+import time
+from .inference import load_model
+
+
+log = logging.getLogger("voiceguard.registry")
+
+
+def _file_digest(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class ModelRegistry:
+    # Holds one loaded model in memory and swaps in a new one when the artifact changes.
+    # Readers take `registry.model` (or get it pushed via subscribe) and keep using
+    # that reference, so in-flight requests finish on the model they started with.
+    def __init__(self, path: str, compiled: bool = True, poll_interval: float = 2.0, loader: Callable = load_model):
+        self.path = path
+        self.compiled = compiled
+        self.poll_interval = poll_interval
+        self.loader = loader
+        self.model = None
+        self.version: Optional[str] = None
+        self.loaded_at: Optional[float] = None
+        self.load_ms: Optional[float] = None
+        self._stat: Optional[Tuple[float, int]] = None
+        self._listeners: List[Callable] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.check()
+
+    def subscribe(self, fn: Callable) -> None:
+        # fn(model_obj) is called now and after every swap
+        with self._lock:
+            self._listeners.append(fn)
+            model = self.model
+        fn(model)
+
+    def info(self) -> dict:
+        return {"path": self.path, "version": self.version, "loaded_at": self.loaded_at, "load_ms": self.load_ms}
+
+    def check(self) -> bool:
+        # Cheap stat() first; hash and unpickle only when mtime/size moved.
+        # Returns True when a new model was swapped in.
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            if self._stat is None and self.model is None:
+                log.warning("model artifact %s not found; using heuristic scorer", self.path)
+                self._stat = (0.0, -1)
+            return False
+        stat = (st.st_mtime, st.st_size)
+        if stat == self._stat:
+            return False
+        t0 = time.perf_counter()
+        try:
+            digest = _file_digest(self.path)
+            if digest[:12] == self.version:
+                self._stat = stat
+                return False
+            model = self.loader(self.path, compiled=self.compiled)
+        except Exception as e:
+            # a trainer may still be writing the file; keep serving the old model and retry
+            log.warning("could not load %s (%s); keeping model %s", self.path, e, self.version)
+            return False
+        load_ms = (time.perf_counter() - t0) * 1000
+        t1 = time.perf_counter()
+        with self._lock:
+            previous = self.version
+            self.model = model
+            self.version = digest[:12]
+            self.loaded_at = time.time()
+            self.load_ms = load_ms
+            self._stat = stat
+            listeners = list(self._listeners)
+        for fn in listeners:
+            fn(model)
+        swap_ms = (time.perf_counter() - t1) * 1000
+        if previous is None:
+            log.info("loaded model %s from %s in %.1f ms", self.version, self.path, load_ms)
+        else:
+            log.info("swapped model %s -> %s (load %.1f ms, swap %.3f ms)", previous, self.version, load_ms, swap_ms)
+        return True
+
+    def start(self) -> "ModelRegistry":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._watch, name="model-registry", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            self.check()
@@ -0,0 +1,364 @@
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import struct
+import zipfile
+import numpy as np
+
+
+FEATURE_FIELDS = (
+    "engine_temp_norm",
+    "battery_drop_norm",
+    "oil_pressure_low_norm",
+    "vibration_norm",
+    "speed_norm",
+    "odometer_norm",
+    "error_code_count",
+)
+# One flat record per vehicle. Everything else in a run() result is derived from these:
+# diagnosis.signals = features + voice_severity (== severity), analytics repeats
+# customer/diagnosis/schedule fields.
+RESULT_FIELDS = (
+    "customer_id",
+    "symptoms",
+    "severity",
+    "intent",
+    *FEATURE_FIELDS,
+    "risk_score",
+    "issue_category",
+    "center_id",
+    "center_name",
+    "slot",
+    "eta_minutes",
+    "priority",
+    "security_alerts",
+    "oem_quality_flag",
+    "recommended_action",
+)
+# low-cardinality strings, stored dictionary-encoded (codes + categories)
+CATEGORICAL_FIELDS = (
+    "symptoms",
+    "intent",
+    "issue_category",
+    "center_id",
+    "center_name",
+    "slot",
+    "priority",
+    "security_alerts",
+    "oem_quality_flag",
+    "recommended_action",
+)
+# list-valued fields, joined with LIST_SEP on disk
+LIST_FIELDS = ("symptoms", "security_alerts")
+LIST_SEP = "|"
+_INT_FIELDS = ("eta_minutes",)
+
+
+class CompactResult:
+    # Flat, slotted twin of the nested run() dict; to_result() rebuilds the nested form
+    __slots__ = RESULT_FIELDS
+
+    def __init__(self, *values):
+        for name, value in zip(RESULT_FIELDS, values):
+            setattr(self, name, value)
+
+    @classmethod
+    def from_result(cls, result: Dict) -> "CompactResult":
+        voice, feats, diag, sched, feedback = (
+            result["voice_summary"], result["telemetry_features"], result["diagnosis"], result["schedule"], result["oem_feedback"]
+        )
+        return cls(
+            voice["customer_id"],
+            tuple(voice["symptoms"]),
+            voice["severity"],
+            voice["intent"],
+            *(feats[k] for k in FEATURE_FIELDS),
+            diag["risk_score"],
+            diag["issue_category"],
+            sched["center_id"],
+            sched["center_name"],
+            sched["slot"],
+            sched["eta_minutes"],
+            sched["priority"],
+            tuple(result["security_alerts"]),
+            feedback["oem_quality_flag"],
+            feedback["recommended_action"],
+        )
+
+    def as_tuple(self) -> Tuple:
+        return tuple(getattr(self, k) for k in RESULT_FIELDS)
+
+    def to_result(self) -> Dict:
+        feats = {k: getattr(self, k) for k in FEATURE_FIELDS}
+        return {
+            "voice_summary": {"customer_id": self.customer_id, "symptoms": list(self.symptoms), "severity": self.severity, "intent": self.intent},
+            "telemetry_features": feats,
+            "diagnosis": {
+                "risk_score": self.risk_score,
+                "issue_category": self.issue_category,
+                "signals": {**feats, "voice_severity": self.severity},
+            },
+            "schedule": {
+                "center_id": self.center_id,
+                "center_name": self.center_name,
+                "slot": self.slot,
+                "eta_minutes": self.eta_minutes,
+                "priority": self.priority,
+            },
+            "security_alerts": list(self.security_alerts),
+            "oem_feedback": {"oem_quality_flag": self.oem_quality_flag, "recommended_action": self.recommended_action},
+            "analytics": {
+                "customer_id": self.customer_id,
+                "issue_category": self.issue_category,
+                "risk_score": self.risk_score,
+                "priority": self.priority,
+                "center_id": self.center_id,
+            },
+        }
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, CompactResult) and self.as_tuple() == other.as_tuple()
+
+    def __repr__(self) -> str:
+        return f"CompactResult({self.customer_id!r}, risk_score={self.risk_score!r}, issue_category={self.issue_category!r})"
+
+
+def to_columns(results: Sequence) -> Dict[str, list]:
+    # run()/run_batch() dicts or CompactResults -> {field: list of values}
+    rows = [r if isinstance(r, CompactResult) else CompactResult.from_result(r) for r in results]
+    return {k: [getattr(r, k) for r in rows] for k in RESULT_FIELDS}
+
+
+def from_columns(columns: Dict[str, Sequence]) -> List[CompactResult]:
+    return [CompactResult(*row) for row in zip(*(columns[k] for k in RESULT_FIELDS))]
+
+
+def _encode(columns: Dict[str, Sequence]) -> Dict[str, object]:
+    # -> numeric arrays, (codes, categories) for categoricals, utf-8 bytes for customer ids
+    out: Dict[str, object] = {}
+    for k in RESULT_FIELDS:
+        values = columns[k]
+        if k in LIST_FIELDS:
+            values = [LIST_SEP.join(v) for v in values]
+        if k in CATEGORICAL_FIELDS:
+            lookup: Dict[str, int] = {}
+            codes = np.fromiter((lookup.setdefault(v, len(lookup)) for v in values), dtype=np.int32, count=len(values))
+            out[k] = (codes, list(lookup))
+        elif k == "customer_id":
+            out[k] = np.array([str(v).encode("utf-8") for v in values], dtype=bytes)
+        else:
+            out[k] = np.asarray(values, dtype=np.int32 if k in _INT_FIELDS else np.float64)
+    return out
+
+
+def _decode_value(field: str, value):
+    if field in LIST_FIELDS:
+        return tuple(value.split(LIST_SEP)) if value else ()
+    return value
+
+
+def _parquet():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        return None
+    return pa, pq
+
+
+def default_format(path: str) -> str:
+    if path.endswith(".npz"):
+        return "npz"
+    if path.endswith(".parquet") or _parquet() is not None:
+        return "parquet"
+    return "npz"
+
+
+class ResultWriter:
+    # Columnar bulk writer for pipeline results.
+    #   parquet  one row group per write() via pyarrow, dictionary-encoded strings; memory stays at one batch
+    #   npz      NumPy fallback when pyarrow is missing; batches are kept encoded (codes + categories)
+    #            and written uncompressed on close() so ResultReader can memory-map every column
+    # write() accepts run()/run_batch() dicts, CompactResults, or a {field: values} dict
+    # such as VoiceGuardPipeline.run_columns() returns.
+    def __init__(self, path: str, format: Optional[str] = None):
+        self.path = path
+        self.format = format or default_format(path)
+        if self.format not in ("parquet", "npz"):
+            raise ValueError(f"unknown result format: {self.format}")
+        if self.format == "parquet" and _parquet() is None:
+            raise RuntimeError("parquet output needs pyarrow; install it or write .npz")
+        self.rows = 0
+        self._pq_writer = None
+        self._parts: List[Dict[str, object]] = []
+        self.closed = False
+
+    def __enter__(self) -> "ResultWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def write(self, results) -> int:
+        if self.closed:
+            raise ValueError("write to a closed ResultWriter")
+        columns = results if isinstance(results, dict) else to_columns(results)
+        encoded = _encode(columns)
+        n = len(encoded["severity"])
+        if self.format == "parquet":
+            self._write_parquet(encoded)
+        else:
+            self._parts.append(encoded)
+        self.rows += n
+        return n
+
+    def _write_parquet(self, encoded: Dict[str, object]) -> None:
+        pa, pq = _parquet()
+        arrays = []
+        for k in RESULT_FIELDS:
+            v = encoded[k]
+            if k in CATEGORICAL_FIELDS:
+                codes, cats = v
+                arrays.append(pa.DictionaryArray.from_arrays(pa.array(codes, pa.int32()), pa.array(cats, pa.string())))
+            elif k == "customer_id":
+                arrays.append(pa.array(np.char.decode(v, "utf-8"), pa.string()))
+            else:
+                arrays.append(pa.array(v))
+        table = pa.Table.from_arrays(arrays, names=list(RESULT_FIELDS))
+        if self._pq_writer is None:
+            self._pq_writer = pq.ParquetWriter(self.path, table.schema)
+        self._pq_writer.write_table(table)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        if self.format == "parquet":
+            if self._pq_writer is None:
+                self._write_parquet(_encode({k: [] for k in RESULT_FIELDS}))
+            self._pq_writer.close()
+            return
+        arrays: Dict[str, np.ndarray] = {}
+        parts = self._parts or [_encode({k: [] for k in RESULT_FIELDS})]
+        for k in RESULT_FIELDS:
+            if k in CATEGORICAL_FIELDS:
+                # merge per-batch dictionaries: remap each batch's codes into one category list
+                lookup: Dict[str, int] = {}
+                remapped = []
+                for part in parts:
+                    codes, cats = part[k]
+                    mapping = np.array([lookup.setdefault(c, len(lookup)) for c in cats], dtype=np.int32)
+                    remapped.append(mapping[codes] if len(cats) else codes)
+                arrays[k] = np.concatenate(remapped)
+                arrays[k + ".categories"] = np.array(list(lookup), dtype=str)
+            else:
+                arrays[k] = np.concatenate([part[k] for part in parts])
+        self._parts = []
+        with open(self.path, "wb") as f:  # a file object keeps np.savez from appending ".npz"
+            np.savez(f, **arrays)
+
+
+def _npz_memmaps(path: str) -> Dict[str, np.ndarray]:
+    # np.load() cannot memory-map inside an .npz, but np.savez stores members uncompressed,
+    # so each .npy payload is a contiguous byte range of the archive
+    out: Dict[str, np.ndarray] = {}
+    with zipfile.ZipFile(path) as zf, open(path, "rb") as f:
+        for info in zf.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"{path}: member {info.filename} is compressed and cannot be memory-mapped")
+            f.seek(info.header_offset)
+            local = f.read(30)
+            name_len, extra_len = struct.unpack("<HH", local[26:30])
+            f.seek(info.header_offset + 30 + name_len + extra_len)
+            version = np.lib.format.read_magic(f)
+            read_header = np.lib.format.read_array_header_1_0 if version == (1, 0) else np.lib.format.read_array_header_2_0
+            shape, fortran, dtype = read_header(f)
+            name = info.filename[:-4] if info.filename.endswith(".npy") else info.filename
+            if dtype.hasobject:
+                raise ValueError(f"{path}: member {name} holds Python objects")
+            if 0 in shape:
+                out[name] = np.empty(shape, dtype=dtype)
+            else:
+                out[name] = np.memmap(path, dtype=dtype, mode="r", offset=f.tell(), shape=shape, order="F" if fortran else "C")
+    return out
+
+
+class ResultReader:
+    # Read-only, memory-mapped view of a file written by ResultWriter.
+    # Numeric columns come back as zero-copy arrays; categoricals can be queried through
+    # their integer codes (codes()) without decoding a single string.
+    def __init__(self, path: str, format: Optional[str] = None):
+        self.path = path
+        self.format = format or ("npz" if path.endswith(".npz") else "parquet")
+        if self.format == "parquet":
+            lib = _parquet()
+            if lib is None:
+                raise RuntimeError("reading parquet needs pyarrow")
+            self._table = lib[1].read_table(path, memory_map=True).unify_dictionaries()
+            self._arrays = None
+            self._n = self._table.num_rows
+        else:
+            self._table = None
+            self._arrays = _npz_memmaps(path)
+            self._n = len(self._arrays["severity"])
+
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return RESULT_FIELDS
+
+    def codes(self, name: str) -> Tuple[np.ndarray, np.ndarray]:
+        # categorical column -> (int32 codes, categories)
+        if name not in CATEGORICAL_FIELDS:
+            raise KeyError(f"{name} is not a categorical column")
+        if self._table is not None:
+            col = self._table.column(name).combine_chunks()
+            return col.indices.to_numpy(zero_copy_only=False), np.asarray(col.dictionary.to_pylist(), dtype=str)
+        return self._arrays[name], self._arrays[name + ".categories"]
+
+    def column(self, name: str) -> np.ndarray:
+        if name in CATEGORICAL_FIELDS:
+            codes, cats = self.codes(name)
+            return cats[codes] if len(cats) else np.empty(0, dtype=str)
+        if self._table is not None:
+            return self._table.column(name).to_numpy()
+        values = self._arrays[name]
+        return np.char.decode(values, "utf-8") if name == "customer_id" else values
+
+    def record(self, i: int) -> CompactResult:
+        if not -self._n <= i < self._n:
+            raise IndexError(i)
+        values = []
+        for k in RESULT_FIELDS:
+            if self._table is not None:
+                v = self._table.column(k)[i].as_py()
+            elif k in CATEGORICAL_FIELDS:
+                v = str(self._arrays[k + ".categories"][self._arrays[k][i]])
+            elif k == "customer_id":
+                v = self._arrays[k][i].decode("utf-8")
+            else:
+                v = self._arrays[k][i].item()
+            values.append(_decode_value(k, v))
+        return CompactResult(*values)
+
+    def __iter__(self) -> Iterable[CompactResult]:
+        return (self.record(i) for i in range(self._n))
+
+    def to_frame(self, columns: Optional[Sequence[str]] = None):
+        import pandas as pd
+        data = {}
+        for k in columns or RESULT_FIELDS:
+            if k in CATEGORICAL_FIELDS:
+                codes, cats = self.codes(k)
+                data[k] = pd.Categorical.from_codes(np.asarray(codes), categories=list(cats)) if len(cats) else pd.Categorical([])
+            else:
+                data[k] = self.column(k)
+        return pd.DataFrame(data)
+
+    def group_mean(self, by: str, value: str = "risk_score") -> Dict[str, float]:
+        # e.g. mean risk per issue_category, straight from codes + a memory-mapped column
+        codes, cats = self.codes(by)
+        values = np.asarray(self.column(value), dtype=float)
+        counts = np.bincount(codes, minlength=len(cats))
+        sums = np.bincount(codes, weights=values, minlength=len(cats))
+        return {str(c): float(s / n) for c, s, n in zip(cats, sums, counts) if n}
@@ -0,0 +1,182 @@
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import heapq
+import threading
+import time
+import numpy as np
+from .geo import CenterIndex
+
+
+# earliest start after the request, same lead times SchedulingAgent has always used
+LEAD_MINUTES = {"urgent": 60, "normal": 3 * 24 * 60}
+# how much later than a center's first open slot we accept before spilling to the next center
+MAX_WAIT_MINUTES = {"urgent": 4 * 60, "normal": 2 * 24 * 60}
+# farthest a booking spills past the nearest center; beyond it the request is waitlisted
+MAX_SPILL_KM = 150.0
+
+
+@dataclass
+class Booking:
+    center: Dict
+    distance_km: float
+    slot_ts: Optional[float]  # None: waitlisted at `center`, no slot held
+    priority: str
+
+    @property
+    def waitlisted(self) -> bool:
+        return self.slot_ts is None
+
+
+class _CenterBook:
+    # Per-center slot grid. Slot s covers [s * slot_s, (s + 1) * slot_s) in *local* seconds.
+    # `parent` is a union-find "next candidate slot" map: full or closed slots point
+    # forward, and path compression keeps find() amortized near O(1).
+    __slots__ = ("bays", "open_min", "close_min", "booked", "parent")
+
+    def __init__(self, bays: int, open_hour: float, close_hour: float):
+        if bays < 1:
+            raise ValueError("a service center needs at least one bay")
+        if not (0 <= open_hour <= 24 and 0 <= close_hour <= 24) or open_hour == close_hour:
+            raise ValueError(f"opening hours {open_hour}-{close_hour} are not a window within 0-24")
+        self.bays = bays
+        self.open_min = int(open_hour * 60)
+        self.close_min = int(close_hour * 60)
+        self.booked: Dict[int, int] = {}
+        self.parent: Dict[int, int] = {}
+
+
+class SlotAllocator:
+    def __init__(
+        self,
+        centers,
+        bays: int = 4,
+        open_hour: float = 9,
+        close_hour: float = 18,
+        slot_minutes: int = 60,
+        utc_offset_minutes: int = 330,
+        spill_candidates: int = 5,
+        max_spill_km: float = MAX_SPILL_KM,
+        clock: Callable[[], float] = time.time,
+    ):
+        # centers: a CenterIndex or a list of center dicts. Per-center overrides are read
+        # from the optional catalog keys "bays", "open_hour" and "close_hour"; open_hour >
+        # close_hour is a window past midnight (e.g. 20 -> 6).
+        self.index = centers if isinstance(centers, CenterIndex) else CenterIndex(centers)
+        self.slot_minutes = slot_minutes
+        self.slot_s = slot_minutes * 60
+        self.utc_offset_s = utc_offset_minutes * 60
+        self.spill_candidates = spill_candidates
+        self.max_spill_km = max_spill_km
+        self.clock = clock
+        self._books = []
+        for c in self.index.centers:
+            try:
+                book = _CenterBook(int(c.get("bays", bays)), float(c.get("open_hour", open_hour)), float(c.get("close_hour", close_hour)))
+                self._next_open(book, 0)
+            except ValueError as e:
+                raise ValueError(f"service center {c['id']}: {e}") from None
+            self._books.append(book)
+        self._lock = threading.Lock()
+
+    def _is_open(self, book: _CenterBook, s: int) -> bool:
+        start = (s * self.slot_minutes) % 1440
+        if book.open_min < book.close_min:
+            return book.open_min <= start and start + self.slot_minutes <= book.close_min
+        # overnight window [open, 24:00) + [00:00, close): a slot may cross midnight
+        if start >= book.open_min:
+            return start + self.slot_minutes <= 1440 + book.close_min
+        return start + self.slot_minutes <= book.close_min
+
+    def _next_open(self, book: _CenterBook, s: int) -> int:
+        # first slot >= s inside opening hours (ignores bookings)
+        day = 1440 // self.slot_minutes
+        for _ in range(day + 1):
+            if self._is_open(book, s):
+                return s
+            s += 1
+        raise ValueError("opening hours contain no whole slot")
+
+    def _find(self, book: _CenterBook, s: int) -> int:
+        path = []
+        parent = book.parent
+        while True:
+            nxt = parent.get(s)
+            if nxt is None:
+                if not self._is_open(book, s):
+                    nxt = self._next_open(book, s)
+                elif book.booked.get(s, 0) >= book.bays:
+                    nxt = s + 1
+                else:
+                    break
+                parent[s] = nxt
+            path.append(s)
+            s = nxt
+        for p in path:
+            parent[p] = s
+        return s
+
+    def _take(self, book: _CenterBook, s: int) -> None:
+        n = book.booked.get(s, 0) + 1
+        book.booked[s] = n
+        if n >= book.bays:
+            book.parent[s] = s + 1
+
+    def _first_slot(self, now: float, priority: str) -> int:
+        local = now + self.utc_offset_s + LEAD_MINUTES[priority] * 60
+        return -(-int(local) // self.slot_s)  # ceil to the slot grid
+
+    def _book_candidates(self, cand_idx: Sequence[int], cand_dist: Sequence[float], start: int, priority: str) -> Booking:
+        # nearest center with a slot within MAX_WAIT of its first opening, spilling only to
+        # centers within max_spill_km; if none has one, waitlisted at the nearest center
+        max_wait = MAX_WAIT_MINUTES[priority] * 60 // self.slot_s
+        for rank, (ci, dist) in enumerate(zip(cand_idx, cand_dist)):
+            if rank and dist > self.max_spill_km:
+                break
+            book = self._books[ci]
+            s = self._find(book, start)
+            if s - self._next_open(book, start) <= max_wait:
+                self._take(book, s)
+                return Booking(
+                    center=self.index.centers[ci],
+                    distance_km=float(dist),
+                    slot_ts=float(s * self.slot_s - self.utc_offset_s),
+                    priority=priority,
+                )
+        return Booking(center=self.index.centers[cand_idx[0]], distance_km=float(cand_dist[0]), slot_ts=None, priority=priority)
+
+    def book(self, customer_loc: Tuple[float, float], priority: str) -> Booking:
+        cands = self.index.nearest_indices(customer_loc, self.spill_candidates)
+        with self._lock:
+            start = self._first_slot(self.clock(), priority)
+            return self._book_candidates([i for i, _ in cands], [d for _, d in cands], start, priority)
+
+    def allocate_batch(self, lats, lons, risk, priorities) -> List[Booking]:
+        # Bulk mode: urgent before normal, then highest risk first (ties keep input order);
+        # returns bookings in input order
+        lats = np.asarray(lats, dtype=float)
+        cand_idx, cand_dist = self.index.nearest_batch(lats, lons, self.spill_candidates)
+        risk = np.asarray(risk, dtype=float).tolist()
+        priorities = list(priorities)
+        heap = [(p != "urgent", -r, i) for i, (r, p) in enumerate(zip(risk, priorities))]
+        heapq.heapify(heap)
+        out: List[Optional[Booking]] = [None] * len(risk)
+        cand_idx, cand_dist = cand_idx.tolist(), cand_dist.tolist()
+        with self._lock:
+            now = self.clock()
+            starts = {p: self._first_slot(now, p) for p in LEAD_MINUTES}
+            while heap:
+                _, _, i = heapq.heappop(heap)
+                out[i] = self._book_candidates(cand_idx[i], cand_dist[i], starts[priorities[i]], priorities[i])
+        return out
+
+    def load(self) -> Dict[str, int]:
+        # bookings currently held per center id
+        return {c["id"]: sum(b.booked.values()) for c, b in zip(self.index.centers, self._books)}
+
+    def prune(self, before_ts: Optional[float] = None) -> None:
+        # drop bookkeeping for slots that already started; finds never look back past "now"
+        cutoff = int((self.clock() if before_ts is None else before_ts) + self.utc_offset_s) // self.slot_s
+        with self._lock:
+            for book in self._books:
+                book.booked = {s: n for s, n in book.booked.items() if s >= cutoff}
+                book.parent = {s: p for s, p in book.parent.items() if s >= cutoff}
@@ -0,0 +1,199 @@
+from typing import Dict, Iterator, Optional, Sequence
+import numpy as np
+from .agents import DiagnosisAgent, TelemetryAgent
+from .inference import FEATURES
+from .pipeline import _customer_columns, _telemetry_columns
+
+
+# raw model inputs + position, then the normalized features TelemetryAgent derives
+# (error_code_count is both, so it is stored once), then the latest risk
+NORM_FIELDS = ("engine_temp_norm", "battery_drop_norm", "oil_pressure_low_norm", "vibration_norm", "speed_norm", "odometer_norm")
+COLUMNS = (*FEATURES, "lat", "lon", *NORM_FIELDS, "risk_score")
+_ROW = {name: i for i, name in enumerate(COLUMNS)}
+
+
+class FleetState:
+    # Struct-of-arrays state for N vehicles: one float64 block of shape (len(COLUMNS), N),
+    # each row a contiguous column. fleet[i] is a VehicleView and fleet[a:b] a FleetState
+    # over the same memory; neither copies. About 8 bytes per field per vehicle, versus
+    # ~100 bytes per boxed float once Telemetry objects and feature dicts are involved.
+    # extend() appends vehicles into spare capacity, doubling the block when it runs out
+    # (amortized O(1) per vehicle). A reallocation leaves existing fleet[a:b] slices on
+    # the old block; VehicleViews always follow the fleet.
+    __slots__ = ("_buf", "_n", "_ids")
+
+    def __init__(self, n: int, ids: Optional[Sequence[str]] = None, _block: Optional[np.ndarray] = None):
+        # _buf: (len(COLUMNS), capacity) with the first _n columns live; _ids: capacity entries or None
+        self._buf = np.zeros((len(COLUMNS), n)) if _block is None else _block
+        self._n = n
+        # ids: optional array of vehicle ids; a numpy string array keeps them out of the object heap
+        self._ids = None if ids is None else np.asarray(ids)
+        if self._ids is not None and len(self._ids) != n:
+            raise ValueError("ids must have one entry per vehicle")
+
+    @classmethod
+    def from_columns(cls, cols: Dict[str, np.ndarray], ids: Optional[Sequence[str]] = None) -> "FleetState":
+        # cols: FEATURES arrays (as pipeline._telemetry_columns returns), optionally lat/lon
+        fleet = cls(0)
+        fleet.extend(cols, ids)
+        return fleet
+
+    @classmethod
+    def from_records(cls, telemetry, customers=None) -> "FleetState":
+        # telemetry/customers: the list-of-dicts or DataFrame shapes run_batch accepts
+        fleet = cls(0)
+        fleet.extend_records(telemetry, customers)
+        return fleet
+
+    @property
+    def _block(self) -> np.ndarray:
+        return self._buf[:, :self._n]
+
+    @property
+    def ids(self) -> Optional[np.ndarray]:
+        return None if self._ids is None else self._ids[:self._n]
+
+    @property
+    def capacity(self) -> int:
+        return self._buf.shape[1]
+
+    def reserve(self, capacity: int) -> None:
+        # room for `capacity` vehicles without another reallocation
+        if capacity <= self.capacity:
+            return
+        buf = np.zeros((len(COLUMNS), capacity))
+        buf[:, :self._n] = self._block
+        self._buf = buf
+        if self._ids is not None:
+            ids = np.zeros(capacity, dtype=self._ids.dtype)
+            ids[:self._n] = self.ids
+            self._ids = ids
+
+    def extend(self, cols: Dict[str, np.ndarray], ids: Optional[Sequence[str]] = None) -> slice:
+        # appends vehicles given as from_columns() arrays; returns their index range.
+        # Ids are given with every batch or with none.
+        k = len(cols[FEATURES[0]])
+        if ids is not None:
+            ids = np.asarray(ids)
+            if len(ids) != k:
+                raise ValueError("ids must have one entry per vehicle")
+        if self._n and (ids is None) != (self._ids is None):
+            raise ValueError("ids must be given for every batch or for none")
+        start, end = self._n, self._n + k
+        if end > self.capacity:
+            self.reserve(max(end, 2 * self.capacity))
+        if ids is not None:
+            if self._ids is None:
+                self._ids = np.zeros(self.capacity, dtype=ids.dtype)
+            elif ids.dtype.itemsize > self._ids.dtype.itemsize:
+                # a longer id than any so far: widen the fixed-width string buffer
+                self._ids = self._ids.astype(np.result_type(self._ids, ids))
+            self._ids[start:end] = ids
+        block = self._buf
+        for name, values in cols.items():
+            if name in _ROW:
+                block[_ROW[name], start:end] = values
+        self._n = end
+        return slice(start, end)
+
+    def extend_records(self, telemetry, customers=None) -> slice:
+        cols = _telemetry_columns(telemetry)
+        ids = None
+        if customers is not None:
+            ids, cols["lat"], cols["lon"] = _customer_columns(customers)
+            ids = np.array(ids, dtype=str)
+        return self.extend(cols, ids)
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return FleetState(len(range(*key.indices(len(self)))), None if self.ids is None else self.ids[key], self._block[:, key])
+        n = len(self)
+        if not -n <= key < n:
+            raise IndexError(key)
+        return VehicleView(self, key % n)
+
+    def __iter__(self) -> Iterator["VehicleView"]:
+        return (VehicleView(self, i) for i in range(len(self)))
+
+    def column(self, name: str) -> np.ndarray:
+        # writable view; assigning into it updates the fleet
+        return self._block[_ROW[name]]
+
+    def telemetry_columns(self) -> Dict[str, np.ndarray]:
+        return {k: self._block[_ROW[k]] for k in FEATURES}
+
+    def feature_columns(self) -> Dict[str, np.ndarray]:
+        # same keys as TelemetryAgent.process_batch
+        feats = {k: self._block[_ROW[k]] for k in NORM_FIELDS}
+        feats["error_code_count"] = self._block[_ROW["error_code_count"]]
+        return feats
+
+    def update_features(self, agent: Optional[TelemetryAgent] = None) -> None:
+        feats = (agent or TelemetryAgent()).process_batch(self.telemetry_columns())
+        for k in NORM_FIELDS:
+            self._block[_ROW[k]] = feats[k]
+
+    def update_risk(self, agent: DiagnosisAgent, severity: Optional[np.ndarray] = None, symptoms=None) -> np.ndarray:
+        # scores every vehicle in place (no voice input unless severity/symptoms are given); returns categories
+        n = len(self)
+        raw = TelemetryAgent.raw_matrix(self.telemetry_columns()) if agent.model_obj is not None else None
+        risk, categories = agent.process_batch(
+            symptoms if symptoms is not None else [()] * n,
+            severity if severity is not None else np.zeros(n),
+            self.feature_columns(),
+            raw,
+        )
+        self._block[_ROW["risk_score"]] = np.round(risk, 3)
+        return categories
+
+    @property
+    def nbytes(self) -> int:
+        # held memory, spare capacity included
+        return self._buf.nbytes + (0 if self._ids is None else self._ids.nbytes)
+
+
+class VehicleView:
+    # One vehicle of a FleetState: attribute reads and writes go straight to the arrays
+    __slots__ = ("_fleet", "_i")
+
+    def __init__(self, fleet: FleetState, i: int):
+        object.__setattr__(self, "_fleet", fleet)
+        object.__setattr__(self, "_i", i)
+
+    @property
+    def index(self) -> int:
+        return self._i
+
+    @property
+    def id(self) -> Optional[str]:
+        ids = self._fleet._ids
+        return None if ids is None else str(ids[self._i])
+
+    def __getattr__(self, name: str) -> float:
+        row = _ROW.get(name)
+        if row is None:
+            raise AttributeError(name)
+        return float(self._fleet._buf[row, self._i])
+
+    def __setattr__(self, name: str, value: float) -> None:
+        row = _ROW.get(name)
+        if row is None:
+            raise AttributeError(name)
+        self._fleet._buf[row, self._i] = value
+
+    def raw_features(self) -> Dict[str, float]:
+        # same shape as TelemetryAgent.raw_features
+        return {k: float(self._fleet._buf[_ROW[k], self._i]) for k in FEATURES}
+
+    def features(self) -> Dict[str, float]:
+        # same shape as TelemetryAgent.process
+        block, i = self._fleet._buf, self._i
+        feats = {k: float(block[_ROW[k], i]) for k in NORM_FIELDS}
+        feats["error_code_count"] = float(block[_ROW["error_code_count"], i])
+        return feats
+
+    def __repr__(self) -> str:
+        return f"VehicleView({self.id if self.id is not None else self._i!r}, risk_score={self.risk_score})"
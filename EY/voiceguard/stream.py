@@ -0,0 +1,227 @@
+from array import array
+from collections import OrderedDict, deque
+from typing import Dict, Iterable, Iterator, Optional, TextIO, Tuple
+import json
+import math
+import sys
+import time
+from .inference import FEATURES
+from .pipeline import DEFAULT_LOCATION, TELEMETRY_DEFAULTS
+
+
+# normalization spans from TelemetryAgent.process, used to compare drift across features
+DRIFT_SCALE = {
+    "engine_temp_c": 50.0,
+    "battery_voltage": 3.0,
+    "oil_pressure_psi": 40.0,
+    "vibration_g": 2.0,
+    "speed_kph": 180.0,
+    "odometer_km": 200000.0,
+    "error_code_count": 1.0,
+}
+
+
+class RingBuffer:
+    # Fixed-capacity float ring; push() returns the evicted value once full
+    __slots__ = ("_buf", "capacity", "_head", "_size")
+
+    def __init__(self, capacity: int):
+        self._buf = array("d", bytes(8 * capacity))
+        self.capacity = capacity
+        self._head = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def push(self, value: float) -> Optional[float]:
+        evicted = self._buf[self._head] if self._size == self.capacity else None
+        self._buf[self._head] = value
+        self._head = (self._head + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+        return evicted
+
+    def values(self):
+        start = (self._head - self._size) % self.capacity
+        for i in range(self._size):
+            yield self._buf[(start + i) % self.capacity]
+
+    def nbytes(self) -> int:
+        return sys.getsizeof(self._buf)
+
+
+class VehicleWindow:
+    # Rolling per-vehicle state, O(1) per sample:
+    #   ewma      exponentially weighted mean of every model feature
+    #   slope     least-squares engine-temp slope (degC/s) over the window, via running sums
+    #   min_batt  window minimum battery voltage via a monotonic deque (amortized O(1))
+    __slots__ = ("t", "y", "ewma", "_sums", "_t0", "_minq", "_seq", "samples", "last_scored")
+
+    def __init__(self, capacity: int):
+        self.t = RingBuffer(capacity)
+        self.y = RingBuffer(capacity)
+        self.ewma: Optional[array] = None
+        self._sums = [0.0, 0.0, 0.0, 0.0]  # sum t, sum t^2, sum y, sum t*y
+        self._t0: Optional[float] = None
+        self._minq: deque = deque()
+        self._seq = 0
+        self.samples = 0
+        self.last_scored: Optional[array] = None
+
+    def update(self, ts: float, feats: Tuple[float, ...], alpha: float) -> None:
+        if self._t0 is None:
+            self._t0 = ts
+        t = ts - self._t0
+        temp, volts = feats[0], feats[1]
+        old_t = self.t.push(t)
+        old_y = self.y.push(temp)
+        s = self._sums
+        s[0] += t
+        s[1] += t * t
+        s[2] += temp
+        s[3] += t * temp
+        if old_t is not None:
+            s[0] -= old_t
+            s[1] -= old_t * old_t
+            s[2] -= old_y
+            s[3] -= old_t * old_y
+        self._seq += 1
+        if self._seq % (64 * self.t.capacity) == 0:
+            self._resum()
+        q = self._minq
+        while q and q[-1][1] >= volts:
+            q.pop()
+        q.append((self._seq, volts))
+        while q[0][0] <= self._seq - self.t.capacity:
+            q.popleft()
+        if self.ewma is None:
+            self.ewma = array("d", feats)
+        else:
+            e = self.ewma
+            for i, v in enumerate(feats):
+                e[i] += alpha * (v - e[i])
+        self.samples += 1
+
+    def _resum(self) -> None:
+        # re-derive running sums from the buffers now and then so float drift cannot accumulate
+        ts, ys = list(self.t.values()), list(self.y.values())
+        self._sums = [sum(ts), sum(t * t for t in ts), sum(ys), sum(t * y for t, y in zip(ts, ys))]
+
+    @property
+    def slope(self) -> float:
+        n = len(self.t)
+        st, stt, sy, sty = self._sums
+        den = n * stt - st * st
+        return (n * sty - st * sy) / den if n > 1 and den > 1e-12 else 0.0
+
+    @property
+    def min_battery(self) -> float:
+        return self._minq[0][1]
+
+    def stats(self) -> Dict:
+        return {
+            "samples": self.samples,
+            "ewma": dict(zip(FEATURES, self.ewma)),
+            "engine_temp_slope_c_per_s": self.slope,
+            "min_battery_voltage": self.min_battery,
+        }
+
+    def nbytes(self) -> int:
+        # buffers, EWMA snapshots and the min-deque (<= window entries of (int, float) tuples)
+        n = sys.getsizeof(self) + self.t.nbytes() + self.y.nbytes() + sys.getsizeof(self._sums)
+        n += sys.getsizeof(self._minq) + len(self._minq) * (sys.getsizeof((0, 0.0)) + 28 + 24)
+        for a in (self.ewma, self.last_scored):
+            if a is not None:
+                n += sys.getsizeof(a)
+        return n
+
+
+class StreamProcessor:
+    # Consumes telemetry records (telemetry_sample.json shape plus optional "vehicle_id",
+    # "ts", "voice_text", "customer") and yields a pipeline result whenever a vehicle's
+    # smoothed features drift by more than `threshold` (normalized units) since it was last scored.
+    # Records whose features or timestamp are not finite numbers are counted in `skipped` and
+    # dropped before they touch any vehicle state, the way read_ndjson drops malformed lines.
+    def __init__(self, pipeline, window: int = 32, alpha: float = 0.2, threshold: float = 0.02, max_vehicles: Optional[int] = None):
+        self.pipeline = pipeline
+        self.window = window
+        self.alpha = alpha
+        self.threshold = threshold
+        self.max_vehicles = max_vehicles
+        self.vehicles: "OrderedDict[str, VehicleWindow]" = OrderedDict()
+        self.received = 0
+        self.rescored = 0
+        self.skipped = 0
+
+    def _drifted(self, w: VehicleWindow) -> bool:
+        if w.last_scored is None:
+            return True
+        for i, k in enumerate(FEATURES):
+            if abs(w.ewma[i] - w.last_scored[i]) / DRIFT_SCALE[k] > self.threshold:
+                return True
+        return False
+
+    @staticmethod
+    def _parse(record: Dict) -> Optional[Tuple[float, Tuple[float, ...]]]:
+        try:
+            feats = tuple(
+                float(len(record.get("error_codes") or [])) if k == "error_code_count" else float(record.get(k, TELEMETRY_DEFAULTS[k]))
+                for k in FEATURES
+            )
+            ts = float(record.get("ts", time.time()))
+        except (TypeError, ValueError):
+            return None
+        if not math.isfinite(ts) or not all(math.isfinite(v) for v in feats):
+            return None
+        return ts, feats
+
+    def feed(self, record: Dict) -> Optional[Dict]:
+        self.received += 1
+        parsed = self._parse(record) if isinstance(record, dict) else None
+        if parsed is None:
+            self.skipped += 1
+            return None
+        ts, feats = parsed
+        customer = record.get("customer") or {}
+        vid = str(record.get("vehicle_id") or customer.get("id") or "unknown")
+        w = self.vehicles.get(vid)
+        if w is None:
+            w = self.vehicles[vid] = VehicleWindow(self.window)
+            if self.max_vehicles is not None and len(self.vehicles) > self.max_vehicles:
+                self.vehicles.popitem(last=False)  # drop the longest-idle vehicle
+        else:
+            self.vehicles.move_to_end(vid)
+        w.update(ts, feats, self.alpha)
+        if not self._drifted(w):
+            return None
+        w.last_scored = array("d", w.ewma)
+        self.rescored += 1
+        cust = {"id": customer.get("id", vid), "location": customer.get("location", record.get("location", DEFAULT_LOCATION))}
+        result = self.pipeline.run(record.get("voice_text", ""), record, cust)
+        result["vehicle_id"] = vid
+        result["stream"] = w.stats()
+        return result
+
+    def process(self, records: Iterable[Dict]) -> Iterator[Dict]:
+        for record in records:
+            result = self.feed(record)
+            if result is not None:
+                yield result
+
+    def memory_bytes(self) -> int:
+        return sum(w.nbytes() for w in self.vehicles.values())
+
+
+def read_ndjson(fp: TextIO) -> Iterator[Dict]:
+    # one JSON object per line; blank and malformed lines are skipped
+    for line in fp:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            obj = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(obj, dict):
+            yield obj
@@ -0,0 +1,215 @@
+from typing import Dict, Iterator, List, Optional, Tuple
+import json
+import time
+import numpy as np
+from .agents import VoiceCustomerAgent
+
+
+# Vectorized twin of train.generate_synthetic: same distributions, rounding and labeling
+# formula, drawn with NumPy one BLOCK_ROWS block at a time. Block k always comes from
+# default_rng([seed, k]) and is drawn in full, so row i depends only on (seed, i): any n
+# gives a prefix of the same fleet, in every output format.
+BLOCK_ROWS = 100_000
+TRAIN_COLUMNS = [
+    "engine_temp_c",
+    "battery_voltage",
+    "oil_pressure_psi",
+    "vibration_g",
+    "speed_kph",
+    "odometer_km",
+    "error_code_count",
+    "label",
+]
+ERROR_CODES = ("P0300", "P0301", "P0302", "P0420", "P0520", "P0562", "P0128", "P0171")
+FORMATS = ("csv", "ndjson", "npy")
+# binary format: one record per vehicle in a structured .npy (np.load(..., mmap_mode="r") maps it)
+NPY_DTYPE = np.dtype([
+    ("engine_temp_c", "<f8"),
+    ("battery_voltage", "<f8"),
+    ("oil_pressure_psi", "<f8"),
+    ("vibration_g", "<f8"),
+    ("speed_kph", "<f8"),
+    ("odometer_km", "<i8"),
+    ("error_code_count", "<i4"),
+    ("label", "i1"),
+    ("lat", "<f8"),
+    ("lon", "<f8"),
+])
+FILLER = (
+    "Hi I'm calling about my car.",
+    "It started last week.",
+    "I drive mostly in the city.",
+    "Not sure if it is related to the last service.",
+    "Someone at home noticed it first.",
+    "Could someone take a look?",
+)
+URGENT_PHRASES = {
+    "urgent": "It's urgent.",
+    "immediately": "Please come immediately.",
+    "breakdown": "I had a breakdown on the road.",
+    "won't start": "This morning it won't start.",
+}
+
+
+def synthetic_block(n: int = BLOCK_ROWS, seed: int = 42, block: int = 0) -> Dict[str, np.ndarray]:
+    # rows [block * BLOCK_ROWS, block * BLOCK_ROWS + n) of the fleet for this seed
+    cols = _draw_block(seed, block)
+    return cols if n == BLOCK_ROWS else {k: v[:n] for k, v in cols.items()}
+
+
+def _draw_block(seed: int, block: int) -> Dict[str, np.ndarray]:
+    rng = np.random.default_rng([seed, block])
+    n = BLOCK_ROWS
+    engine = rng.normal(92, 8, n)
+    battery = rng.normal(12.4, 0.5, n)
+    oil = rng.normal(35, 6, n)
+    vib = np.maximum(0.0, rng.normal(0.5, 0.25, n))
+    speed = np.maximum(0.0, rng.normal(45, 20, n))
+    odo = np.maximum(0.0, rng.normal(60000, 30000, n))
+    codes = np.abs(rng.normal(1.0, 1.0, n)).astype(np.int64)
+    risk_score = (
+        (engine - 90) * 0.03
+        + (12.5 - battery) * 0.4
+        + (40 - oil) * 0.02
+        + vib * 0.6
+        + (odo / 200000) * 0.3
+        + (codes / 5.0) * 0.5
+    )
+    label = (risk_score + rng.normal(0, 0.2, n) > 0.9).astype(np.int8)
+    return {
+        "engine_temp_c": engine.round(2),
+        "battery_voltage": battery.round(2),
+        "oil_pressure_psi": oil.round(2),
+        "vibration_g": vib.round(3),
+        "speed_kph": speed.round(1),
+        "odometer_km": odo.astype(np.int64),
+        "error_code_count": codes,
+        "label": label,
+        # fleet-only fields (not in the training CSV): position across India, first error code
+        "lat": rng.uniform(8.0, 30.0, n),
+        "lon": rng.uniform(70.0, 88.0, n),
+        "code_start": rng.integers(0, len(ERROR_CODES), n),
+    }
+
+
+def iter_blocks(n: int, seed: int = 42) -> Iterator[Tuple[int, Dict[str, np.ndarray]]]:
+    # -> (index of the first row, columns); memory is bounded by BLOCK_ROWS
+    for block, first in enumerate(range(0, n, BLOCK_ROWS)):
+        yield first, synthetic_block(min(BLOCK_ROWS, n - first), seed, block)
+
+
+def transcripts(cols: Dict[str, np.ndarray], seed: int = 42, block: int = 0) -> List[str]:
+    # Voice transcripts that agree with the telemetry: a symptom is mentioned when its
+    # reading is out of range (plus a few unrelated complaints), urgency follows the label.
+    # draws are full-block sized like _draw_block, so a row's transcript doesn't depend on n
+    rng = np.random.default_rng([seed, block, 1])
+    n, m = len(cols["label"]), BLOCK_ROWS
+    kw = VoiceCustomerAgent.KEYWORDS
+    said = {
+        "overheat": cols["engine_temp_c"] > 100,
+        "battery": cols["battery_voltage"] < 11.8,
+        "oil": cols["oil_pressure_psi"] < 28,
+        "vibration": cols["vibration_g"] > 0.8,
+        "stall": rng.random(m)[:n] < 0.05,
+        "brake": rng.random(m)[:n] < 0.05,
+    }
+    picks = {s: rng.integers(0, len(kw[s]), m)[:n] for s in said}
+    filler = rng.integers(0, len(FILLER), m)[:n]
+    urgent = (cols["label"] == 1) & (rng.random(m)[:n] < 0.5)
+    urgent_pick = rng.integers(0, len(VoiceCustomerAgent.URGENT_TERMS), m)[:n]
+    booking = rng.random(m)[:n] < 0.3
+    out = []
+    for i in range(n):
+        parts = [FILLER[filler[i]]]
+        parts += [f"There is a {kw[s][picks[s][i]]} problem." for s, mask in said.items() if mask[i]]
+        if urgent[i]:
+            term = VoiceCustomerAgent.URGENT_TERMS[urgent_pick[i]]
+            parts.append(URGENT_PHRASES.get(term, f"It's {term}."))
+        if booking[i]:
+            parts.append("I'd like a service appointment.")
+        out.append(" ".join(parts))
+    return out
+
+
+def _error_code_lists(cols: Dict[str, np.ndarray]) -> List[str]:
+    # JSON text of each row's error_codes: `count` consecutive codes from a random start
+    cache: Dict[Tuple[int, int], str] = {}
+    out = []
+    for start, count in zip(cols["code_start"].tolist(), cols["error_code_count"].tolist()):
+        text = cache.get((start, count))
+        if text is None:
+            text = cache[(start, count)] = json.dumps([ERROR_CODES[(start + j) % len(ERROR_CODES)] for j in range(count)])
+        out.append(text)
+    return out
+
+
+def write_synthetic(path: str, n: int, seed: int = 42, format: Optional[str] = None, voice: bool = False) -> Dict:
+    # format: csv (train.generate_synthetic columns; with voice=True also vehicle_id, lat, lon,
+    # voice_text as score_fleet.py reads them), ndjson (telemetry_sample.json shape plus
+    # vehicle_id, label and optionally voice_text) or npy (structured binary, no voice).
+    format = format or ("ndjson" if path.endswith((".ndjson", ".jsonl")) else "npy" if path.endswith(".npy") else "csv")
+    if format not in FORMATS:
+        raise ValueError(f"unknown format {format!r}; expected one of {FORMATS}")
+    if format == "npy" and voice:
+        raise ValueError("voice transcripts need csv or ndjson output")
+    t0 = time.perf_counter()
+    if format == "npy":
+        out = np.lib.format.open_memmap(path, mode="w+", dtype=NPY_DTYPE, shape=(n,))
+        for first, cols in iter_blocks(n, seed):
+            block = out[first:first + len(cols["label"])]
+            for name in NPY_DTYPE.names:
+                block[name] = cols[name]
+        out.flush()
+        del out
+    else:
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            for block, (first, cols) in enumerate(iter_blocks(n, seed)):
+                texts = transcripts(cols, seed, block) if voice else None
+                if format == "csv":
+                    _write_csv_block(f, first, cols, texts)
+                else:
+                    _write_ndjson_block(f, first, cols, texts)
+    seconds = time.perf_counter() - t0
+    return {"rows": n, "format": format, "seconds": seconds, "rows_per_s": n / seconds if seconds > 0 else 0.0}
+
+
+def _csv_field(text: str) -> str:
+    return '"' + text.replace('"', '""') + '"' if any(c in text for c in ',"\n') else text
+
+
+def _write_csv_block(f, first: int, cols: Dict[str, np.ndarray], texts: Optional[List[str]]) -> None:
+    # str() of the rounded floats gives the same text generate_synthetic's csv.writer does,
+    # at a fraction of DataFrame.to_csv's cost
+    names = list(TRAIN_COLUMNS)
+    fields = [map(str, cols[k].tolist()) for k in TRAIN_COLUMNS]
+    if texts is not None:
+        names += ["vehicle_id", "lat", "lon", "voice_text"]
+        fields += [
+            (f"VEH-{i:08d}" for i in range(first, first + len(texts))),
+            map(str, cols["lat"].round(5).tolist()),
+            map(str, cols["lon"].round(5).tolist()),
+            map(_csv_field, texts),
+        ]
+    if first == 0:
+        f.write(",".join(names) + "\n")
+    f.write("\n".join(map(",".join, zip(*fields))) + "\n")
+
+
+def _write_ndjson_block(f, first: int, cols: Dict[str, np.ndarray], texts: Optional[List[str]]) -> None:
+    # formatted directly: json.dumps per row costs more than the whole draw
+    rows = zip(
+        range(first, first + len(cols["label"])),
+        *(cols[k].tolist() for k in ("engine_temp_c", "battery_voltage", "oil_pressure_psi", "vibration_g", "speed_kph", "odometer_km", "label")),
+        _error_code_lists(cols),
+        cols["lat"].round(5).tolist(),
+        cols["lon"].round(5).tolist(),
+    )
+    voice = [", \"voice_text\": " + json.dumps(t) for t in texts] if texts is not None else None
+    lines = []
+    for j, (i, temp, batt, oil, vib, speed, odo, label, codes, lat, lon) in enumerate(rows):
+        lines.append(
+            f'{{"vehicle_id": "VEH-{i:08d}", "engine_temp_c": {temp}, "battery_voltage": {batt}, "oil_pressure_psi": {oil}, '
+            f'"vibration_g": {vib}, "speed_kph": {speed}, "odometer_km": {odo}, "error_codes": {codes}, '
+            f'"location": [{lat}, {lon}], "label": {label}{voice[j] if voice else ""}}}\n'
+        )
+    f.write("".join(lines))
@@ -0,0 +1,174 @@
+from itertools import islice
+from typing import Dict, Iterator, Optional, Tuple
+from datetime import datetime, timezone
+import copy
+import io
+import os
+import pickle
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+from .inference import FEATURES, artifact_path, save_model
+
+
+def _prepare(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, StandardScaler]:
+    X = df[FEATURES].values.astype(float)
+    y = df["label"].values.astype(int)
+    scaler = StandardScaler()
+    Xs = scaler.fit_transform(X)
+    return Xs, y, scaler
+
+
+def train_model(input_csv: str, output_pkl: str) -> dict:
+    df = pd.read_csv(input_csv)
+    Xs, y, scaler = _prepare(df)
+    X_train, X_test, y_train, y_test = train_test_split(Xs, y, test_size=0.2, random_state=42, stratify=y)
+    clf = LogisticRegression(max_iter=500)
+    clf.fit(X_train, y_train)
+    acc = float(clf.score(X_test, y_test))
+    _write_artifacts(output_pkl, {"model": clf, "scaler": scaler, "features": FEATURES}, {
+        "trainer": "train_model", "source": os.path.basename(input_csv), "rows": len(df), "accuracy": acc,
+    })
+    return {"accuracy": acc, "features": FEATURES}
+
+
+def _write_pickle(path: str, obj) -> None:
+    # write-then-rename so a watching ModelRegistry never sees a half-written file
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(obj, f)
+    os.replace(tmp, path)
+
+
+def _write_artifacts(output_pkl: str, model_obj, metadata: Dict) -> None:
+    # the pickle (training state, sklearn objects), then the .vgm artifact that scoring
+    # loads; written second, so it is never older than the pickle
+    import sklearn
+
+    metadata = {**metadata, "created": datetime.now(timezone.utc).isoformat(timespec="seconds"), "sklearn": sklearn.__version__}
+    _write_pickle(output_pkl, model_obj)
+    save_model(model_obj, artifact_path(output_pkl), metadata)
+
+
+def _csv_chunks(path: str, chunk_rows: int, start: Tuple[int, int] = (0, 0)) -> Iterator[Tuple[int, Tuple[int, int], np.ndarray, np.ndarray]]:
+    # -> (index of the first row, (rows, byte offset) after the chunk, X, y) per chunk.
+    # start is such a (rows, byte offset) position, so resuming seeks instead of re-reading
+    # everything before it; assumes one record per line, as train.generate_synthetic writes.
+    with open(path, "rb") as f:
+        header = f.readline()
+        if start[1]:
+            f.seek(start[1])
+        first = start[0]
+        while True:
+            lines = list(islice(f, chunk_rows))
+            if not lines:
+                return
+            df = pd.read_csv(io.BytesIO(header + b"".join(lines)), usecols=FEATURES + ["label"])
+            end = (first + len(df), f.tell())
+            yield first, end, df[FEATURES].to_numpy(dtype=float), df["label"].to_numpy(dtype=int)
+            first = end[0]
+
+
+def _rescale(clf, old: StandardScaler, new: StandardScaler) -> None:
+    # Re-express a linear model fitted on old-scaled inputs in the new scaler's units, so
+    # updating the running mean/var doesn't silently shift what the coefficients mean:
+    # coef . (x - m_old) / s_old + b  ==  coef' . (x - m_new) / s_new + b'
+    # SGDClassifier(average=True) also carries its running and averaged weights, and coef_
+    # may be a view of one of them: compute every update first, then apply each buffer once
+    updates = []
+    for coef_attr, icpt_attr in (("coef_", "intercept_"), ("_standard_coef", "_standard_intercept"), ("_average_coef", "_average_intercept")):
+        coef, icpt = getattr(clf, coef_attr, None), getattr(clf, icpt_attr, None)
+        if coef is None:
+            continue
+        w = np.asarray(coef, dtype=float).reshape(-1) / old.scale_
+        updates.append((coef, (w * new.scale_).reshape(np.shape(coef))))
+        if icpt is not None:
+            updates.append((icpt, icpt + np.dot(w, new.mean_) - np.dot(w, old.mean_)))
+    done = []
+    for arr, value in updates:
+        if not any(np.shares_memory(arr, other) for other in done):
+            arr[...] = value
+            done.append(arr)
+
+
+def train_incremental(
+    input_csv: str,
+    output_pkl: str,
+    checkpoint: Optional[str] = None,
+    chunk_rows: int = 100_000,
+    epochs: int = 1,
+    holdout_every: int = 5,
+    holdout_rows: int = 100_000,
+    checkpoint_every: int = 10,
+) -> dict:
+    # Online counterpart of train_model: StandardScaler.partial_fit (running mean/var) and
+    # an averaged SGD logistic regression updated chunk by chunk, so memory is bounded by
+    # chunk_rows and a rerun only reads rows appended since the last one.
+    # The checkpoint (default output_pkl + ".ckpt") keeps model, scaler and per-file progress;
+    # output_pkl gets the usual {"model", "scaler", "features"} artifact (plus its .vgm export).
+    # Every holdout_every-th row is held out (never trained on); up to holdout_rows of them
+    # give the reported accuracy.
+    checkpoint = checkpoint or output_pkl + ".ckpt"
+    if os.path.exists(checkpoint):
+        with open(checkpoint, "rb") as f:
+            state = pickle.load(f)
+    else:
+        state = {
+            "model": SGDClassifier(loss="log_loss", average=True, random_state=42),
+            "scaler": StandardScaler(),
+            "features": FEATURES,
+            "rows_trained": 0,
+            "files": {},
+        }
+    key = os.path.abspath(input_csv)
+    # (rows, byte offset) read by each pass; the file may only grow between runs
+    progress: Dict[str, Tuple[int, int]] = state["files"].setdefault(key, {"scaled": (0, 0), "trained": (0, 0)})
+    if os.path.getsize(input_csv) < progress["scaled"][1]:
+        raise ValueError(f"{input_csv} is shorter than when {checkpoint} was written; use a new checkpoint")
+    clf, scaler = state["model"], state["scaler"]
+
+    def is_train(first: int, n: int) -> np.ndarray:
+        return np.arange(first, first + n) % holdout_every != 0 if holdout_every else np.ones(n, dtype=bool)
+
+    # pass 1: fold the new rows into the running mean/var, then move the coefficients along
+    new_scaler = copy.deepcopy(scaler)
+    for first, end, X, _ in _csv_chunks(input_csv, chunk_rows, progress["scaled"]):
+        mask = is_train(first, len(X))
+        if mask.any():
+            new_scaler.partial_fit(X[mask])
+        progress["scaled"] = end
+    if hasattr(clf, "coef_") and hasattr(scaler, "mean_") and progress["scaled"] > progress["trained"]:
+        _rescale(clf, scaler, new_scaler)
+    state["scaler"] = scaler = new_scaler
+    _write_pickle(checkpoint, state)
+
+    # pass 2: SGD over the rows not trained on yet
+    start = progress["trained"]
+    rows_new = progress["scaled"][0] - start[0]
+    X_hold, y_hold, held = [], [], 0
+    for epoch in range(max(1, epochs) if rows_new else 0):
+        last = epoch == max(1, epochs) - 1
+        for i, (first, end, X, y) in enumerate(_csv_chunks(input_csv, chunk_rows, start)):
+            mask = is_train(first, len(X))
+            if mask.any():
+                clf.partial_fit(scaler.transform(X[mask]), y[mask], classes=np.array([0, 1]))
+            if last:
+                if held < holdout_rows and not mask.all():
+                    take = slice(0, holdout_rows - held)
+                    X_hold.append(X[~mask][take])
+                    y_hold.append(y[~mask][take])
+                    held += len(y_hold[-1])
+                state["rows_trained"] += int(mask.sum())
+                progress["trained"] = end
+                if checkpoint_every and (i + 1) % checkpoint_every == 0:
+                    _write_pickle(checkpoint, state)
+    _write_pickle(checkpoint, state)
+    if not hasattr(clf, "coef_"):
+        raise ValueError(f"{input_csv}: no training rows")
+    acc = float(clf.score(scaler.transform(np.vstack(X_hold)), np.concatenate(y_hold))) if held else None
+    _write_artifacts(output_pkl, {"model": clf, "scaler": scaler, "features": FEATURES}, {
+        "trainer": "train_incremental", "source": os.path.basename(input_csv), "rows": state["rows_trained"], "accuracy": acc,
+    })
+    return {"accuracy": acc, "features": FEATURES, "rows_new": rows_new, "rows_trained": state["rows_trained"], "holdout": held}
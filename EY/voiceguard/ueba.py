@@ -0,0 +1,231 @@
+from array import array
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+import random
+import sys
+import time
+import numpy as np
+
+
+CUSTOMER_ALERT = "High call volume from this customer"
+SURGE_ALERT = "Surge of {} reports in this region"
+_M64 = (1 << 64) - 1
+
+
+class SlidingCountMin:
+    # Count-min sketch over a sliding time window: `slots` ring buckets of depth x width
+    # counters plus their running total. add() and estimate() are O(depth); the window
+    # advances by subtracting one bucket from the total, amortized over all events in it.
+    # Estimates never undercount; they overcount by at most ~e/width of the window's events
+    # with probability 1 - e^-depth, so width should be a few times the number of events
+    # expected per window divided by the counts that matter. Memory is
+    # (slots + 1) * depth * width * 4 bytes.
+    def __init__(self, width: int = 1 << 16, depth: int = 4, window_s: float = 600.0, slots: int = 10, seed: int = 0):
+        if width < 2 or width & (width - 1):
+            raise ValueError("width must be a power of two")
+        self.width, self.depth, self.slots = width, depth, slots
+        self.window_s = window_s
+        self.bucket_s = window_s / slots
+        self._shift = 64 - (width.bit_length() - 1)
+        rng = random.Random(seed)
+        # multiply-shift hashing: one odd 64-bit multiplier per row
+        self._mult = [rng.getrandbits(64) | 1 for _ in range(depth)]
+        self._offsets = [d * width for d in range(depth)]
+        cells = depth * width
+        self._total = array("i", bytes(4 * cells))
+        self._ring = [array("i", bytes(4 * cells)) for _ in range(slots)]
+        self._total_np = np.frombuffer(self._total, dtype=np.int32)
+        self._ring_np = [np.frombuffer(r, dtype=np.int32) for r in self._ring]
+        self._bucket: Optional[int] = None
+
+    def _advance(self, ts: float) -> array:
+        # -> the ring bucket for ts, expiring every bucket that slid out of the window
+        b = int(ts // self.bucket_s)
+        cur = self._bucket
+        if cur is None:
+            self._bucket = b
+        elif b > cur:
+            for step in range(cur + 1, min(b, cur + self.slots) + 1):
+                old = self._ring_np[step % self.slots]
+                self._total_np -= old
+                old[:] = 0
+            self._bucket = b
+        return self._ring[self._bucket % self.slots]
+
+    def _cells(self, key: Hashable) -> List[int]:
+        h = hash(key) & _M64
+        shift = self._shift
+        return [off + (((h * m) & _M64) >> shift) for off, m in zip(self._offsets, self._mult)]
+
+    def add(self, key: Hashable, ts: float, count: int = 1) -> int:
+        # records `count` events for key at ts (late events count toward the current bucket);
+        # returns the windowed estimate including them. Conservative update within the
+        # bucket: a row is only raised as far as the key's new minimum, which keeps each
+        # bucket an upper bound for every key while cutting collision noise several-fold.
+        ring = self._advance(ts)
+        total = self._total
+        cells = self._cells(key)
+        target = min(ring[c] for c in cells) + count
+        est = None
+        for c in cells:
+            grow = target - ring[c]
+            if grow > 0:
+                ring[c] = target
+                total[c] += grow
+            v = total[c]
+            if est is None or v < est:
+                est = v
+        return est
+
+    def estimate(self, key: Hashable, ts: Optional[float] = None) -> int:
+        if ts is not None:
+            self._advance(ts)
+        total = self._total
+        return min(total[c] for c in self._cells(key))
+
+    def clear(self) -> None:
+        self._total_np[:] = 0
+        for r in self._ring_np:
+            r[:] = 0
+        self._bucket = None
+
+    def nbytes(self) -> int:
+        return (self.slots + 1) * self.depth * self.width * 4
+
+
+class _KeyRate:
+    # per (region, category) counts in a short `recent` ring and a long `baseline` ring
+    __slots__ = ("recent", "baseline", "recent_sum", "baseline_sum", "recent_bucket", "baseline_bucket", "first_ts")
+
+    def __init__(self, recent_slots: int, baseline_slots: int, ts: float):
+        self.recent = [0] * recent_slots
+        self.baseline = [0] * baseline_slots
+        self.recent_sum = self.baseline_sum = 0
+        self.recent_bucket = self.baseline_bucket = None
+        self.first_ts = ts
+
+
+def _roll(ring: List[int], last: Optional[int], b: int) -> int:
+    # zero the slots between the last touched bucket and b; returns how much was dropped
+    if last is None or b <= last:
+        return 0
+    dropped = 0
+    n = len(ring)
+    for step in range(last + 1, min(b, last + n) + 1):
+        i = step % n
+        dropped += ring[i]
+        ring[i] = 0
+    return dropped
+
+
+class FleetUEBA:
+    # Streaming fleet-level behaviour analytics behind UEBAAgent:
+    #   per customer      calls in the last window_s, via SlidingCountMin (fixed memory)
+    #                     -> CUSTOMER_ALERT above customer_limit
+    #   per region+issue  reports in the last window_s against the rate over baseline_s,
+    #                     in an LRU-bounded map of at most max_regions keys
+    #                     -> SURGE_ALERT when recent > surge_factor x expected and >= surge_min
+    # Regions are lat/lon grid cells of cell_deg degrees. Every observe() is O(depth + 1)
+    # amortized; memory is bounded by the sketch size plus max_regions small records.
+    def __init__(
+        self,
+        window_s: float = 600.0,
+        slots: int = 10,
+        customer_limit: int = 10,
+        width: int = 1 << 16,
+        depth: int = 4,
+        baseline_s: float = 6 * 3600.0,
+        baseline_slots: int = 36,
+        surge_factor: float = 3.0,
+        surge_min: int = 20,
+        max_regions: int = 10000,
+        cell_deg: float = 0.5,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.window_s, self.baseline_s = window_s, baseline_s
+        self.customer_limit = customer_limit
+        self.surge_factor, self.surge_min = surge_factor, surge_min
+        self.max_regions = max_regions
+        self.cell_deg = cell_deg
+        self.clock = clock
+        self.customers = SlidingCountMin(width, depth, window_s, slots)
+        self._recent_slots, self._baseline_slots = slots, baseline_slots
+        self._recent_s, self._baseline_bucket_s = window_s / slots, baseline_s / baseline_slots
+        self.regions: "OrderedDict[Tuple, _KeyRate]" = OrderedDict()
+        self.events = 0
+        self.customer_alerts = 0
+        self.surge_alerts = 0
+        self.evictions = 0
+
+    def region(self, lat: float, lon: float) -> Tuple[int, int]:
+        return (int(lat // self.cell_deg), int(lon // self.cell_deg))
+
+    def observe(self, customer_id: str, lat: float, lon: float, category: str, ts: Optional[float] = None) -> List[str]:
+        ts = self.clock() if ts is None else ts
+        self.events += 1
+        alerts = []
+        if self.customers.add(customer_id, ts) > self.customer_limit:
+            alerts.append(CUSTOMER_ALERT)
+            self.customer_alerts += 1
+        # rows without a position (NaN) only count toward the customer rate
+        if lat == lat and lon == lon and self._surge((*self.region(lat, lon), category), ts):
+            alerts.append(SURGE_ALERT.format(category))
+            self.surge_alerts += 1
+        return alerts
+
+    def observe_batch(self, customer_ids: Sequence[str], lats, lons, categories, ts: Optional[float] = None) -> List[List[str]]:
+        # same as observe() per row, in order; one timestamp for the whole batch
+        ts = self.clock() if ts is None else ts
+        lats = lats.tolist() if hasattr(lats, "tolist") else lats
+        lons = lons.tolist() if hasattr(lons, "tolist") else lons
+        categories = categories.tolist() if hasattr(categories, "tolist") else categories
+        observe = self.observe
+        return [observe(c, la, lo, cat, ts) for c, la, lo, cat in zip(customer_ids, lats, lons, categories)]
+
+    def _surge(self, key: Tuple, ts: float) -> bool:
+        rate = self.regions.get(key)
+        if rate is None:
+            rate = self.regions[key] = _KeyRate(self._recent_slots, self._baseline_slots, ts)
+            if len(self.regions) > self.max_regions:
+                self.regions.popitem(last=False)
+                self.evictions += 1
+        else:
+            self.regions.move_to_end(key)
+        rb = int(ts // self._recent_s)
+        bb = int(ts // self._baseline_bucket_s)
+        rate.recent_sum -= _roll(rate.recent, rate.recent_bucket, rb)
+        rate.baseline_sum -= _roll(rate.baseline, rate.baseline_bucket, bb)
+        # late events count toward the newest bucket
+        rate.recent_bucket = rb if rate.recent_bucket is None else max(rb, rate.recent_bucket)
+        rate.baseline_bucket = bb if rate.baseline_bucket is None else max(bb, rate.baseline_bucket)
+        rate.recent[rate.recent_bucket % self._recent_slots] += 1
+        rate.baseline[rate.baseline_bucket % self._baseline_slots] += 1
+        rate.recent_sum += 1
+        rate.baseline_sum += 1
+        # expected reports per window from the longer history; a key younger than two
+        # windows has no baseline yet and never alerts
+        span = min(self.baseline_s, ts - rate.first_ts)
+        if span < 2 * self.window_s or rate.recent_sum < self.surge_min:
+            return False
+        earlier = rate.baseline_sum - rate.recent_sum
+        expected = earlier * self.window_s / max(span - self.window_s, self.window_s)
+        return rate.recent_sum > self.surge_factor * max(expected, 1.0)
+
+    def memory_bytes(self) -> int:
+        # sketch + region map; each region record is sized once (they are all alike)
+        per_region = 0
+        if self.regions:
+            rate = next(iter(self.regions.values()))
+            per_region = (sys.getsizeof(rate) + sys.getsizeof(rate.recent) + sys.getsizeof(rate.baseline)
+                          + 8 * (len(rate.recent) + len(rate.baseline)) + 120)
+        return self.customers.nbytes() + sys.getsizeof(self.regions) + len(self.regions) * per_region
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "events": self.events,
+            "customer_alerts": self.customer_alerts,
+            "surge_alerts": self.surge_alerts,
+            "regions": len(self.regions),
+            "region_evictions": self.evictions,
+            "memory_bytes": self.memory_bytes(),
+        }
@@ -1,17 +1,111 @@
+import argparse
 import json
+import logging
+import math
 import os
 import sys
-from http.server import BaseHTTPRequestHandler, HTTPServer
-from urllib.parse import urlparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+from urllib.parse import parse_qs, urlparse
 # ensure project root is on path when running from web/ directory
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-from voiceguard.pipeline import build_pipeline
+from voiceguard.analytics import GROUP_FIELDS, AnalyticsStore
+from voiceguard.metrics import PipelineMetrics
+from voiceguard.pipeline import TELEMETRY_DEFAULTS, build_pipeline
+from voiceguard.registry import ModelRegistry
 
 
-PIPELINE = build_pipeline()
+WEB_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_PATH = os.path.join(os.path.dirname(WEB_DIR), "models", "lg.vgm")
+# the model is loaded once here; the registry swaps in retrained artifacts in the background
+REGISTRY = ModelRegistry(os.environ.get("VOICEGUARD_MODEL", MODEL_PATH))
+# per-stage latency for GET /metrics; profiling is off unless --profile-every is given
+# VOICEGUARD_TIMINGS=N adds per-stage timings to 1 in N responses (1: every response)
+METRICS = PipelineMetrics(timings=int(os.environ.get("VOICEGUARD_TIMINGS") or 0))
+# rollups for GET /api/analytics; restored from (and saved back to) VOICEGUARD_ANALYTICS when set
+ANALYTICS_PATH = os.environ.get("VOICEGUARD_ANALYTICS")
+ANALYTICS = AnalyticsStore.load(ANALYTICS_PATH) if ANALYTICS_PATH and os.path.exists(ANALYTICS_PATH) else AnalyticsStore()
+PIPELINE = build_pipeline(model_obj=REGISTRY.model, centers=os.environ.get("VOICEGUARD_CENTERS"), metrics=METRICS, analytics=ANALYTICS)
+REGISTRY.subscribe(PIPELINE.set_model)
+DEFAULT_CUSTOMER = {"id": "unknown", "location": [12.9716, 77.5946]}
+
+
+def _load_static(name):
+    # static content is read once at startup and served from memory
+    try:
+        with open(os.path.join(WEB_DIR, name), "r", encoding="utf-8") as f:
+            return f.read().encode("utf-8")
+    except Exception as e:
+        return f"<h1>VoiceGuard</h1><pre>{e}</pre>".encode("utf-8")
+
+
+STATIC = {"/": _load_static("index.html")}
+
+
+def _duration(text):
+    # "3600", "90m", "24h", "7d" -> seconds
+    units = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+    if text[-1:] in units:
+        return float(text[:-1]) * units[text[-1]]
+    return float(text)
+
+
+def analytics_query(query):
+    # GET /api/analytics?window=24h&by=center_id,issue_category&priority=urgent
+    params = {k: v[-1] for k, v in parse_qs(query).items()}
+    window = params.pop("window", None)
+    by = params.pop("by", "center_id,issue_category")
+    by = tuple(f for f in by.split(",") if f)
+    unknown = [f for f in (*by, *params) if f not in GROUP_FIELDS]
+    if unknown:
+        raise ValueError(f"unknown field(s) {unknown}; expected {list(GROUP_FIELDS)}")
+    window_s = _duration(window) if window else None
+    return {
+        "window_s": window_s,
+        "by": list(by),
+        "summary": ANALYTICS.summary(window_s),
+        "groups": ANALYTICS.query(window_s, by=by, **params),
+        "store": ANALYTICS.stats(),
+    }
+
+
+def vehicle_error(vehicle):
+    # -> why a /api/predict payload (or one batch entry) cannot be scored, or None
+    if not isinstance(vehicle, dict):
+        return "expected a JSON object"
+    for field, kind, name in (("voice_text", str, "a string"), ("telemetry", dict, "an object"), ("customer", dict, "an object")):
+        if field in vehicle and not isinstance(vehicle[field], kind):
+            return f"{field!r} must be {name}"
+    telemetry, customer = vehicle.get("telemetry", {}), vehicle.get("customer", {})
+    for k in TELEMETRY_DEFAULTS:
+        if k in telemetry and not _is_number(telemetry[k]):
+            return f"'telemetry.{k}' must be a finite number"
+    if not isinstance(telemetry.get("error_codes", []), list):
+        return "'telemetry.error_codes' must be an array"
+    for field, obj in (("telemetry", telemetry), ("customer", customer)):
+        loc = obj.get("location", [0, 0])
+        if not (isinstance(loc, list) and len(loc) == 2 and all(_is_number(v) for v in loc)):
+            return f"'{field}.location' must be [lat, lon]"
+    return None
+
+
+def _is_number(v):
+    # JSON numbers only (bool is an int subclass); json.loads also accepts NaN/Infinity
+    return isinstance(v, (int, float)) and not isinstance(v, bool) and math.isfinite(v)
 
 
 class Handler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps connections alive between requests; every response sets Content-Length
+    protocol_version = "HTTP/1.1"
+    # headers and body go out in separate writes; without TCP_NODELAY keep-alive
+    # clients stall ~40ms per request on delayed ACKs
+    disable_nagle_algorithm = True
+    quiet = False
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
     def _send_json(self, obj, status=200):
         data = json.dumps(obj).encode("utf-8")
         self.send_response(status)
@@ -21,62 +115,131 @@ class Handler(BaseHTTPRequestHandler):
         self.end_headers()
         self.wfile.write(data)
 
-    def _send_text(self, text, status=200):
-        data = text.encode("utf-8")
+    def _send_text(self, text, status=200, content_type="text/html; charset=utf-8"):
+        data = text if isinstance(text, bytes) else text.encode("utf-8")
         self.send_response(status)
-        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Type", content_type)
         self.send_header("Content-Length", str(len(data)))
         self.end_headers()
         self.wfile.write(data)
 
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length).decode("utf-8") if length > 0 else "{}"
+        return json.loads(body)
+
     def do_OPTIONS(self):
         # basic CORS support
         self.send_response(204)
         self.send_header("Access-Control-Allow-Origin", "*")
         self.send_header("Access-Control-Allow-Methods", "POST, GET, OPTIONS")
         self.send_header("Access-Control-Allow-Headers", "Content-Type")
+        self.send_header("Content-Length", "0")
         self.end_headers()
 
     def do_GET(self):
-        path = urlparse(self.path).path
-        if path == "/":
+        url = urlparse(self.path)
+        path = url.path
+        if path == "/api/analytics":
             try:
-                with open("web/index.html", "r", encoding="utf-8") as f:
-                    content = f.read()
-                self._send_text(content, 200)
-            except Exception as e:
-                self._send_text(f"<h1>VoiceGuard</h1><pre>{e}</pre>", 200)
+                return self._send_json(analytics_query(url.query), 200)
+            except ValueError as e:
+                return self._send_json({"error": str(e)}, 400)
+        if path in STATIC:
+            self._send_text(STATIC[path], 200)
+        elif path == "/metrics":
+            self._send_text(METRICS.prometheus(cache=PIPELINE.cache), 200, "text/plain; version=0.0.4; charset=utf-8")
+        elif path == "/debug/profile":
+            self._send_text(METRICS.profile_report(), 200, "text/plain; charset=utf-8")
         else:
             self._send_text("Not Found", 404)
 
     def do_POST(self):
         path = urlparse(self.path).path
+        if path not in ("/api/predict", "/api/predict_batch"):
+            return self._send_json({"error": "not_found"}, 404)
+        try:
+            payload = self._read_json()
+        except json.JSONDecodeError:
+            return self._send_json({"error": "invalid JSON"}, 400)
         if path == "/api/predict":
-            length = int(self.headers.get("Content-Length", 0))
-            body = self.rfile.read(length).decode("utf-8") if length > 0 else "{}"
-            try:
-                payload = json.loads(body)
-            except json.JSONDecodeError:
-                return self._send_json({"error": "invalid JSON"}, 400)
+            error = vehicle_error(payload)
+            if error is not None:
+                return self._send_json({"error": f"invalid payload: {error}"}, 400)
             voice_text = payload.get("voice_text", "")
             telemetry = payload.get("telemetry", {})
-            customer = payload.get("customer", {"id": "unknown", "location": [12.9716, 77.5946]})
-            result = PIPELINE.run(voice_text, telemetry, customer)
+            customer = payload.get("customer", DEFAULT_CUSTOMER)
+            try:
+                result = PIPELINE.run(voice_text, telemetry, customer)
+            except (TypeError, ValueError, IndexError) as e:
+                return self._send_json({"error": f"invalid payload: {e}"}, 400)
             return self._send_json(result, 200)
-        else:
-            self._send_json({"error": "not_found"}, 404)
+        # batch: a JSON array of /api/predict payloads, or {"vehicles": [...]}
+        vehicles = payload.get("vehicles") if isinstance(payload, dict) else payload
+        if not isinstance(vehicles, list):
+            return self._send_json({"error": "expected an array of vehicles"}, 400)
+        for i, v in enumerate(vehicles):
+            error = vehicle_error(v)
+            if error is not None:
+                return self._send_json({"error": f"invalid vehicle {i}: {error}"}, 400)
+        try:
+            results = PIPELINE.run_batch(
+                [v.get("voice_text", "") for v in vehicles],
+                [v.get("telemetry", {}) for v in vehicles],
+                [v.get("customer", DEFAULT_CUSTOMER) for v in vehicles],
+            )
+        except (TypeError, ValueError, IndexError) as e:
+            return self._send_json({"error": f"invalid vehicle payload: {e}"}, 400)
+        return self._send_json(results, 200)
+
+
+def make_server(host="127.0.0.1", port=8000, quiet=False):
+    # one thread per connection; agents are stateless so PIPELINE is shared
+    Handler.quiet = quiet
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    return server
+
+
+def _snapshot_loop(stop, every):
+    while not stop.wait(every):
+        ANALYTICS.snapshot(ANALYTICS_PATH)
 
 
-def run_server(host="127.0.0.1", port=8000):
-    server = HTTPServer((host, port), Handler)
-    print(f"VoiceGuard server listening on http://{host}:{port}/")
+def run_server(host="127.0.0.1", port=8000, quiet=False, snapshot_every=300.0):
+    server = make_server(host, port, quiet)
+    if REGISTRY.version is not None:
+        logging.getLogger("voiceguard.registry").info("serving model %s (startup load %.1f ms)", REGISTRY.version, REGISTRY.load_ms)
+    REGISTRY.start()
+    stop = threading.Event()
+    if ANALYTICS_PATH and snapshot_every > 0:
+        threading.Thread(target=_snapshot_loop, args=(stop, snapshot_every), name="analytics-snapshot", daemon=True).start()
+    print(f"VoiceGuard server listening on http://{host}:{server.server_address[1]}/")
     try:
         server.serve_forever()
     except KeyboardInterrupt:
         pass
     finally:
+        stop.set()
+        REGISTRY.stop()
+        if ANALYTICS_PATH:
+            ANALYTICS.snapshot(ANALYTICS_PATH)
         server.server_close()
 
 
 if __name__ == "__main__":
-    run_server()
+    ap = argparse.ArgumentParser(description="VoiceGuard HTTP JSON API")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8000)
+    ap.add_argument("--quiet", action="store_true", help="disable per-request access logs")
+    ap.add_argument("--timings", type=int, nargs="?", const=1, default=0, metavar="N",
+                    help="add per-stage timings to 1 in N /api/predict responses (no N: every response, ~17%% slower runs)")
+    ap.add_argument("--profile-every", type=int, default=0, metavar="N", help="cProfile 1 in N requests (report at GET /debug/profile)")
+    ap.add_argument("--trace-memory", action="store_true", help="also tracemalloc the profiled requests")
+    ap.add_argument("--snapshot-every", type=float, default=300.0, metavar="S",
+                    help="save analytics to $VOICEGUARD_ANALYTICS every S seconds (and on shutdown)")
+    args = ap.parse_args()
+    METRICS.configure(timings=args.timings or METRICS.timings, sample_every=args.profile_every)
+    METRICS.trace_memory = args.trace_memory
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    run_server(args.host, args.port, args.quiet, args.snapshot_every)